@@ -0,0 +1,76 @@
+"""
+Mede o tempo de inicialização (cold start) de `from quantumnet.components import Network, Controller`.
+
+Cada medição roda em um interpretador novo, de modo que nenhum módulo está em cache na memória.
+Também informa quais dependências pesadas (qiskit, matplotlib, scipy, h5py) foram carregadas e os
+módulos mais lentos segundo `python -X importtime`.
+
+Uso:
+    python benchmarks/import_time.py [--runs N] [--top K]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATEMENT = 'from quantumnet.components import Network, Controller'
+HEAVY = ('qiskit', 'matplotlib', 'scipy', 'h5py', 'networkx', 'numpy')
+
+PROBE = f'''
+import sys, time
+t = time.perf_counter()
+{STATEMENT}
+elapsed = time.perf_counter() - t
+loaded = [m for m in {HEAVY!r} if m in sys.modules]
+print(elapsed)
+print(",".join(loaded))
+'''
+
+
+def run_probe():
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True, check=True).stdout.splitlines()
+    return float(out[0]), [m for m in out[1].split(',') if m]
+
+
+def slowest_modules(top):
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', STATEMENT], cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    packages = {}
+    for line in err.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        name = name.strip()
+        if '.' not in name:
+            packages[name] = max(packages.get(name, 0), int(cumulative_us))
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='número de interpretadores novos medidos')
+    parser.add_argument('--top', type=int, default=10, help='número de pacotes listados por tempo cumulativo')
+    args = parser.parse_args()
+
+    times = []
+    loaded = []
+    for _ in range(args.runs):
+        elapsed, loaded = run_probe()
+        times.append(elapsed)
+
+    print(f'{STATEMENT}')
+    print(f'  execuções: {args.runs}')
+    print(f'  mediana:   {statistics.median(times) * 1000:.1f} ms')
+    print(f'  mínimo:    {min(times) * 1000:.1f} ms')
+    print(f'  máximo:    {max(times) * 1000:.1f} ms')
+    print(f'  dependências carregadas: {", ".join(loaded) or "nenhuma"}')
+    print(f'  não carregadas: {", ".join(m for m in HEAVY if m not in loaded) or "nenhuma"}')
+    print()
+    print('Pacotes mais lentos (tempo cumulativo, python -X importtime):')
+    for name, cumulative_us in slowest_modules(args.top):
+        print(f'  {cumulative_us / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,10 @@
 from .host import *
+from .channel import Channel, RoutePlan
+from .reservation import LinkCalendar, ReservationCalendar, ScheduledRequest, partition_disjoint
+from .request_queue import RequestQueue, AgingPolicy
+from .slice_scheduler import SliceScheduler, estimate_epr_cost
+from .routing import RoutingTable, RouteView
 from .network import Network
 from .controller import Controller
+from .online import OnlineController, poisson_arrivals, bursty_arrivals, trace_arrivals, request_factory
 from .simulation import *
\ No newline at end of file
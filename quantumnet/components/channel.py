@@ -0,0 +1,100 @@
+from ..objects import EprPool
+
+
+class Channel():
+    """
+    Canal quântico entre dois nós vizinhos.
+
+    Reúne o pool de pares EPR, as probabilidades do protocolo ECHP e os timeslots em que o canal
+    está ocupado, evitando consultas repetidas aos atributos das arestas do grafo.
+    """
+    __slots__ = ('u', 'v', 'eprs', 'prob_on_demand_epr_create', 'prob_replay_epr_create', 'busy_timeslots')
+
+    def __init__(self, u: int, v: int, eprs: EprPool, prob_on_demand_epr_create: float = None, prob_replay_epr_create: float = None) -> None:
+        self.u = u
+        self.v = v
+        self.eprs = eprs
+        self.prob_on_demand_epr_create = prob_on_demand_epr_create
+        self.prob_replay_epr_create = prob_replay_epr_create
+        self.busy_timeslots = set()
+
+    def __str__(self):
+        return f'Channel ({self.u}, {self.v})'
+
+    def __repr__(self):
+        return f'Channel({self.u}, {self.v}, eprs={len(self.eprs)})'
+
+    @property
+    def endpoints(self):
+        """
+        Extremidades do canal.
+
+        Returns:
+            tuple : Par (u, v).
+        """
+        return (self.u, self.v)
+
+    @property
+    def version(self) -> int:
+        """
+        Versão do canal, incrementada quando o pool de EPRs passa de vazio para não vazio ou vice-versa.
+
+        Returns:
+            int : Versão atual.
+        """
+        return self.eprs.version
+
+    def is_busy(self, timeslot: int) -> bool:
+        """
+        Verifica se o canal está ocupado no timeslot especificado.
+
+        Args:
+            timeslot (int): O timeslot a ser verificado.
+
+        Returns:
+            bool : True se o canal estiver ocupado.
+        """
+        return timeslot in self.busy_timeslots
+
+
+class RoutePlan():
+    """
+    Rota com os canais já resolvidos, para que os laços por qubit e por salto não consultem o grafo.
+    """
+    __slots__ = ('nodes', 'channels', 'segments')
+
+    def __init__(self, nodes: list, channels: list) -> None:
+        self.nodes = nodes
+        self.channels = channels
+        self.segments = [(nodes[i], nodes[i + 1], channel) for i, channel in enumerate(channels)]
+
+    def __len__(self):
+        return len(self.channels)
+
+    def __iter__(self):
+        return iter(self.channels)
+
+    def __repr__(self):
+        return f'RoutePlan({self.nodes})'
+
+    @property
+    def hops(self) -> int:
+        """
+        Número de saltos (canais) da rota.
+
+        Returns:
+            int : Número de canais.
+        """
+        return len(self.channels)
+
+    def has_eprs(self, minimum: int = 1) -> bool:
+        """
+        Verifica se todos os canais da rota possuem pares EPR suficientes.
+
+        Args:
+            minimum (int): Número mínimo de pares EPR por canal.
+
+        Returns:
+            bool : True se todos os canais tiverem ao menos `minimum` pares EPR.
+        """
+        return all(len(channel.eprs) >= minimum for channel in self.channels)
@@ -1,23 +1,31 @@
 import random
 import networkx as nx
-from ..components import Network, Host, Logger
-from qiskit import QuantumCircuit
-from collections import defaultdict
+from ..components import Network, Host, Logger, ReservationCalendar, ScheduledRequest, partition_disjoint, RequestQueue, SliceScheduler, RoutingTable, RouteView
+from ..objects.trace import REQUEST_STATUS, CONTROLLER
+from collections import defaultdict, deque
 
 class Controller():
-    def __init__(self, network):
+    def __init__(self, network, policy='qubits_gates'):
         """
         Inicializa o controlador com uma instância da rede.
+
+        Args:
+            network (Network): Rede controlada.
+            policy (str | callable): Política de prioridade da fila de requisições pendentes ('qubits_gates', 'fifo', 'shortest_route' ou 'aging').
         """
         self.network = network
         self.logger = Logger.get_instance()  
-        self.pending_requests = []  
+        self.pending_requests = RequestQueue(policy, network)
         self.scheduled_requests = {}  
         self.executed_requests = []  
-        self.occupied_routes = {}  
+        self.calendar = ReservationCalendar()
+        self.schedule_records = {}
+        self.timeslot_nodes = defaultdict(set)
         self.scheduled_requests_slice = defaultdict(list)
         self.slices = {}
         self.failed_requests = []
+        self.routing_table = None
+        self.keep_history = True  # Se False, requisições executadas e falhas não são guardadas (fluxos longos)
         
     def initialize_slices(self, network, clients, server, protocols, slice_paths_list):
         """
@@ -50,28 +58,32 @@ class Controller():
             }
 
             # Log de configuração para depuração
-            self.logger.log(f"Slice {slice_id} configurado com cliente {client}, servidor {server}, protocolo {protocol} e caminho {slice_paths}.")
+            self.logger.log("Slice %s configurado com cliente %s, servidor %s, protocolo %s e caminho %s.", slice_id, client, server, protocol, slice_paths)
 
 
-    def create_routing_table(self, host_id: int) -> dict:
+    def create_routing_table(self, host_id: int) -> RouteView:
         """
         Cria uma tabela de roteamento com os caminhos mais curtos para cada nó.
 
+        Os caminhos vêm da matriz de predecessores compartilhada (ver `RoutingTable`), calculada
+        uma única vez para a rede e reconstruídos sob demanda.
+
         Args:
             host_id (int): ID do host para o qual criar a tabela de roteamento.
 
         Returns:
-            dict: Dicionário de destinos para caminhos mais curtos.
+            RouteView: Mapeamento de destinos para caminhos mais curtos.
         """
-        shortest_paths = nx.shortest_path(self.network.graph, source=host_id)
-        routing_table = {dest: path for dest, path in shortest_paths.items()}
-        return routing_table
+        if self.routing_table is None:
+            self.routing_table = RoutingTable(self.network.graph)
+        return self.routing_table.view(host_id)
     
 
     def register_routing_tables(self):
         """
         Registra tabelas de roteamento para todos os nós.
         """
+        self.routing_table = RoutingTable(self.network.graph)
         for host_id in self.network.hosts:
             routing_table = self.create_routing_table(host_id)
             self.network.hosts[host_id].set_routing_table(routing_table)
@@ -92,8 +104,9 @@ class Controller():
             'reason': reason or "Falha desconhecida",
             'route': request.get('slice_path', 'Não especificada'),
         }
-        self.failed_requests.append(failed_entry)
-        self.logger.log(f"Falha registrada: {failed_entry}")
+        if self.keep_history:
+            self.failed_requests.append(failed_entry)
+        self.logger.log("Falha registrada: %s", failed_entry)
 
 
     def receive_request(self, request):
@@ -103,8 +116,8 @@ class Controller():
         Args:
             request (dict): Dicionário com a requisição contendo informações como Alice, Bob, protocolo, etc.
         """
-        self.pending_requests.append(request)
-        self.logger.log(f"Requisição recebida: {request}")
+        self.pending_requests.push(request, self.network.get_timeslot())
+        self.logger.log("Requisição recebida: %s", request)
         self.process_requests()
         
     def process_requests(self, max_attempts=1):
@@ -115,7 +128,6 @@ class Controller():
             max_attempts (int): Número máximo de tentativas para agendar uma requisição.
 
         """
-        self.prioritize_requests()
         attempts = 0
        
         while self.pending_requests and attempts < max_attempts:
@@ -125,15 +137,15 @@ class Controller():
                 self.network.timeslot()
                 current_timeslot = self.network.get_timeslot()
 
-            request = self.pending_requests[0]
+            request = self.pending_requests.peek()
 
             # Tenta agendar a requisição no timeslot atual.
             if self.try_schedule_request(request, current_timeslot):
-                self.pending_requests.pop(0)
+                self.pending_requests.pop()
                 attempts = 0
             else:
                 # Caso não seja possível agendar, registra no logger e avança o timeslot.
-                self.logger.log(f"Requisição {request} não pôde ser agendada. Avançando timeslot.")
+                self.logger.log("Requisição %s não pôde ser agendada. Avançando timeslot.", request)
                 self.network.timeslot()
                 attempts += 1
 
@@ -154,31 +166,48 @@ class Controller():
         route = self.network.networklayer.short_route_valid(alice_id, bob_id,increment_timeslot=False)
 
         if route:
+            record = ScheduledRequest(request, route)
+
             # Tentar reutilizar um timeslot existente
             if current_timeslot in self.scheduled_requests:
-                if self.share_timeslot(route, current_timeslot):
-                    self.reserve_route(route, current_timeslot)
-                    self.scheduled_requests.setdefault(current_timeslot, []).append(request)
-                    self.logger.log(f"Requisição agendada no mesmo timeslot {current_timeslot} para rota {route}.")
+                if self.share_timeslot(record, current_timeslot):
+                    self.schedule_record(record, current_timeslot)
+                    self.logger.log("Requisição agendada no mesmo timeslot %s para rota %s.", current_timeslot, route)
                     return True
 
             # Se não for possível reutilizar, busque o próximo disponível
             next_timeslot = self.find_next_available_timeslot(route)
             if self.is_route_available(route, next_timeslot):
-                self.reserve_route(route, next_timeslot)
-                self.scheduled_requests.setdefault(next_timeslot, []).append(request)
-                self.logger.log(f"Requisição agendada: {request} no timeslot {next_timeslot}.")
+                self.schedule_record(record, next_timeslot)
+                self.logger.log("Requisição agendada: %s no timeslot %s.", request, next_timeslot)
                 return True
 
         return False
 
+    def schedule_record(self, record, timeslot):
+        """
+        Agenda uma requisição no timeslot, reservando a rota e guardando o registro de agendamento.
+
+        Args:
+            record (ScheduledRequest): Registro com a requisição e a rota calculada.
+            timeslot (int): Timeslot do agendamento.
+        """
+        record.timeslot = timeslot
+        self.reserve_route(record.route, timeslot, record.duration)
+        self.scheduled_requests.setdefault(timeslot, []).append(record.request)
+        self.schedule_records[id(record.request)] = record
+        self.timeslot_nodes[timeslot].update(record.nodes)
+
     def share_timeslot(self, route, timeslot):
         """
-        Verifica se a nova rota pode compartilhar o timeslot especificado,
-        considerando apenas a última requisição na mesma rota.
+        Verifica se a nova rota pode compartilhar o timeslot especificado, sem nós
+        intermediários em comum com as rotas já agendadas nele.
+
+        As rotas já agendadas não são recalculadas: o controlador mantém, para cada timeslot,
+        o conjunto de nós usados pelas rotas guardadas nos registros de agendamento.
 
         Args:
-            route (list): A nova rota a ser analisada.
+            route (list | ScheduledRequest): A nova rota a ser analisada ou o seu registro de agendamento.
             timeslot (int): O timeslot existente.
 
         Returns:
@@ -188,135 +217,296 @@ class Controller():
         if timeslot not in self.scheduled_requests:
             return True  # Nenhuma requisição, então pode compartilhar
 
-        # Obter a última requisição da rota no mesmo timeslot
-        for request in reversed(self.scheduled_requests[timeslot]):
-            existing_route = self.network.networklayer.short_route_valid(
-                request['alice_id'], request['bob_id']
-            )
-            # Verificar sobreposição de nós intermediários
-            overlapping_nodes = set(route[:-1]).intersection(existing_route[:-1])
-            if overlapping_nodes:
-                return False  # Conflito encontrado
-        return True
+        nodes = route.nodes if isinstance(route, ScheduledRequest) else frozenset(route[:-1])
+        # Verificar sobreposição de nós intermediários
+        return nodes.isdisjoint(self.timeslot_nodes.get(timeslot, ()))
+
+    def schedule_batch(self, requests, start_timeslot=None):
+        """
+        Agenda um lote de requisições empacotando o maior número possível de requisições sem
+        conflito em cada timeslot.
+
+        Duas requisições conflitam quando suas rotas compartilham nós intermediários (a mesma
+        regra de `share_timeslot`). As requisições são coloridas de forma gulosa a partir das
+        listas de requisições de cada nó, sem montar o grafo de conflitos: primeiro as que
+        disputam mais nós, cada uma no primeiro timeslot a partir de `start_timeslot` em que os
+        seus links estão livres no calendário e os seus nós não estão em uso, seja por outra
+        requisição do lote, seja por agendamentos anteriores. Requisições sem rota válida são
+        registradas como falhas.
+
+        Args:
+            requests (list): Requisições a serem agendadas.
+            start_timeslot (int, optional): Primeiro timeslot usado. Padrão: o timeslot seguinte ao último já agendado, ou o atual da rede.
+
+        Returns:
+            dict: Requisições agendadas, indexadas pelo timeslot.
+        """
+        records = []
+        for request in requests:
+            route = request.get('slice_path') or self.network.networklayer.short_route_valid(
+                request['alice_id'], request['bob_id'], increment_timeslot=False)
+            if not route:
+                self.record_failed_request(request, "Nenhuma rota válida")
+                continue
+            records.append(ScheduledRequest(request, route))
+
+        if start_timeslot is None:
+            start_timeslot = max(self.network.get_timeslot(), max(self.scheduled_requests, default=0) + 1)
+
+        users = defaultdict(int)
+        for record in records:
+            for node in record.nodes:
+                users[node] += 1
+        order = sorted(range(len(records)), key=lambda i: -sum(users[node] for node in records[i].nodes))
+
+        # first_free[node]: primeiro timeslot a partir de start_timeslot em que o nó está livre.
+        # Os timeslots anteriores só ficam mais ocupados, então a busca de cada nó nunca volta.
+        first_free = {}
+        timeslot_nodes = self.timeslot_nodes
+
+        def node_free_from(node):
+            timeslot = first_free.get(node, start_timeslot)
+            while timeslot in timeslot_nodes and node in timeslot_nodes[timeslot]:
+                timeslot += 1
+            first_free[node] = timeslot
+            return timeslot
 
-    def execute_scheduled_requests(self, timeslot):
+        scheduled_timeslots = {}
+        for index in order:
+            record = records[index]
+            links = self.route_links(record.route)
+            timeslot = max(map(node_free_from, record.nodes), default=start_timeslot)
+            while True:
+                fit = self.calendar.earliest_fit(links, timeslot, record.duration)
+                if fit == timeslot and self.share_timeslot(record, timeslot):
+                    break
+                timeslot = fit if fit > timeslot else timeslot + 1
+            self.schedule_record(record, timeslot)
+            scheduled_timeslots.setdefault(timeslot, []).append(record.request)
+
+        self.logger.log("Lote de %s requisições agendado em %s timeslots.", len(records), len(scheduled_timeslots))
+        return dict(sorted(scheduled_timeslots.items()))
+
+    def execute_scheduled_requests(self, timeslot, parallel=False, max_workers=None):
         """
         Executa as requisições agendadas no timeslot especificado.
 
         Args:
             timeslot (int): O timeslot cujo agendamento deve ser executado.
+            parallel (bool): Se True, as requisições são divididas em grupos que não compartilham
+                canais nem hosts das extremidades, e os grupos são executados em processos
+                paralelos (ver `Network.execute_concurrently`). As rotas são escolhidas e as
+                reservas liberadas neste processo, na ordem do agendamento.
+            max_workers (int, optional): Número máximo de processos no modo paralelo.
         """
         if timeslot not in self.scheduled_requests:
-            self.logger.log(f"Nenhuma requisição agendada no timeslot {timeslot}.")
+            self.logger.log("Nenhuma requisição agendada no timeslot %s.", timeslot)
             return
 
-        self.logger.log(f"Executando requisições do timeslot {timeslot}.")
-        for request in self.scheduled_requests[timeslot]:
-            if self.execute_request_one(request):
+        self.logger.log("Executando requisições do timeslot %s.", timeslot)
+        requests = self.scheduled_requests[timeslot]
+        if parallel:
+            routes = [self.prepare_route(request, timeslot) for request in requests]
+            routed = [i for i, route in enumerate(routes) if route]
+            resources = [self.network.route_resources(routes[i], request['alice_id'], request['bob_id']) if routes[i] else set()
+                         for i, request in enumerate(requests)]
+            groups = partition_disjoint([resources[i] for i in routed])
+            groups = [[routed[i] for i in group] for group in groups]
+            self.logger.log("Timeslot %s: %s requisições em %s grupos disjuntos.", timeslot, len(requests), len(groups))
+            statuses = self.network.execute_concurrently(
+                requests, groups, lambda i: self.network.execute_request(requests[i], route=routes[i]), resources, max_workers)
+            statuses = dict(zip(routed, statuses))
+            results = [self.finish_request(request, routes[i], statuses.get(i, False), timeslot)
+                       for i, request in enumerate(requests)]
+        else:
+            results = [self.execute_request_one(request, timeslot) for request in requests]
+
+        # Os resultados são incorporados na ordem do agendamento, qualquer que seja o modo
+        for request, success in zip(requests, results):
+            if success and self.keep_history:
                 self.executed_requests.append({"request": request, "timeslot": timeslot})
 
         del self.scheduled_requests[timeslot]  # Limpa as requisições já executadas
+        self.timeslot_nodes.pop(timeslot, None)
+
+    def partition_requests(self, requests):
+        """
+        Divide as requisições em grupos que não compartilham canais nem hosts das extremidades,
+        usando a rota guardada no agendamento quando houver.
+
+        Args:
+            requests (list): Requisições de um timeslot.
+
+        Returns:
+            list : Grupos com os índices das requisições, em ordem determinística.
+        """
+        routes = []
+        for request in requests:
+            record = self.schedule_records.get(id(request))
+            routes.append(record.route if record is not None else self.network.planned_route(request))
+        return self.network.partition_requests(requests, routes)
 
-    def execute_request_one(self, request):
+    def execute_request_one(self, request, timeslot=None):
         """
         Executa uma requisição específica, validando a rota.
 
         Args:
             request (dict): Requisição a ser executada.
+            timeslot (int, optional): Timeslot em que a requisição foi agendada. Se omitido, todas as reservas da rota são liberadas.
 
         Returns:
             bool: True se a execução foi bem-sucedida, False caso contrário.
         """
-        alice_id = request['alice_id']
-        bob_id = request['bob_id']
-        route = self.network.networklayer.short_route_valid(alice_id, bob_id)
+        if timeslot is None:
+            record = self.schedule_records.get(id(request))
+            timeslot = record.timeslot if record is not None else None
+        route = self.prepare_route(request, timeslot)
+        success = self.network.execute_request(request, route=route) if route else False
+        return self.finish_request(request, route, success, timeslot)
 
-        if route:
-            success = self.network.execute_request(request)
+    def prepare_route(self, request, timeslot=None):
+        """
+        Escolhe a rota de execução de uma requisição.
 
-            if success:
-                self.logger.log(f"Requisição executada: {request}")
-                self.release_route(route)
-                return True
-            else:
-                self.logger.log(f"Falha ao executar requisição: {request}")
-                self.record_failed_request(request)  # Registra a falha
-                self.release_route(route)  # Libera a rota mesmo em caso de falha
-                return False
+        Usa a rota guardada no agendamento enquanto ela ainda tiver pares EPR; só recalcula para
+        requisições não agendadas ou cuja rota perdeu os pares EPR, liberando a reserva antiga.
 
-        self.logger.log(f"Falha ao encontrar rota válida para requisição: {request}")
-        self.record_failed_request(request)  # Registra a falha
-        return False
+        Args:
+            request (dict): Requisição a ser executada.
+            timeslot (int, optional): Timeslot em que a requisição foi agendada.
+
+        Returns:
+            list : Rota de execução, ou None se nenhuma rota válida for encontrada.
+        """
+        record = self.schedule_records.pop(id(request), None)
+        if record is not None:
+            if timeslot is None:
+                timeslot = record.timeslot
+            if self.network.plan_route(record.route).has_eprs():
+                return record.route
+            self.release_route(record.route, timeslot, record.duration)
+        return self.network.networklayer.short_route_valid(request['alice_id'], request['bob_id'])
+
+    def finish_request(self, request, route, success, timeslot=None):
+        """
+        Registra o resultado da execução de uma requisição e libera a reserva da sua rota.
+
+        Args:
+            request (dict): Requisição executada.
+            route (list): Rota de execução, ou None se nenhuma rota válida foi encontrada.
+            success (bool): Resultado da execução.
+            timeslot (int, optional): Timeslot em que a requisição foi agendada.
+
+        Returns:
+            bool: O resultado da execução.
+        """
+        if not route:
+            self.logger.log("Falha ao encontrar rota válida para requisição: %s", request)
+            self.network.trace.record(REQUEST_STATUS, CONTROLLER, self.network.get_timeslot(),
+                                      request['alice_id'], request['bob_id'], value=0)
+            self.record_failed_request(request)  # Registra a falha
+            return False
+
+        if success:
+            self.logger.log("Requisição executada: %s", request)
+        else:
+            self.logger.log("Falha ao executar requisição: %s", request)
+            self.record_failed_request(request)  # Registra a falha
+        self.release_route(route, timeslot)  # Libera a rota mesmo em caso de falha
+        return bool(success)
 
     # Gerenciamento das Rotas
+
+    @property
+    def occupied_routes(self):
+        """
+        Reservas atuais de cada link.
+
+        Returns:
+            dict : Intervalos (início, fim) reservados, indexados pelo link (u, v).
+        """
+        return self.calendar.reservations()
+
+    def route_links(self, route):
+        """
+        Retorna os links dirigidos que compõem uma rota.
+
+        Args:
+            route (list): Lista de nós que compõem a rota (ex: [u, v, w]).
+
+        Returns:
+            list: Lista de links (u, v).
+        """
+        return [(route[i], route[i + 1]) for i in range(len(route) - 1)]
    
-    def is_route_available(self, route, timeslot):
+    def is_route_available(self, route, timeslot, duration=1):
         """
-        Verifica se uma rota está disponível para uso no timeslot especificado.
+        Verifica se uma rota está disponível para uso a partir do timeslot especificado.
 
         Args:
             route (list): Lista de nós que compõem a rota (ex: [u, v, w]).
             timeslot (int): O timeslot em que a disponibilidade da rota será verificada.
+            duration (int): Número de timeslots consecutivos necessários.
 
         Returns:
             bool: True se a rota estiver disponível, False caso contrário.
         """
-        for i in range(len(route) - 1):
-            link = (route[i], route[i + 1])
-            if self.occupied_routes.get(link) == timeslot:
-                self.logger.log(f"Conflito: Link {link} ocupado no timeslot {timeslot}.")
-                return False
+        if not self.calendar.is_free(self.route_links(route), timeslot, duration):
+            self.logger.log("Conflito: Rota %s ocupada no timeslot %s.", route, timeslot)
+            return False
         return True
 
-    def reserve_route(self, route, timeslot):
+    def reserve_route(self, route, timeslot, duration=1):
         """
-        Reserva uma rota para uso no timeslot especificado.
+        Reserva uma rota para uso a partir do timeslot especificado.
 
         Args:
             route (list): Rota a ser reservada.
             timeslot (int): Timeslot em que a rota será reservada.
+            duration (int): Número de timeslots consecutivos reservados.
         """
-        for i in range(len(route) - 1):
-            link = (route[i], route[i + 1])
-            self.occupied_routes[link] = timeslot
-        self.logger.log(f"Rota reservada: {route} no timeslot {timeslot}.")
+        self.calendar.reserve(self.route_links(route), timeslot, duration)
+        self.logger.log("Rota reservada: %s no timeslot %s.", route, timeslot)
 
-    def release_route(self, route):
+    def release_route(self, route, timeslot=None, duration=1):
         """
-        Libera a rota, permitindo seu reuso em outros timeslots.
+        Libera a rota, permitindo seu reuso no timeslot reservado.
 
         Args:
             route (list): Rota a ser liberada.
+            timeslot (int, optional): Timeslot da reserva. Se omitido, libera todas as reservas dos links da rota.
+            duration (int): Número de timeslots liberados.
         """
-        for i in range(len(route) - 1):
-            link = (route[i], route[i + 1])
-            self.occupied_routes.pop(link, None)
-        self.logger.log(f"Rota liberada: {route}.")
+        self.calendar.release(self.route_links(route), timeslot, duration)
+        self.logger.log("Rota liberada: %s.", route)
 
     # Funções Auxiliares 
 
-    def find_next_available_timeslot(self, route):
+    def find_next_available_timeslot(self, route, duration=1):
         """
         Encontra o próximo timeslot em que a rota estará completamente livre.
 
         Args:
             route (list): Rota a ser verificada.
+            duration (int): Número de timeslots consecutivos necessários.
 
         Returns:
             int: Próximo timeslot livre para a rota.
         """
-        current_timeslot = self.network.get_timeslot()
-        while not self.is_route_available(route, current_timeslot):
-            current_timeslot += 1
-        return current_timeslot
+        return self.calendar.earliest_fit(self.route_links(route), self.network.get_timeslot(), duration)
     
-    def prioritize_requests(self):
+    def prioritize_requests(self, policy=None):
         """
-        Ordena as requisições pendentes com base em critérios de prioridade.
+        Define a política de prioridade das requisições pendentes.
+
+        A fila já mantém as requisições ordenadas a cada inserção; sem `policy`, nada muda.
+        O padrão ordena por número de qubits e, em seguida, pelo número de instruções no circuito.
 
+        Args:
+            policy (str | callable, optional): Nova política de prioridade.
         """
-        # Ordena por número de qubits e, em seguida, pelo número de instruções no circuito
-        self.pending_requests.sort(key=lambda req: (req['num_qubits'], -len(req['quantum_circuit'].data)))
+        if policy is not None:
+            self.pending_requests.set_policy(policy)
 
 
     def generate_schedule_report(self):
@@ -387,27 +577,34 @@ class Controller():
         """
         self.logger.log("Iniciando execução das requisições agendadas.")
         for ts in sorted(self.scheduled_requests.keys()):
-            self.logger.log(f"Processando timeslot {ts}.")
+            self.logger.log("Processando timeslot %s.", ts)
             
             # Executa as requisições do timeslot
             self.execute_scheduled_requests(ts)
 
             # Após a execução, reinicia a rede
-            self.logger.log(f"Estado da rede antes da reinicialização: Timeslot {self.network.get_timeslot()}.")
+            self.logger.log("Estado da rede antes da reinicialização: Timeslot %s.", self.network.get_timeslot())
             self.network.restart_network()
-            self.logger.log(f"Rede reiniciada. Timeslot reiniciado para {self.network.get_timeslot()}.")
+            self.logger.log("Rede reiniciada. Timeslot reiniciado para %s.", self.network.get_timeslot())
 
 
     # SIMULAÇÃO EM SLICES
 
-    def schedule_requests(self, requests, slice_paths=None, protocols=None):
+    def schedule_requests(self, requests, slice_paths=None, protocols=None, budgets=None, fair=False):
         """
         Agenda as requisições em timeslots com base nos slices e protocolos fornecidos. Garante que todas as requisições tenham um protocolo e que correspondam a um slice definido.
 
+        Os slices são indexados por (cliente, protocolo). Por padrão, as requisições são agrupadas
+        em ordem de chegada, tantas por timeslot quanto o número de slices. Com `fair=True` ou com
+        `budgets`, elas são distribuídas por deficit round robin ponderado pelo orçamento de EPRs
+        de cada slice (ver `SliceScheduler`).
+
         Args:
             requests (list): Lista de requisições a serem agendadas. Cada requisição deve conter informações como `alice_id` e `protocol`.
             slice_paths (dict): Dicionário contendo os slices com informações de clientes,caminhos e protocolos.
             protocols (list): Lista de protocolos válidos para verificação.
+            budgets (dict, optional): Orçamento de EPRs por timeslot de cada slice.
+            fair (bool): Se True, usa deficit round robin mesmo sem orçamentos (pesos iguais).
 
         Returns:
             dict: Um dicionário onde a chave é o timeslot e o valor é a lista de requisições 
@@ -420,28 +617,19 @@ class Controller():
         if protocols is None or slice_paths is None:
             raise ValueError("Protocolos e slice_paths devem ser fornecidos.")
 
-        scheduled_timeslots = {}
-        current_timeslot = 1
+        scheduler = SliceScheduler(slice_paths, budgets)
+        if fair or budgets:
+            for request in requests:
+                scheduler.enqueue(request)
+            return scheduler.schedule()
 
         # Mapeia as requisições para os slices corretos
         for request in requests:
-            protocol = request.get('protocol')
-            if not protocol:
-                raise ValueError(f"Requisição sem protocolo: {request}")
-            
-            # Encontra o slice correspondente para a requisição.
-            slice_key = None
-            for key, slice_data in slice_paths.items():
-                if slice_data["client"] == request["alice_id"] and slice_data["protocol"] == protocol:
-                    slice_key = key
-                    break
-
-            if slice_key:
-                request['slice_path'] = slice_paths[slice_key]["path"]  # Vincula o caminho correto
-            else:
-                raise ValueError(f"Nenhum slice encontrado para a requisição: {request}")
+            scheduler.assign(request)
 
         # Agrupa as requisições por timeslot
+        scheduled_timeslots = {}
+        current_timeslot = 1
         num_slices = len(slice_paths)
         for i in range(0, len(requests), num_slices):
             scheduled_timeslots[current_timeslot] = requests[i:i + num_slices]
@@ -489,17 +677,16 @@ class Controller():
         scheduled_timeslots = {}
         current_timeslot = 1
 
-        while any(slice_requests.values()):
-            current_slot_requests = []
+        # As listas de entrada são esvaziadas, como antes, mas consumidas em filas de custo O(1)
+        queues = [deque(requests) for requests in slice_requests.values() if requests]
+        for requests in slice_requests.values():
+            requests.clear()
 
+        while queues:
             # Alterna entre slices para agendar as requisições
-            for slice_id, requests in slice_requests.items():
-                if requests:
-                    current_slot_requests.append(requests.pop(0))
-
-            if current_slot_requests:
-                scheduled_timeslots[current_timeslot] = current_slot_requests
-                current_timeslot += 1
+            scheduled_timeslots[current_timeslot] = [queue.popleft() for queue in queues]
+            current_timeslot += 1
+            queues = [queue for queue in queues if queue]
 
         return scheduled_timeslots
     
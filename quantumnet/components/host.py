@@ -1,6 +1,5 @@
 import networkx as nx
-import matplotlib.pyplot as plt
-from ..objects import Logger, Qubit
+from ..objects import Logger, Qubit, TrackedList
 
 class Host():
     def __init__(self, host_id: int, probability_on_demand_qubit_create: float = 0.5, probability_replay_qubit_create: float = 0.5, max_qubits_create: int = 10, memory_size: int = 10) -> None:
@@ -8,7 +7,7 @@ class Host():
         self._host_id = host_id
         self._connections = []
         # Sobre o host
-        self._memory = []
+        self._memory = TrackedList()
         self._memory_size = memory_size
         self._max_qubits_create = max_qubits_create
         self._probability_on_demand_qubit_create = probability_on_demand_qubit_create
@@ -58,7 +57,7 @@ class Host():
         """
         Tabela de roteamento do host.
         Returns:
-            dict : Tabela de roteamento.
+            dict | RouteView : Tabela de roteamento no formato {destino: caminho}.
         """
         return self._routing_table
     
@@ -107,7 +106,7 @@ class Host():
         """
         Define a tabela de roteamento do host.
         Args:
-            routing_table (dict): Tabela de roteamento.
+            routing_table (dict | RouteView): Tabela de roteamento no formato {destino: caminho}.
         """
 
         self._routing_table = routing_table
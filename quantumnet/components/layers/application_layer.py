@@ -39,7 +39,7 @@ class ApplicationLayer:
         Returns:
             list: Lista de pares EPRs usados.
         """
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug("Qubits usados na camada %s: %s", self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def get_used_eprs(self):
@@ -49,9 +49,22 @@ class ApplicationLayer:
         Returns:
             list: Lista de pares EPRs usados.
         """
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug("Eprs usados na camada %s: %s", self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
+    def _new_qubit(self) -> Qubit:
+        """
+        Cria um qubit com ID único na rede.
+
+        O sorteio do antigo ID aleatório é mantido, sem uso, para que simulações com a mesma
+        semente continuem produzindo a mesma sequência de números aleatórios.
+
+        Returns:
+            Qubit : Novo qubit.
+        """
+        random.randint(0, 1000)
+        return Qubit(qubit_id=self._network.ids.next_id())
+
     def run_app(self, app_name, alice_id, bob_id, **kwargs):
         num_qubits = kwargs.get('num_qubits', 10)
         num_rounds = kwargs.get('num_rounds', None)
@@ -92,30 +105,30 @@ class ApplicationLayer:
         while len(final_key) < num_bits:
             num_qubits = int((num_bits - len(final_key)) * 2)  # Calcula o número de qubits necessários
             self.used_qubits += num_qubits
-            self.logger.log(f'Iniciando protocolo E91 com {num_qubits} qubits.')
+            self.logger.log('Iniciando protocolo E91 com %s qubits.', num_qubits)
 
             # Alice prepara os qubits
             key = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera uma chave aleatória de bits
             bases_alice = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Alice
             qubits = self.prepare_e91_qubits(key, bases_alice)  # Prepara os qubits com base na chave e nas bases
-            self.logger.log(f'Qubits preparados com a chave: {key} e bases: {bases_alice}')
+            self.logger.log('Qubits preparados com a chave: %s e bases: %s', key, bases_alice)
 
             # Transmissão dos qubits de Alice para Bob
             success = self._transport_layer.run_transport_layer(alice_id, bob_id, num_qubits)
             if not success:
-                self.logger.log(f'Falha na transmissão dos qubits de Alice para Bob.')
+                self.logger.log('Falha na transmissão dos qubits de Alice para Bob.')
                 return None
 
-            self.logger.debug(f"Timeslot incrementado após transmissão: {self._network.get_timeslot()}")
+            self.logger.debug("Timeslot incrementado após transmissão: %s", self._network.get_timeslot())
 
             # Bob escolhe bases aleatórias e mede os qubits
             bases_bob = [random.choice([0, 1]) for _ in range(num_qubits)]  # Gera bases de medição aleatórias para Bob
             results_bob = self.apply_bases_and_measure_e91(qubits, bases_bob)  # Bob mede os qubits usando suas bases
-            self.logger.log(f'Resultados das medições: {results_bob} com bases: {bases_bob}')
+            self.logger.log('Resultados das medições: %s com bases: %s', results_bob, bases_bob)
 
             # Alice e Bob compartilham suas bases e encontram os índices comuns
             common_indices = [i for i in range(len(bases_alice)) if bases_alice[i] == bases_bob[i]]  # Índices onde as bases coincidem
-            self.logger.log(f'Índices comuns: {common_indices}')
+            self.logger.log('Índices comuns: %s', common_indices)
 
             # Extração da chave com base nos índices comuns
             shared_key_alice = [key[i] for i in common_indices]  # Chave compartilhada gerada por Alice
@@ -126,11 +139,11 @@ class ApplicationLayer:
                 if a == b and len(final_key) < num_bits:  # Limita o tamanho da chave final
                     final_key.append(a)
 
-            self.logger.log(f"Chaves obtidas até agora: {final_key}")
+            self.logger.log("Chaves obtidas até agora: %s", final_key)
 
             if len(final_key) >= num_bits:
                 final_key = final_key[:num_bits] 
-                self.logger.log(f"Protocolo E91 bem-sucedido. Chave final compartilhada: {final_key}")
+                self.logger.log("Protocolo E91 bem-sucedido. Chave final compartilhada: %s", final_key)
                 return final_key
 
         return None
@@ -146,10 +159,10 @@ class ApplicationLayer:
         Returns:
             list: Lista de qubits preparados.
         """
-        self.logger.debug(f"Timeslot incrementado na função prepare_e91_qubits: {self._network.get_timeslot()}")
+        self.logger.debug("Timeslot incrementado na função prepare_e91_qubits: %s", self._network.get_timeslot())
         qubits = []
         for bit, base in zip(key, bases):
-            qubit = Qubit(qubit_id=random.randint(0, 1000))  # Cria um novo qubit com ID aleatório
+            qubit = self._new_qubit()  # Cria um novo qubit com ID único na rede
             if bit == 1:
                 qubit.apply_x()  # Aplica a porta X (NOT) ao qubit se o bit for 1
             if base == 1:
@@ -169,7 +182,7 @@ class ApplicationLayer:
         Returns:
             list: Resultados das medições.
         """
-        self.logger.debug(f"Timeslot incrementado na função apply_bases_and_measure_e91: {self._network.get_timeslot()}")
+        self.logger.debug("Timeslot incrementado na função apply_bases_and_measure_e91: %s", self._network.get_timeslot())
         results = []
         for qubit, base in zip(qubits, bases):
             if base == 1:
@@ -197,7 +210,7 @@ class ApplicationLayer:
         if circuit_depth is None:
             raise ValueError("Erro: 'circuit_depth' não foi fornecido ou está inválido.")
 
-        self.logger.log(f"Timeslot {self._network.get_timeslot()}: Iniciando protocolo Andrew Childs entre Alice {alice_id} e Bob {bob_id}.")
+        self.logger.log("Timeslot %s: Iniciando protocolo Andrew Childs entre Alice %s e Bob %s.", self._network.get_timeslot(), alice_id, bob_id)
         
         # Limpar memórias de Alice e Bob antes de começar
         self.logger.log("Limpando a memória do cliente (Alice) antes de iniciar o protocolo.")
@@ -206,40 +219,41 @@ class ApplicationLayer:
         bob.memory.clear()
 
         # O cliente prepara qubits e armazena-os
-        qubits = [Qubit(qubit_id=random.randint(0, 1000)) for _ in range(num_qubits)]
-        self.logger.log(f"Cliente criou {len(qubits)} qubits para a transmissão.")
+        qubits = [self._new_qubit() for _ in range(num_qubits)]
+        self.logger.log("Cliente criou %s qubits para a transmissão.", len(qubits))
 
         # Registrar qubits no dicionário de timeslots
         for qubit in qubits:
             self._network.qubit_timeslots[qubit.qubit_id] = {'timeslot': self._network.get_timeslot()}
-            self.logger.log(f"Qubit {qubit.qubit_id} registrado no timeslot {self._network.get_timeslot()}")
+            self.logger.log("Qubit %s registrado no timeslot %s", qubit.qubit_id, self._network.get_timeslot())
 
         # Log dos qubits após criação
-        for qubit in qubits:
-            self.logger.log(f"Qubit {qubit.qubit_id} criado pelo Cliente - Estado: {qubit._qubit_state}, Fase: {qubit._phase}")
+        if self.logger.enabled_for('log'):
+            for qubit in qubits:
+                self.logger.log("Qubit %s criado pelo Cliente - Estado: %s, Fase: %s", qubit.qubit_id, qubit._qubit_state, qubit._phase)
 
         # Armazena os qubits criados na memória do cliente
         alice.memory.extend(qubits)
-        self.logger.log(f"Alice recebeu {len(qubits)} qubits. Total: {len(alice.memory)} qubits na memória.")
+        self.logger.log("Alice recebeu %s qubits. Total: %s qubits na memória.", len(qubits), len(alice.memory))
 
         # Cria mensagem clássica com instruções
         operations_classical_message = [self.generate_random_operation() for _ in qubits]
-        self.logger.log(f"Instruções clássicas enviadas pelo Cliente: {operations_classical_message}")
+        self.logger.log("Instruções clássicas enviadas pelo Cliente: %s", operations_classical_message)
 
         # Calcula a rota se não fornecida
         route = slice_path or self._network.networklayer.short_route_valid(alice_id, bob_id)
         if not route:
-            self.logger.log(f"Erro: Nenhuma rota encontrada entre {alice_id} e {bob_id}.")
+            self.logger.log("Erro: Nenhuma rota encontrada entre %s e %s.", alice_id, bob_id)
             return None
 
-        self.logger.log(f"Rota calculada para o transporte: {route}")
+        self.logger.log("Rota calculada para o transporte: %s", route)
 
         # Limpar pares EPRs residuais na rota antes de iniciar o protocolo
-        self.logger.log(f"Timeslot {self._network.get_timeslot()}: Limpando pares EPRs residuais antes de iniciar o protocolo.")
+        self.logger.log("Timeslot %s: Limpando pares EPRs residuais antes de iniciar o protocolo.", self._network.get_timeslot())
         for i in range(len(route) - 1):
             u, v = route[i], route[i + 1]
             self._physical_layer.remove_all_eprs_from_channel((u, v))
-            self.logger.log(f"Pares EPRs limpos no segmento {u} -> {v}.")
+            self.logger.log("Pares EPRs limpos no segmento %s -> %s.", u, v)
 
         # Transporte de Alice para Bob
         success = self._transport_layer.run_transport_layer_eprs(alice_id, bob_id, len(qubits), route=route, scenario=scenario)
@@ -248,56 +262,57 @@ class ApplicationLayer:
             return None
 
         alice.memory.clear()
-        self.logger.log(f"Cliente enviou {len(qubits)} qubits para o Servidor.")
-        self.logger.log(f"Servidor tem {len(bob.memory)} qubits na memória após a recepção.")
+        self.logger.log("Cliente enviou %s qubits para o Servidor.", len(qubits))
+        self.logger.log("Servidor tem %s qubits na memória após a recepção.", len(bob.memory))
 
         # Servidor aplica operações
         tempo_de_operacao = circuit_depth
         print(f"Tempo de Operação: {tempo_de_operacao}")
 
-        for _ in range(tempo_de_operacao):
-            self._network.timeslot()
-            self.logger.log(f"Timeslot {self._network.get_timeslot()}: Servidor aplicando operações nos qubits.")
+        self._network.advance(tempo_de_operacao)
+        self.logger.log("Timeslot %s: Servidor aplicou operações nos qubits durante %s timeslots.", self._network.get_timeslot(), tempo_de_operacao)
         
         for qubit, operation in zip(qubits, operations_classical_message):
             self.apply_operation_from_message(qubit, operation)
         self.logger.log("Servidor aplicou as operações instruídas pelo Cliente nos qubits.")
 
         # Log após operações
-        for qubit in qubits:
-            self.logger.log(f"Qubit {qubit.qubit_id} após operações de Servidor - Estado: {qubit._qubit_state}, Fase: {qubit._phase}")
+        if self.logger.enabled_for('log'):
+            for qubit in qubits:
+                self.logger.log("Qubit %s após operações de Servidor - Estado: %s, Fase: %s", qubit.qubit_id, qubit._qubit_state, qubit._phase)
         
         # Limpa a memória do Cliente antes de devolver os qubits
-        self.logger.log(f"Limpando a memória do cliente antes de receber os qubits devolvidos.")
+        self.logger.log("Limpando a memória do cliente antes de receber os qubits devolvidos.")
         alice.memory.clear()
 
         # Devolve os qubits para Alice
         route_back = route[::-1]
         success = self._transport_layer.run_transport_layer_eprs(bob_id, alice_id, len(qubits), route=route_back, is_return=True, scenario=scenario)
         if not success:
-            self.logger.log(f"Falha ao devolver os qubits para o cliente. O servidor tinha {len(qubits)} qubits.")
+            self.logger.log("Falha ao devolver os qubits para o cliente. O servidor tinha %s qubits.", len(qubits))
             return None
 
         # Evita duplicação ao adicionar os qubits devolvidos
         existing_qubits_ids = {qubit.qubit_id for qubit in alice.memory}
         new_qubits = [qubit for qubit in qubits if qubit.qubit_id not in existing_qubits_ids]
         alice.memory.extend(new_qubits)
-        self.logger.log(f"Servidor devolveu {len(new_qubits)} qubits para o cliente.")
+        self.logger.log("Servidor devolveu %s qubits para o cliente.", len(new_qubits))
 
         # Log após retorno
-        for qubit in qubits:
-            self.logger.log(f"Qubit {qubit.qubit_id} devolvido para o cliente - Estado: {qubit._qubit_state}, Fase: {qubit._phase}")
+        if self.logger.enabled_for('log'):
+            for qubit in qubits:
+                self.logger.log("Qubit %s devolvido para o cliente - Estado: %s, Fase: %s", qubit.qubit_id, qubit._qubit_state, qubit._phase)
 
         # Decodificação Clifford
         for qubit, operation in zip(qubits, operations_classical_message):
             self.apply_clifford_decoding(qubit, operation)
-            self.logger.log(f"Cliente aplicou a decodificação Clifford no qubit {qubit.qubit_id}.")
+            self.logger.log("Cliente aplicou a decodificação Clifford no qubit %s.", qubit.qubit_id)
 
         # Verificação final
         if len(alice.memory) == num_qubits:
-            self.logger.log(f"Protocolo concluído com sucesso. O cliente tem {len(alice.memory)} qubits decodificados.")
+            self.logger.log("Protocolo concluído com sucesso. O cliente tem %s qubits decodificados.", len(alice.memory))
         else:
-            self.logger.log(f"Erro: Cliente tem {len(alice.memory)} qubits, mas deveria ter {num_qubits} qubits.")
+            self.logger.log("Erro: Cliente tem %s qubits, mas deveria ter %s qubits.", len(alice.memory), num_qubits)
             return None
 
         return qubits
@@ -364,12 +379,12 @@ class ApplicationLayer:
         if num_rounds is None:
             num_rounds = circuit_depth if circuit_depth is not None else num_qubits
 
-        self.logger.log(f"Protocolo configurado para {num_rounds} rodadas.")
+        self.logger.log("Protocolo configurado para %s rodadas.", num_rounds)
 
         print(f"Tempo de Operação: {circuit_depth}")
         
         self._network.timeslot()
-        self.logger.log(f"Timeslot {self._network.get_timeslot()}. Iniciando protocolo BFK com {num_qubits} qubits, {num_rounds} rodadas, e cenário {scenario}.")
+        self.logger.log("Timeslot %s. Iniciando protocolo BFK com %s qubits, %s rodadas, e cenário %s.", self._network.get_timeslot(), num_qubits, num_rounds, scenario)
 
         self.used_qubits += num_qubits
 
@@ -377,59 +392,59 @@ class ApplicationLayer:
         client = self._network.get_host(client_id)
         if hasattr(client, 'memory') and isinstance(client.memory, list):
             client.memory.clear()
-            self.logger.log(f"Memória do cliente {client_id} (Alice) limpa com sucesso.")
+            self.logger.log("Memória do cliente %s (Alice) limpa com sucesso.", client_id)
         else:
-            self.logger.log(f"O cliente {client_id} não possui memória ou atributo 'memory' para limpar.")
+            self.logger.log("O cliente %s não possui memória ou atributo 'memory' para limpar.", client_id)
 
         # Limpar a memória de Bob (servidor)
         server = self._network.get_host(server_id)
         if hasattr(server, 'memory') and isinstance(server.memory, list):
             server.memory.clear()
-            self.logger.log(f"Memória do servidor {server_id} (Bob) limpa com sucesso.")
+            self.logger.log("Memória do servidor %s (Bob) limpa com sucesso.", server_id)
         else:
-            self.logger.log(f"O servidor {server_id} não possui memória ou atributo 'memory' para limpar.")
+            self.logger.log("O servidor %s não possui memória ou atributo 'memory' para limpar.", server_id)
 
         # Cliente prepara os qubits
         self._network.timeslot()
-        self.logger.log(f"Timeslot {self._network.get_timeslot()}.")
+        self.logger.log("Timeslot %s.", self._network.get_timeslot())
         qubits = self.prepare_qubits(client_id, num_qubits)
         
         # Determinar a rota
         if slice_path:
-            self.logger.log(f"Usando rota específica para o transporte: {slice_path}")
+            self.logger.log("Usando rota específica para o transporte: %s", slice_path)
             route = slice_path
         else:
-            self.logger.log(f"Calculando rota padrão para o transporte.")
+            self.logger.log("Calculando rota padrão para o transporte.")
             route = self._network.networklayer.short_route_valid(client_id, server_id)
             if not route:
-                self.logger.log(f"Erro: Nenhuma rota encontrada entre {client_id} e {server_id}.")
+                self.logger.log("Erro: Nenhuma rota encontrada entre %s e %s.", client_id, server_id)
                 return None
 
         # Limpar pares EPRs residuais na rota
-        self.logger.log(f"Limpando pares EPRs residuais na rota: {route}")
+        self.logger.log("Limpando pares EPRs residuais na rota: %s", route)
         for i in range(len(route) - 1):
             u, v = route[i], route[i + 1]
             self._physical_layer.remove_all_eprs_from_channel((u, v))
-            self.logger.log(f"Pares EPRs limpos no segmento {u} -> {v}.")
+            self.logger.log("Pares EPRs limpos no segmento %s -> %s.", u, v)
 
         # Executar a transmissão usando a rota definida
         success = self._transport_layer.run_transport_layer_eprs_bfk(client_id, server_id, num_qubits, route=route, scenario=scenario)
         if not success:
-            self.logger.log(f"Falha ao transmitir qubits do cliente {client_id} para o servidor {server_id}.")
+            self.logger.log("Falha ao transmitir qubits do cliente %s para o servidor %s.", client_id, server_id)
             return None
 
         # Servidor cria o estado de brickwork com os qubits recebidos
         self._network.timeslot()
-        self.logger.log(f"Timeslot {self._network.get_timeslot()}.")
+        self.logger.log("Timeslot %s.", self._network.get_timeslot())
         success = self.create_brickwork_state(server_id, qubits)
         if not success:
-            self.logger.log(f"Falha na criação do estado de brickwork no servidor {server_id}.")
+            self.logger.log("Falha na criação do estado de brickwork no servidor %s.", server_id)
             return None
 
         # Cliente instrui o servidor a medir os qubits em cada rodada
         results = self.run_computation(client_id, server_id, num_rounds, qubits)
 
-        self.logger.log(f"Protocolo BFK concluído com sucesso. Resultados: {results}")
+        self.logger.log("Protocolo BFK concluído com sucesso. Resultados: %s", results)
         return results
 
 
@@ -452,11 +467,11 @@ class ApplicationLayer:
         # Loop para criar e preparar os qubits.
         for _ in range(num_qubits):
             r_j = random.choice([0, 1])  # Cliente gera um bit aleatório r_j
-            qubit = Qubit(qubit_id=random.randint(0, 1000))  # Cria um qubit com ID aleatório
+            qubit = self._new_qubit()  # Cria um qubit com ID único na rede
             if r_j == 1:
                 qubit.apply_x()  # Aplica a porta X se r_j for 1
             qubits.append(qubit)
-            self.logger.log(f"Qubit {qubit.qubit_id} preparado pelo cliente {alice_id}.")
+            self.logger.log("Qubit %s preparado pelo cliente %s.", qubit.qubit_id, alice_id)
         assert len(qubits) == num_qubits, "Número de qubits preparados não corresponde ao esperado."
         return qubits
     
@@ -479,7 +494,7 @@ class ApplicationLayer:
             control_qubit = qubits[i]  # Qubit de controle
             target_qubit = qubits[i + 1]  # Qubit alvo
             target_qubit.apply_controlled_phase(control_qubit)  # Aplica a fase controlada
-        self.logger.log(f"Servidor {bob_id} criou um estado de brickwork com {len(qubits)} qubits.")
+        self.logger.log("Servidor %s criou um estado de brickwork com %s qubits.", bob_id, len(qubits))
         return True
 
     
@@ -502,30 +517,35 @@ class ApplicationLayer:
 
         # Inicializa os ângulos de medição para todos os qubits
         angles = [random.uniform(0, 2 * math.pi) for _ in qubits]
-        self.logger.log(f"Cliente {alice_id} inicializou ângulos de medição: {angles}")
+        self.logger.log("Cliente %s inicializou ângulos de medição: %s", alice_id, angles)
 
         # Executa as rodadas de computação
+        verbose = self.logger.enabled_for('log')
         for round_num in range(num_rounds):
             round_results = []
 
+            # Cada medição ocupa um timeslot; as fidelidades não são lidas durante a rodada
+            self._network.advance(len(qubits))
+
             # Medição de todos os qubits na rodada atual
             for i, qubit in enumerate(qubits):
                 theta = angles[i]
-                self.logger.log(f"Rodada {round_num + 1}: Cliente {alice_id} instrui o servidor a medir o qubit {qubit.qubit_id} na base {theta}.")
+                if verbose:
+                    self.logger.log("Rodada %s: Cliente %s instrui o servidor a medir o qubit %s na base %s.", round_num + 1, alice_id, qubit.qubit_id, theta)
                 
                 # Servidor realiza a medição
-                self._network.timeslot()
                 result = qubit.measure_in_basis(theta)
                 round_results.append(result)
-                self.logger.log(f"Servidor {bob_id} mediu o qubit {qubit.qubit_id} na base {theta}, resultado: {result}.")
+                if verbose:
+                    self.logger.log("Servidor %s mediu o qubit %s na base %s, resultado: %s.", bob_id, qubit.qubit_id, theta, result)
 
                 # Cliente ajusta o ângulo para o próximo ciclo
                 angles[i] = self.adjust_measurement_basis(theta, result)
 
             measurement_results.append(round_results)
-            self.logger.log(f"Resultados da rodada {round_num + 1}: {round_results}")
+            self.logger.log("Resultados da rodada %s: %s", round_num + 1, round_results)
 
-        self.logger.log(f"Todas as rodadas concluídas. Resultados finais: {measurement_results[-1]}")
+        self.logger.log("Todas as rodadas concluídas. Resultados finais: %s", measurement_results[-1])
         return measurement_results
 
     def adjust_measurement_basis(self, theta, result):
@@ -1,6 +1,7 @@
 import networkx as nx
 from quantumnet.components import Host
 from quantumnet.objects import Logger, Epr
+from quantumnet.objects.trace import PURIFICATION, LINK
 from random import uniform
 
 class LinkLayer:
@@ -44,7 +45,7 @@ class LinkLayer:
         Returns:
             list: Lista de pares EPRs usados.
         """
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug("Eprs usados na camada %s: %s", self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
@@ -54,7 +55,7 @@ class LinkLayer:
         Returns:
             list: Lista de qubits usados.
         """
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug("Qubits usados na camada %s: %s", self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def request(self, alice_id: int, bob_id: int):
@@ -69,12 +70,12 @@ class LinkLayer:
             alice = self._network.get_host(alice_id)
             bob = self._network.get_host(bob_id)
         except KeyError:
-            self.logger.log(f'Host {alice_id} ou {bob_id} não encontrado na rede.')
+            self.logger.log('Host %s ou %s não encontrado na rede.', alice_id, bob_id)
             return False
 
         for attempt in range(1, 3):
             self._network.timeslot()
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Tentativa de emaranhamento entre {alice_id} e {bob_id}.')
+            self.logger.log('Timeslot %s: Tentativa de emaranhamento entre %s e %s.', self._network.get_timeslot(), alice_id, bob_id)
 
             entangle = self._physical_layer.entanglement_creation_heralding_protocol(alice, bob)
 
@@ -89,10 +90,10 @@ class LinkLayer:
                     self.created_eprs.extend(self._physical_layer.created_eprs)
                     self._physical_layer.created_eprs.clear()  # Limpa a lista da camada física
                 
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Entrelaçamento criado entre {alice} e {bob} na tentativa {attempt}.')
+                self.logger.log('Timeslot %s: Entrelaçamento criado entre %s e %s na tentativa %s.', self._network.get_timeslot(), alice, bob, attempt)
                 return True
             else:
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Entrelaçamento falhou entre {alice} e {bob} na tentativa {attempt}.')
+                self.logger.log('Timeslot %s: Entrelaçamento falhou entre %s e %s na tentativa %s.', self._network.get_timeslot(), alice, bob, attempt)
                 self._failed_requests.append((alice_id, bob_id))
 
         # Verifica se deve realizar a purificação após duas falhas
@@ -159,7 +160,7 @@ class LinkLayer:
         eprs_fail = self._physical_layer.failed_eprs
 
         if len(eprs_fail) < 2:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Não há EPRs suficientes para purificação no canal ({alice_id}, {bob_id}).')
+            self.logger.log('Timeslot %s: Não há EPRs suficientes para purificação no canal (%s, %s).', self._network.get_timeslot(), alice_id, bob_id)
             return False
 
         eprs_fail1 = eprs_fail[-1]
@@ -177,22 +178,25 @@ class LinkLayer:
             new_fidelity = self.purification_calculator(f1, f2, purification_type)
 
             if new_fidelity > 0.8:  
-                epr_purified = Epr((alice_id, bob_id), new_fidelity)
+                epr_purified = Epr(self._network.ids.next_id(), new_fidelity)
                 self._physical_layer.add_epr_to_channel(epr_purified, (alice_id, bob_id))
                 self._physical_layer.failed_eprs.remove(eprs_fail1)
                 self._physical_layer.failed_eprs.remove(eprs_fail2)
-                self.logger.log(f'EPRS Usados {self.used_eprs}')
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Purificação bem sucedida no canal ({alice_id}, {bob_id}) com nova fidelidade {new_fidelity}.')
+                self._network.trace.record(PURIFICATION, LINK, self._network.get_timeslot(), alice_id, bob_id, new_fidelity, 1)
+                self.logger.log('EPRS Usados %s', self.used_eprs)
+                self.logger.log('Timeslot %s: Purificação bem sucedida no canal (%s, %s) com nova fidelidade %s.', self._network.get_timeslot(), alice_id, bob_id, new_fidelity)
                 return True
             else:
                 self._physical_layer.failed_eprs.remove(eprs_fail1)
                 self._physical_layer.failed_eprs.remove(eprs_fail2)
-                self.logger.log(f'Timeslot {self._network.get_timeslot()}: Purificação falhou no canal ({alice_id}, {bob_id}) devido a baixa fidelidade após purificação.')
+                self._network.trace.record(PURIFICATION, LINK, self._network.get_timeslot(), alice_id, bob_id, new_fidelity, 0)
+                self.logger.log('Timeslot %s: Purificação falhou no canal (%s, %s) devido a baixa fidelidade após purificação.', self._network.get_timeslot(), alice_id, bob_id)
                 return False
         else:
             self._physical_layer.failed_eprs.remove(eprs_fail1)
             self._physical_layer.failed_eprs.remove(eprs_fail2)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Purificação falhou no canal ({alice_id}, {bob_id}) devido a baixa probabilidade de sucesso da purificação.')
+            self._network.trace.record(PURIFICATION, LINK, self._network.get_timeslot(), alice_id, bob_id, value=0)
+            self.logger.log('Timeslot %s: Purificação falhou no canal (%s, %s) devido a baixa probabilidade de sucesso da purificação.', self._network.get_timeslot(), alice_id, bob_id)
             return False
 
     def banded_purification(self, alice_id: int, bob_id: int, target_fidelity: float = 0.95, max_attempts: int = 10):
@@ -208,7 +212,7 @@ class LinkLayer:
         Returns:
             bool : True se a purificação foi bem-sucedida, False caso contrário.
         """
-        self.logger.log(f"Começando a purificação banded entre {alice_id} e {bob_id} com alvo de fidelidade {target_fidelity}")
+        self.logger.log("Começando a purificação banded entre %s e %s com alvo de fidelidade %s", alice_id, bob_id, target_fidelity)
 
         # Verificar se temos pelo menos dois EPRs para purificação
         if len(self.created_eprs) < 2:
@@ -236,14 +240,16 @@ class LinkLayer:
 
             # Se a fidelidade atingir o alvo, cria o novo EPR e finaliza
             if new_fidelity >= target_fidelity:
-                epr_purified = Epr((alice_id, bob_id), new_fidelity)
+                epr_purified = Epr(self._network.ids.next_id(), new_fidelity)
                 self._physical_layer.add_epr_to_channel(epr_purified, (alice_id, bob_id))
-                self.logger.log(f"Purificação banded bem-sucedida com fidelidade {new_fidelity}.")
+                self._network.trace.record(PURIFICATION, LINK, self._network.get_timeslot(), alice_id, bob_id, new_fidelity, 1)
+                self.logger.log("Purificação banded bem-sucedida com fidelidade %s.", new_fidelity)
                 return True
             else:
                 # Se a fidelidade ainda não é suficiente, continua a purificação com o próximo par de EPRs
-                self.created_eprs.insert(0, Epr((alice_id, bob_id), new_fidelity))  # Coloca o EPR no início para evitar repetição no final
-                self.logger.log(f"Fidelidade após purificação banded: {new_fidelity}. Tentativa {attempt + 1} de {max_attempts}. Continuando o processo.")
+                self.created_eprs.insert(0, Epr(self._network.ids.next_id(), new_fidelity))  # Coloca o EPR no início para evitar repetição no final
+                self._network.trace.record(PURIFICATION, LINK, self._network.get_timeslot(), alice_id, bob_id, new_fidelity, 0)
+                self.logger.log("Fidelidade após purificação banded: %s. Tentativa %s de %s. Continuando o processo.", new_fidelity, attempt + 1, max_attempts)
 
             attempt += 1
 
@@ -270,5 +276,5 @@ class LinkLayer:
         print(f'Total de EPRs criados na camada de enlace: {total_eprs}')
         print(f'Total de fidelidade dos EPRs criados na camada de enlace: {total_fidelity}')
         avg_fidelity = total_fidelity / total_eprs
-        self.logger.log(f'A fidelidade média dos EPRs criados na camada de enlace é {avg_fidelity}')
+        self.logger.log('A fidelidade média dos EPRs criados na camada de enlace é %s', avg_fidelity)
         return avg_fidelity
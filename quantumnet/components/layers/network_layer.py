@@ -1,7 +1,12 @@
+import heapq
+import math
+from itertools import islice
 import networkx as nx
+import numpy as np
 from quantumnet.components import Host
 from quantumnet.objects import Logger, Epr
-from random import uniform
+from quantumnet.objects.trace import SWAP, NETWORK, EPR_CREATED, EPR_CONSUMED
+from random import uniform, getrandbits
 
 class NetworkLayer:
     def __init__(self, network, link_layer, physical_layer):
@@ -21,6 +26,12 @@ class NetworkLayer:
         self.used_eprs = 0  
         self.used_qubits = 0  
         self.routes_used = {}  
+        self._route_cache = {}
+        self.routing_mode = 'hops'
+        self.max_hops = None
+        self.swapping_mode = 'sequential'
+        self._fidelity_weights = {}
+        self._topology = None
 
     def __str__(self):
         """ 
@@ -38,7 +49,7 @@ class NetworkLayer:
         Returns:
             list: Lista de pares EPRs usados.
         """
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug("Eprs usados na camada %s: %s", self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
@@ -48,65 +59,436 @@ class NetworkLayer:
         Returns:
             list: Lista de qubits usados.
         """
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug("Qubits usados na camada %s: %s", self.__class__.__name__, self.used_qubits)
         return self.used_qubits
 
-    def short_route_valid(self, Alice: int, Bob: int, increment_timeslot=True) -> list:
+    def set_routing_mode(self, mode: str = 'hops', max_hops: int = None):
+        """
+        Define o critério de escolha de rotas de `short_route_valid`.
+
+        Args:
+            mode (str): 'hops' para o caminho mais curto com pares EPR em todos os canais, ou
+                'fidelity' para o caminho de maior fidelidade fim a fim (ver `best_fidelity_route`).
+            max_hops (int, optional): Número máximo de saltos no modo 'fidelity'.
+        """
+        if mode not in ('hops', 'fidelity'):
+            raise ValueError(f'Modo de roteamento desconhecido: {mode}')
+        self.routing_mode = mode
+        self.max_hops = max_hops
+
+    def short_route_valid(self, Alice: int, Bob: int, increment_timeslot=True, min_eprs: int = 1, min_fidelity: float = None) -> list:
         """
         Escolhe a melhor rota entre dois hosts com critérios adicionais.
 
+        No modo de roteamento 'fidelity' (ver `set_routing_mode`), a rota é a de maior
+        fidelidade fim a fim em vez da de menos saltos.
+
+        A rota é um caminho mais curto do grafo em que todos os canais têm pares EPR. A busca
+        percorre apenas os canais com pares EPR que avançam em direção ao destino, sem enumerar
+        os caminhos mais curtos alternativos (ver `epr_shortest_path`). Com os critérios padrão,
+        o resultado fica em cache por (origem, destino) e é revalidado pelas versões dos canais
+        (ver `cached_route`).
+
         args:
             Alice (int): ID do host de origem.
             Bob (int): ID do host de destino.
             increment_timeslot (bool): Indica se o timeslot deve ser incrementado.
+            min_eprs (int): Número mínimo de pares EPR em cada canal da rota.
+            min_fidelity (float, optional): Fidelidade mínima dos pares EPR contados em `min_eprs`.
             
         returns:
             list or None: Lista com a melhor rota entre os hosts ou None se não houver rota válida.
         """
         if increment_timeslot:
             self._network.timeslot()  # Incrementa o timeslot sempre que uma rota é verificada
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Buscando rota válida entre {Alice} e {Bob}.')
+            self.logger.log('Timeslot %s: Buscando rota válida entre %s e %s.', self._network.get_timeslot(), Alice, Bob)
 
         if Alice is None or Bob is None:
             self.logger.log('IDs de hosts inválidos fornecidos.')
             return None
 
         if not self._network.graph.has_node(Alice) or not self._network.graph.has_node(Bob):
-            self.logger.log(f'Um dos nós ({Alice} ou {Bob}) não existe no grafo.')
+            self.logger.log('Um dos nós (%s ou %s) não existe no grafo.', Alice, Bob)
             return None
 
+        if self.routing_mode == 'fidelity':
+            path = self.best_fidelity_route(Alice, Bob, self.max_hops, min_eprs)
+            if path is None:
+                self.logger.log('Nenhuma rota válida encontrada.')
+                return None
+            self.logger.log('Rota de maior fidelidade encontrada: %s', path)
+            if (Alice, Bob) not in self.routes_used:
+                self.routes_used[(Alice, Bob)] = path.copy()
+            return path
+
+        cacheable = min_eprs == 1 and min_fidelity is None
+        if cacheable:
+            hit, path = self.cached_route(Alice, Bob)
+            if hit:
+                if path is None:
+                    self.logger.log('Nenhuma rota válida encontrada.')
+                    return None
+                self.logger.log('Rota válida encontrada: %s', path)
+                return list(path)
+
         try:
-            all_shortest_paths = list(nx.all_shortest_paths(self._network.graph, Alice, Bob))
+            path = self.epr_shortest_path(Alice, Bob, min_eprs, min_fidelity)
         except nx.NetworkXNoPath:
-            self.logger.log(f'Sem rota encontrada entre {Alice} e {Bob}')
+            self.logger.log('Sem rota encontrada entre %s e %s', Alice, Bob)
+            path = None
+            found = False
+        else:
+            found = True
+        if cacheable:
+            self._cache_route(Alice, Bob, path)
+        if not found:
             return None
 
-        for path in all_shortest_paths:
-            valid_path = True
-            for i in range(len(path) - 1):
-                node = path[i]
-                next_node = path[i + 1]
-                if len(self._network.get_eprs_from_edge(node, next_node)) < 1:
-                    self.logger.log(f'Sem pares EPRs entre {node} e {next_node} na rota {path}')
-                    valid_path = False
-                    break
+        if path is not None:
+            self.logger.log('Rota válida encontrada: %s', path)
+
+            # Armazena a rota se for a primeira vez que é usada
+            if (Alice, Bob) not in self.routes_used:
+                self.routes_used[(Alice, Bob)] = path.copy()
+
+            return path
+
+        self.logger.log('Nenhuma rota válida encontrada.')
+        return None
+
+    def cached_route(self, Alice: int, Bob: int):
+        """
+        Consulta a rota guardada em cache para (Alice, Bob), sem refazer a busca.
+
+        Uma rota guardada continua válida enquanto a topologia não mudar, nenhum pool de EPRs
+        da rede deixar de estar vazio (época de preenchimento) e nenhum canal da rota mudar de
+        versão, isto é, ficar vazio. Nessas condições a busca devolveria a mesma rota: os
+        caminhos examinados antes dela continuam sem pares EPR. A ausência de rota é guardada
+        da mesma forma e só é invalidada por uma mudança de topologia ou por um preenchimento.
+
+        Args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
 
-            if valid_path:
-                self.logger.log(f'Rota válida encontrada: {path}')
+        Returns:
+            tuple : (True, rota ou None) se o cache for válido, (False, None) caso contrário.
+        """
+        self._check_topology()
+        entry = self._route_cache.get((Alice, Bob))
+        if entry is None:
+            return False, None
+        graph, topology_version, fill_epoch, path, channels, versions = entry
+        network = self._network
+        if graph is not network.graph or topology_version != network.topology_version or fill_epoch != network.fill_epoch.value:
+            return False, None
+        for channel, version in zip(channels, versions):
+            if channel.version != version:
+                return False, None
+        return True, path
+
+    def _check_topology(self):
+        """
+        Descarta as rotas e os pesos em cache quando o grafo ou a versão da topologia mudam, para
+        não manter canais e grafos que a rede já não usa.
+        """
+        network = self._network
+        topology = (network.graph, network.topology_version)
+        if self._topology is None or self._topology[0] is not topology[0] or self._topology[1] != topology[1]:
+            self._route_cache.clear()
+            self._fidelity_weights.clear()
+            self._topology = topology
+
+    def _cache_route(self, Alice: int, Bob: int, path: list):
+        self._check_topology()
+        network = self._network
+        path = list(path) if path else path
+        channels = network.plan_route(path).channels if path else ()
+        self._route_cache[(Alice, Bob)] = (network.graph, network.topology_version, network.fill_epoch.value,
+                                           path, channels, tuple(channel.version for channel in channels))
+
+    def channel_fidelity_weight(self, u: int, v: int, min_eprs: int = 1) -> float:
+        """
+        Peso do canal para o roteamento por fidelidade: -log da melhor fidelidade entre os pares EPR do canal.
+
+        O peso fica guardado por canal e só é recalculado quando o pool do canal muda ou quando
+        alguma fidelidade de um par do pool é escrita. A decoerência multiplica todos os pares
+        vivos pelo mesmo fator, então entre duas leituras o peso apenas aumenta na decoerência
+        acumulada no intervalo (ver `FidelityStore.log_retention`), com o fator efetivamente
+        aplicado, sem recalcular o máximo. Os pesos e as rotas em cache são descartados quando a
+        topologia da rede muda.
+
+        Args:
+            u (int): ID de um dos nós.
+            v (int): ID do outro nó.
+            min_eprs (int): Número mínimo de pares EPR para o canal ser usado.
+
+        Returns:
+            float : Peso do canal, ou None se o canal não existir ou não tiver pares EPR suficientes.
+        """
+        network = self._network
+        if not network.has_channel(u, v):
+            return None
+        channel = network.get_channel(u, v)
+        eprs = channel.eprs
+        if len(eprs) < min_eprs:
+            return None
+        self._check_topology()
+        store = network.fidelity_store
+        key = (eprs.revision, eprs.writes)
+        retained = store.log_retention()
+        cached = self._fidelity_weights.get(channel)
+        if cached is not None and cached[0] == key and eprs._store is store:
+            _, weight, stamp = cached
+            if retained < stamp and weight != math.inf:
+                weight += stamp - retained
+            return weight
+        best = float(eprs.fidelities().max())
+        weight = -math.log(best) if best > 0 else math.inf
+        self._fidelity_weights[channel] = (key, weight, retained)
+        return weight
+
+    def best_fidelity_route(self, Alice: int, Bob: int, max_hops: int = None, min_eprs: int = 1) -> list:
+        """
+        Retorna a rota de maior fidelidade fim a fim entre dois hosts.
 
-                # Armazena a rota se for a primeira vez que é usada
-                if (Alice, Bob) not in self.routes_used:
-                    self.routes_used[(Alice, Bob)] = path.copy()
+        A fidelidade de uma rota é o produto das fidelidades dos melhores pares EPR de cada
+        canal, como em `TransportLayer.calculate_average_fidelity`. Maximizar o produto equivale
+        a minimizar a soma de -log(fidelidade), o que é feito por Dijkstra. Com `max_hops`, os
+        estados são (nó, saltos) e um estado só é expandido se chegar ao nó com menos saltos que
+        todos os estados já fixados nele, o que mantém a busca próxima de um Dijkstra simples.
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+            max_hops (int, optional): Número máximo de saltos da rota.
+            min_eprs (int): Número mínimo de pares EPR em cada canal.
 
+        returns:
+            list or None: Rota encontrada, ou None se nenhuma rota tiver pares EPR suficientes.
+        """
+        graph = self._network.graph
+        if not graph.has_node(Alice) or not graph.has_node(Bob):
+            return None
+        adj = graph.adj
+        weight = self.channel_fidelity_weight
+        settled = {}
+        parents = []
+        counter = 0
+        heap = [(0.0, 0, counter, Alice, -1)]
+        while heap:
+            cost, hops, _, node, parent = heapq.heappop(heap)
+            if node in settled and (max_hops is None or hops >= settled[node]):
+                continue
+            settled[node] = hops
+            parents.append((node, parent))
+            if node == Bob:
+                path = []
+                index = len(parents) - 1
+                while index >= 0:
+                    node, index = parents[index]
+                    path.append(node)
+                path.reverse()
+                self.logger.debug('Fidelidade estimada da rota %s: %s', path, math.exp(-cost))
                 return path
+            if max_hops is not None and hops >= max_hops:
+                continue
+            record = len(parents) - 1
+            for v in adj[node]:
+                if v in settled and (max_hops is None or hops + 1 >= settled[v]):
+                    continue
+                w = weight(node, v, min_eprs)
+                if w is None or w == math.inf:
+                    continue
+                counter += 1
+                heapq.heappush(heap, (cost + w, hops + 1, counter, v, record))
+        return None
 
-        self.logger.log('Nenhuma rota válida encontrada.')
+    def epr_shortest_path(self, Alice: int, Bob: int, min_eprs: int = 1, min_fidelity: float = None) -> list:
+        """
+        Retorna o primeiro caminho mais curto (no grafo completo) cujos canais têm pares EPR suficientes.
+
+        Uma busca em largura a partir de Bob calcula a distância de cada nó até o destino. Em
+        seguida, uma busca em profundidade a partir de Alice segue apenas canais com pares EPR
+        que reduzem essa distância em um salto, marcando como sem saída os nós que não alcançam
+        Bob. Cada nó e cada canal são examinados no máximo uma vez, então a busca custa O(V+E)
+        mesmo em grades, onde o número de caminhos mais curtos cresce combinatoriamente.
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+            min_eprs (int): Número mínimo de pares EPR em cada canal.
+            min_fidelity (float, optional): Fidelidade mínima dos pares EPR contados em `min_eprs`.
+
+        returns:
+            list or None: Caminho encontrado, ou None se nenhum caminho mais curto tiver pares EPR suficientes.
+
+        raises:
+            nx.NetworkXNoPath: Se não houver caminho entre os hosts no grafo.
+        """
+        graph = self._network.graph
+        distance = nx.single_source_shortest_path_length(graph, Bob)
+        if Alice not in distance:
+            raise nx.NetworkXNoPath(f'Sem caminho entre {Alice} e {Bob}.')
+
+        network = self._network
+
+        def usable(u, v):
+            if not network.has_channel(u, v):
+                return False
+            eprs = network.get_channel(u, v).eprs
+            if len(eprs) < min_eprs:
+                return False
+            if min_fidelity is None:
+                return True
+            return int((eprs.fidelities() >= min_fidelity).sum()) >= min_eprs
+
+        adj = graph.adj
+        path = [Alice]
+        stack = [iter(adj[Alice])]
+        dead = set()
+        while stack:
+            u = path[-1]
+            if u == Bob:
+                return path
+            step = distance[u] - 1
+            for v in stack[-1]:
+                if v not in dead and distance.get(v) == step and usable(u, v):
+                    path.append(v)
+                    stack.append(iter(adj[v]))
+                    break
+            else:
+                self.logger.debug('Sem pares EPRs a partir de %s em direção a %s.', u, Bob)
+                dead.add(u)
+                path.pop()
+                stack.pop()
         return None
 
+    def k_routes(self, Alice: int, Bob: int, k: int, min_eprs: int = 1) -> list:
+        """
+        Retorna até `k` rotas sem ciclos entre dois hosts, da mais curta para a mais longa.
+
+        As rotas são geradas pelo algoritmo de Yen (`nx.shortest_simple_paths`) sobre a visão do
+        grafo restrita aos canais com pares EPR suficientes. Os candidatos são produzidos sob
+        demanda, então só as `k` primeiras rotas são calculadas.
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+            k (int): Número máximo de rotas.
+            min_eprs (int): Número mínimo de pares EPR em cada canal.
+
+        returns:
+            list : Rotas encontradas (possivelmente vazia).
+        """
+        graph = self._network.graph
+        if k < 1 or not graph.has_node(Alice) or not graph.has_node(Bob):
+            return []
+        network = self._network
+
+        def usable(u, v):
+            return network.has_channel(u, v) and len(network.get_channel(u, v).eprs) >= min_eprs
+
+        view = nx.subgraph_view(graph, filter_edge=usable)
+        try:
+            return list(islice(nx.shortest_simple_paths(view, Alice, Bob), k))
+        except nx.NetworkXNoPath:
+            return []
+
+    def route_inventory(self, route: list) -> int:
+        """
+        Retorna o estoque de pares EPR de uma rota: o menor número de pares entre os seus canais.
+
+        args:
+            route (list): Rota.
+
+        returns:
+            int : Número de pares EPR do canal mais vazio da rota.
+        """
+        network = self._network
+        return min((len(network.get_eprs_from_edge(route[i], route[i + 1])) for i in range(len(route) - 1)), default=0)
+
+    def split_load(self, routes: list, num_qubits: int) -> list:
+        """
+        Divide `num_qubits` qubits entre as rotas na proporção do estoque de pares EPR de cada uma.
+
+        A divisão usa o método dos maiores restos. Se o estoque total bastar para os qubits,
+        nenhuma rota recebe mais qubits do que o seu estoque.
+
+        args:
+            routes (list): Rotas candidatas.
+            num_qubits (int): Número de qubits a distribuir.
+
+        returns:
+            list : Pares (rota, número de qubits), apenas das rotas que recebem qubits.
+        """
+        inventories = [self.route_inventory(route) for route in routes]
+        total = sum(inventories)
+        if total == 0 or num_qubits <= 0:
+            return []
+        shares = [num_qubits * inventory / total for inventory in inventories]
+        counts = [int(share) for share in shares]
+        remaining = num_qubits - sum(counts)
+        by_remainder = sorted(range(len(routes)), key=lambda i: counts[i] - shares[i])
+        for i in by_remainder[:remaining]:
+            counts[i] += 1
+        return [(route, count) for route, count in zip(routes, counts) if count > 0]
+
+    def multipath_routes(self, Alice: int, Bob: int, num_qubits: int, k: int, increment_timeslot=True) -> list:
+        """
+        Escolhe uma rota para cada qubit, espalhando a carga entre até `k` rotas (ver `k_routes` e `split_load`).
+
+        args:
+            Alice (int): ID do host de origem.
+            Bob (int): ID do host de destino.
+            num_qubits (int): Número de qubits.
+            k (int): Número máximo de rotas.
+            increment_timeslot (bool): Indica se o timeslot deve ser incrementado.
+
+        returns:
+            list or None: Rota de cada qubit, ou None se não houver rota válida.
+        """
+        if increment_timeslot:
+            self._network.timeslot()
+            self.logger.log('Timeslot %s: Buscando até %s rotas válidas entre %s e %s.', self._network.get_timeslot(), k, Alice, Bob)
+
+        plan = self.split_load(self.k_routes(Alice, Bob, k), num_qubits)
+        if not plan:
+            self.logger.log('Nenhuma rota válida encontrada.')
+            return None
+
+        routes = []
+        for route, count in plan:
+            self.logger.log('Rota %s recebe %s qubits.', route, count)
+            routes.extend([route] * count)
+        if (Alice, Bob) not in self.routes_used:
+            self.routes_used[(Alice, Bob)] = plan[0][0].copy()
+        return routes
+
+    def set_swapping_mode(self, mode: str = 'sequential'):
+        """
+        Define a ordem dos swaps de `entanglement_swapping`.
+
+        Args:
+            mode (str): 'sequential' para trocar os segmentos da esquerda para a direita, um por
+                timeslot, ou 'nested' para trocar em árvore balanceada, com os swaps de posições
+                disjuntas no mesmo timeslot.
+        """
+        if mode not in ('sequential', 'nested'):
+            raise ValueError(f'Modo de swapping desconhecido: {mode}')
+        self.swapping_mode = mode
 
     def entanglement_swapping(self, Alice: int = None, Bob: int = None) -> bool:
         """
         Realiza o Entanglement Swapping em toda a rota determinada pelo short_route_valid.
+
+        No modo 'sequential' (padrão), os segmentos são trocados da esquerda para a direita e
+        cada salto custa um timeslot. No modo 'nested' (ver `set_swapping_mode`), cada rodada
+        troca ao mesmo tempo os pares de segmentos vizinhos disjuntos, como em uma cadeia de
+        repetidores, e uma rota de h saltos é concluída em ceil(log2 h) timeslots. As
+        fidelidades e probabilidades de sucesso seguem as mesmas fórmulas nos dois modos.
+
+        Os pares virtuais intermediários e o par fim a fim ficam em `Network.virtual_links`,
+        com validade limitada, e não como novas arestas do grafo da rede.
         
         args:
             Alice (int, optional): ID do host de origem. Se não fornecido, usa o primeiro nó da rota válida.
@@ -127,83 +509,255 @@ class NetworkLayer:
         Alice = route[0]
         Bob = route[-1]
 
+        if self.swapping_mode == 'nested':
+            success = self._nested_swapping(route)
+        else:
+            success = self._sequential_swapping(route)
+        if not success:
+            return False
+
+        # Loga o sucesso do entanglement swapping
+        self.logger.log('Entanglement Swapping concluído com sucesso entre %s e %s', Alice, Bob)
+        return True
+
+    def _sequential_swapping(self, route: list) -> bool:
+        # Par virtual entre route[0] e route[1], produzido pelo swapping anterior
+        carried = None
+
         # Itera sobre a rota realizando o entanglement swapping para cada segmento da rota
         while len(route) > 1:
             # Incrementa o timeslot antes de cada operação de entanglement swapping
             self._network.timeslot()
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Realizando Entanglement Swapping.')
+            self.logger.log('Timeslot %s: Realizando Entanglement Swapping.', self._network.get_timeslot())
 
             node1 = route[0]    
             node2 = route[1]    
             node3 = route[2] if len(route) > 2 else None  
 
-            # Verifica se existe um canal entre node1 e node2
-            if not self._network.graph.has_edge(node1, node2):
-                self.logger.log(f'Canal entre {node1}-{node2} não existe')
-                return False
-
-            try:
-                # Obtém o primeiro par EPR entre node1 e node2
-                epr1 = self._network.get_eprs_from_edge(node1, node2)[0]
-            except IndexError:
-                # Se não houver pares EPR suficientes, loga a falha e retorna False
-                self.logger.log(f'Não há pares EPRs suficientes entre {node1}-{node2}')
-                return False
-
             # Se houver um terceiro nó, realiza o swapping entre node1, node2 e node3
             if node3 is not None:
-                # Verifica se existe um canal entre node2 e node3
-                if not self._network.graph.has_edge(node2, node3):
-                    self.logger.log(f'Canal entre {node2}-{node3} não existe')
+                carried = self._swap(node1, node2, node3, carried)
+                if carried is None:
                     return False
+            elif carried is None and self._first_epr(node1, node2) is None:
+                return False
 
-                try:
-                    # Obtém o primeiro par EPR entre node2 e node3
-                    epr2 = self._network.get_eprs_from_edge(node2, node3)[0]
-                except IndexError:
-                    # Se não houver pares EPR suficientes, loga a falha e retorna False
-                    self.logger.log(f'Não há pares EPRs suficientes entre {node2}-{node3}')
-                    return False
+            # Remove o segundo nó da rota, pois o swapping foi realizado
+            route.pop(1)
+        return True
 
-                # Mede a fidelidade dos pares EPR
-                fidelity1 = epr1.get_current_fidelity()
-                fidelity2 = epr2.get_current_fidelity()
-                
-                # Calcula a probabilidade de sucesso do entanglement swapping
-                success_prob = fidelity1 * fidelity2 + (1 - fidelity1) * (1 - fidelity2)
-                
-                # Verifica se o swapping foi bem-sucedido com base na probabilidade de sucesso
-                if uniform(0, 1) > success_prob:
-                    self.logger.log(f'Entanglement Swapping falhou entre {node1}-{node2} e {node2}-{node3}')
+    def _nested_swapping(self, route: list) -> bool:
+        if len(route) == 2:
+            # Rota de um salto: o par do canal é verificado em um timeslot, como no modo sequencial
+            self._network.timeslot()
+            self.logger.log('Timeslot %s: Realizando Entanglement Swapping.', self._network.get_timeslot())
+            return self._first_epr(route[0], route[1]) is not None
+
+        # Segmentos (início, fim, par EPR); None indica o primeiro par do canal físico
+        segments = [(u, v, None) for u, v in zip(route, route[1:])]
+        while len(segments) > 1:
+            # Uma rodada por timeslot: cada swap usa um par de segmentos vizinhos disjunto dos demais
+            self._network.timeslot()
+            self.logger.log('Timeslot %s: Realizando rodada de Entanglement Swapping aninhado em %s.', self._network.get_timeslot(),
+                            [segment[0] for segment in segments] + [segments[-1][1]])
+            combined = []
+            for i in range(0, len(segments) - 1, 2):
+                node1, node2, epr1 = segments[i]
+                _, node3, epr2 = segments[i + 1]
+                epr_virtual = self._swap(node1, node2, node3, epr1, epr2)
+                if epr_virtual is None:
                     return False
+                combined.append((node1, node3, epr_virtual))
+            # Com um número ímpar de segmentos, o último passa para a próxima rodada
+            if len(segments) % 2:
+                combined.append(segments[-1])
+            segments = combined
+        return True
 
-                # Calcula a nova fidelidade do par EPR virtual
-                new_fidelity = (fidelity1 * fidelity2) / ((fidelity1 * fidelity2) + (1 - fidelity1) * (1 - fidelity2))
-                epr_virtual = Epr((node1, node3), new_fidelity)
+    def _first_epr(self, u: int, v: int):
+        # Verifica se existe um canal entre u e v
+        if not self._network.has_channel(u, v):
+            self.logger.log('Canal entre %s-%s não existe', u, v)
+            return None
+        try:
+            # Obtém o primeiro par EPR entre u e v
+            return self._network.get_eprs_from_edge(u, v)[0]
+        except IndexError:
+            # Se não houver pares EPR suficientes, loga a falha
+            self.logger.log('Não há pares EPRs suficientes entre %s-%s', u, v)
+            return None
 
-                # Se o canal entre node1 e node3 não existir, adiciona um novo canal
-                if not self._network.graph.has_edge(node1, node3):
-                    self._network.graph.add_edge(node1, node3, eprs=[])
+    def _store_virtual_epr(self, epr: Epr, u: int, v: int):
+        network = self._network
+        network.virtual_links.add(epr, u, v, network.get_timeslot())
+        if network.trace.enabled:
+            network.trace.record(EPR_CREATED, NETWORK, network.get_timeslot(), u, v, epr.get_current_fidelity(), epr.epr_id)
+
+    def _consume_epr(self, epr: Epr, u: int, v: int):
+        network = self._network
+        if network.virtual_links.remove(epr, u, v):
+            if network.trace.enabled:
+                network.trace.record(EPR_CONSUMED, NETWORK, network.get_timeslot(), u, v, epr.get_current_fidelity(), epr.epr_id)
+        else:
+            network.physical.remove_epr_from_channel(epr, (u, v))
 
-                # Adiciona o par EPR virtual ao canal entre node1 e node3
-                self._network.physical.add_epr_to_channel(epr_virtual, (node1, node3))
+    def _swap(self, node1: int, node2: int, node3: int, epr1: Epr = None, epr2: Epr = None) -> Epr:
+        """
+        Troca os pares EPR de node1-node2 e node2-node3 por um par EPR virtual entre node1 e node3.
 
-                # Remove os pares EPR antigos dos canais entre node1-node2 e node2-node3
-                self._network.physical.remove_epr_from_channel(epr1, (node1, node2))
-                self._network.physical.remove_epr_from_channel(epr2, (node2, node3))
+        O par virtual é guardado em `Network.virtual_links`, sem adicionar a aresta node1-node3 ao grafo.
 
-                # Atualiza o contador de EPRs utilizados
-                self.used_eprs += 1
+        args:
+            node1 (int): ID do primeiro nó.
+            node2 (int): ID do nó intermediário.
+            node3 (int): ID do último nó.
+            epr1 (Epr, optional): Par entre node1 e node2. Padrão: o primeiro par do canal.
+            epr2 (Epr, optional): Par entre node2 e node3. Padrão: o primeiro par do canal.
 
-                # Remove o segundo nó da rota, pois o swapping foi realizado
-                route.pop(1)
-            else:
-                # Se não há um terceiro nó, apenas remove o segundo nó da rota
-                route.pop(1)
+        returns:
+            Epr or None: Par EPR virtual, ou None se o swapping falhou.
+        """
+        if epr1 is None:
+            epr1 = self._first_epr(node1, node2)
+            if epr1 is None:
+                return None
+        if epr2 is None:
+            epr2 = self._first_epr(node2, node3)
+            if epr2 is None:
+                return None
+
+        # Mede a fidelidade dos pares EPR
+        fidelity1 = epr1.get_current_fidelity()
+        fidelity2 = epr2.get_current_fidelity()
+        
+        # Calcula a probabilidade de sucesso do entanglement swapping
+        success_prob = fidelity1 * fidelity2 + (1 - fidelity1) * (1 - fidelity2)
+        
+        # Verifica se o swapping foi bem-sucedido com base na probabilidade de sucesso
+        if uniform(0, 1) > success_prob:
+            self._network.trace.record(SWAP, NETWORK, self._network.get_timeslot(), node1, node3, value=0)
+            self.logger.log('Entanglement Swapping falhou entre %s-%s e %s-%s', node1, node2, node2, node3)
+            return None
 
-        # Loga o sucesso do entanglement swapping
-        self.logger.log(f'Entanglement Swapping concluído com sucesso entre {Alice} e {Bob}')
-        return True
+        # Calcula a nova fidelidade do par EPR virtual
+        new_fidelity = (fidelity1 * fidelity2) / ((fidelity1 * fidelity2) + (1 - fidelity1) * (1 - fidelity2))
+        epr_virtual = Epr(self._network.ids.next_id(), new_fidelity)
+
+        # Guarda o par EPR virtual entre node1 e node3 fora do grafo da rede
+        self._store_virtual_epr(epr_virtual, node1, node3)
+
+        # Remove os pares EPR antigos entre node1-node2 e node2-node3
+        self._consume_epr(epr1, node1, node2)
+        self._consume_epr(epr2, node2, node3)
+
+        # Atualiza o contador de EPRs utilizados
+        self.used_eprs += 1
+        self._network.trace.record(SWAP, NETWORK, self._network.get_timeslot(), node1, node3, new_fidelity, 1)
+        return epr_virtual
+
+    def entanglement_swapping_batch(self, routes: list, rng: np.random.Generator = None) -> list:
+        """
+        Realiza o Entanglement Swapping de várias rotas ao mesmo tempo, com operações vetorizadas.
+
+        Cada rota recebe, em cada canal, um par EPR próprio: rotas que compartilham um canal usam
+        pares distintos, na ordem do pool. As rotas avançam juntas em rodadas aninhadas, como no
+        modo 'nested' de `entanglement_swapping`, com um timeslot por rodada. Em cada rodada, as
+        fidelidades dos pares de todos os swaps são lidas de uma vez do armazenamento de
+        fidelidades, as probabilidades de sucesso e as novas fidelidades são calculadas em
+        vetores com as mesmas fórmulas de `_swap`, e um único sorteio vetorizado decide todos os
+        swaps. Os pares virtuais são então guardados em `Network.virtual_links`. Uma rota em que
+        algum swap falha é abandonada; os outros swaps da mesma rodada, simultâneos, são mantidos.
+
+        args:
+            routes (list): Rotas (listas de nós) já escolhidas.
+            rng (np.random.Generator, optional): Gerador dos sorteios. Padrão: um gerador semeado
+                pelo módulo `random`, para que `random.seed` continue reproduzindo a simulação.
+
+        returns:
+            list: Para cada rota, True se o par EPR fim a fim foi obtido, False caso contrário.
+        """
+        network = self._network
+        store = network.fidelity_store
+        if rng is None:
+            rng = np.random.default_rng(getrandbits(64))
+
+        results = [False] * len(routes)
+        taken = {}
+        active = {}
+        for index, route in enumerate(routes):
+            if route is None or len(route) < 2:
+                self.logger.log('Rota inválida para o Entanglement Swapping: %s', route)
+                continue
+            segments = []
+            uses = {}
+            for u, v in zip(route, route[1:]):
+                if not network.has_channel(u, v):
+                    self.logger.log('Canal entre %s-%s não existe', u, v)
+                    break
+                channel = network.get_channel(u, v)
+                position = taken.get(channel, 0) + uses.get(channel, 0)
+                eprs = channel.eprs
+                if position >= len(eprs):
+                    self.logger.log('Não há pares EPRs suficientes entre %s-%s', u, v)
+                    break
+                uses[channel] = uses.get(channel, 0) + 1
+                segments.append((u, v, eprs[position]))
+            else:
+                for channel, count in uses.items():
+                    taken[channel] = taken.get(channel, 0) + count
+                active[index] = segments
+
+        if active and all(len(segments) == 1 for segments in active.values()):
+            # Só rotas de um salto: um timeslot para verificar os pares, como em `_nested_swapping`
+            network.timeslot()
+
+        while any(len(segments) > 1 for segments in active.values()):
+            network.timeslot()
+            timeslot = network.get_timeslot()
+            self.logger.log('Timeslot %s: Realizando rodada de Entanglement Swapping em lote para %s rotas.', timeslot, len(active))
+
+            pairs = [(index, i) for index, segments in active.items() for i in range(0, len(segments) - 1, 2)]
+            first = np.fromiter((active[index][i][2]._slot for index, i in pairs), dtype=np.int64, count=len(pairs))
+            second = np.fromiter((active[index][i + 1][2]._slot for index, i in pairs), dtype=np.int64, count=len(pairs))
+            fidelity1 = store.get_many(first)
+            fidelity2 = store.get_many(second)
+            both = fidelity1 * fidelity2
+            success_prob = both + (1 - fidelity1) * (1 - fidelity2)
+            success = rng.random(len(pairs)) <= success_prob
+            new_fidelity = np.divide(both, success_prob, out=np.zeros_like(both), where=success_prob > 0)
+
+            failed = set()
+            merged = {}
+            for k, (index, i) in enumerate(pairs):
+                node1, node2, epr1 = active[index][i]
+                _, node3, epr2 = active[index][i + 1]
+                if not success[k]:
+                    network.trace.record(SWAP, NETWORK, timeslot, node1, node3, value=0)
+                    self.logger.log('Entanglement Swapping falhou entre %s-%s e %s-%s', node1, node2, node2, node3)
+                    failed.add(index)
+                    continue
+                fidelity = float(new_fidelity[k])
+                epr_virtual = Epr(network.ids.next_id(), fidelity)
+                self._store_virtual_epr(epr_virtual, node1, node3)
+                self._consume_epr(epr1, node1, node2)
+                self._consume_epr(epr2, node2, node3)
+                self.used_eprs += 1
+                network.trace.record(SWAP, NETWORK, timeslot, node1, node3, fidelity, 1)
+                merged[index, i] = (node1, node3, epr_virtual)
+
+            for index in failed:
+                del active[index]
+            for index, segments in active.items():
+                # Com um número ímpar de segmentos, o último passa para a próxima rodada
+                combined = [merged[index, i] for i in range(0, len(segments) - 1, 2)]
+                if len(segments) % 2:
+                    combined.append(segments[-1])
+                active[index] = combined
+
+        for index, segments in active.items():
+            results[index] = True
+            self.logger.log('Entanglement Swapping concluído com sucesso entre %s e %s', segments[0][0], segments[0][1])
+        return results
 
     def get_avg_size_routes(self):
         """
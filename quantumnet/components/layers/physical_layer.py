@@ -1,4 +1,5 @@
 from ...objects import Logger, Qubit, Epr
+from ...objects.trace import EPR_CREATED, EPR_CONSUMED, PHYSICAL
 from ...components import Host
 from random import uniform
 import random
@@ -19,8 +20,6 @@ class PhysicalLayer:
         self._failed_eprs = []
         self.created_eprs = [] 
         self._initial_qubits_fidelity = random.uniform(self.min_prob, self.max_prob)
-        self._count_qubit = 0
-        self._count_epr = 0
         self.logger = Logger.get_instance()
         self.used_eprs = 0
         self.used_qubits = 0
@@ -69,7 +68,7 @@ class PhysicalLayer:
         Returns:
             list: Lista de pares EPRs usados.
         """
-        self.logger.debug(f"Eprs criados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug("Eprs criados na camada %s: %s", self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
@@ -79,7 +78,7 @@ class PhysicalLayer:
         Returns:
             list: Lista de qubits usados.
         """
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug("Qubits usados na camada %s: %s", self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def create_qubit(self, host_id: int, increment_timeslot: bool = True, increment_qubits: bool = True, min_fidelity: float = 0.95):
@@ -98,20 +97,18 @@ class PhysicalLayer:
         if host_id not in self._network.hosts:
             raise Exception(f'Host {host_id} não existe na rede.')
 
-        qubit_id = self._count_qubit
+        qubit_id = self._network.ids.next_id()
         qubit = Qubit(qubit_id)
+        initial_fidelity = qubit.get_initial_fidelity()
+        # Sorteio mantido para preservar a sequência do gerador aleatório das simulações com semente
+        uniform(min_fidelity, 1.0)
 
-        initial_fidelity = uniform(min_fidelity, 1.0)
-        qubit.fidelity = initial_fidelity  
-        qubit.current_fidelity = initial_fidelity  
-
-        self._network.hosts[host_id].add_qubit(qubit)
-        
         current_timeslot = self._network.get_timeslot()
         self._network.register_qubit_creation(qubit_id, current_timeslot)
 
-        self._count_qubit += 1
-        self.logger.debug(f'Qubit {qubit_id} criado com fidelidade inicial {initial_fidelity} e adicionado à memória do Host {host_id}.')
+        self._network.hosts[host_id].add_qubit(qubit)
+
+        self.logger.debug('Qubit %s criado com fidelidade inicial %s e adicionado à memória do Host %s.', qubit_id, initial_fidelity, host_id)
 
 
     def create_epr_pair(self, fidelity: float = 1.0, increment_timeslot: bool = True, increment_eprs: bool = False):
@@ -128,8 +125,7 @@ class PhysicalLayer:
             self.used_eprs += 1
             
             
-        epr = Epr(self._count_epr, fidelity)
-        self._count_epr += 1
+        epr = Epr(self._network.ids.next_id(), fidelity)
         return epr
 
     def add_epr_to_channel(self, epr: Epr, channel: tuple):
@@ -141,10 +137,19 @@ class PhysicalLayer:
             channel (tuple): Canal.
         """
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
-            self._network.graph.add_edge(u, v, eprs=[])
-        self._network.graph.edges[u, v]['eprs'].append(epr)
-        self.logger.debug(f'Par EPR {epr} adicionado ao canal {channel}.')
+        if not self._network.has_channel(u, v):
+            self._network.add_channel(u, v)
+        self._network.get_channel(u, v).eprs.append(epr)
+        self._trace_epr(EPR_CREATED, epr, u, v)
+        self.logger.debug('Par EPR %s adicionado ao canal %s.', epr, channel)
+
+    def _trace_epr(self, kind: int, epr: Epr, u: int, v: int):
+        """
+        Registra um evento de EPR no trace da rede, se ele estiver ativo.
+        """
+        trace = self._network.trace
+        if trace.enabled:
+            trace.record(kind, PHYSICAL, self._network.get_timeslot(), u, v, epr.get_current_fidelity(), epr.epr_id)
 
     def remove_epr_from_channel(self, epr: Epr, channel: tuple):
         """
@@ -155,13 +160,14 @@ class PhysicalLayer:
             channel (tuple): Canal.
         """
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
-            self.logger.debug(f'Canal {channel} não existe.')
+        if not self._network.has_channel(u, v):
+            self.logger.debug('Canal %s não existe.', channel)
             return
         try:
-            self._network.graph.edges[u, v]['eprs'].remove(epr)
+            self._network.get_channel(u, v).eprs.remove(epr)
+            self._trace_epr(EPR_CONSUMED, epr, u, v)
         except ValueError:
-            self.logger.debug(f'Par EPR {epr} não encontrado no canal {channel}.')
+            self.logger.debug('Par EPR %s não encontrado no canal %s.', epr, channel)
     
     def remove_all_eprs_from_channel(self, channel: tuple):
         """
@@ -172,13 +178,15 @@ class PhysicalLayer:
 
         """
         u, v = channel
-        if not self._network.graph.has_edge(u, v):
-            self.logger.debug(f'Canal {channel} não existe.')
+        if not self._network.has_channel(u, v):
+            self.logger.debug('Canal %s não existe.', channel)
             return
-      
-        eprs_copy = list(self._network.graph.edges[u, v].get('eprs', []))
-        for epr in eprs_copy:
-            self.remove_epr_from_channel(epr, channel)
+
+        eprs = self._network.get_channel(u, v).eprs
+        if self._network.trace.enabled:
+            for epr in eprs:
+                self._trace_epr(EPR_CONSUMED, epr, u, v)
+        eprs.clear()
 
     def fidelity_measurement_only_one(self, qubit: Qubit):
         """
@@ -195,10 +203,10 @@ class PhysicalLayer:
         if self._network.get_timeslot() > 0:
             new_fidelity = max(0, fidelity * 0.99)  
             qubit.set_current_fidelity(new_fidelity)  
-            self.logger.log(f'A fidelidade do qubit {qubit} é {new_fidelity}')
+            self.logger.log('A fidelidade do qubit %s é %s', qubit, new_fidelity)
             return new_fidelity
 
-        self.logger.log(f'A fidelidade do qubit {qubit} é {fidelity}')
+        self.logger.log('A fidelidade do qubit %s é %s', qubit, fidelity)
         return fidelity
 
     def fidelity_measurement(self, qubit1: Qubit, qubit2: Qubit):
@@ -215,7 +223,7 @@ class PhysicalLayer:
         fidelity1 = self.fidelity_measurement_only_one(qubit1)
         fidelity2 = self.fidelity_measurement_only_one(qubit2)
         combined_fidelity = fidelity1 * fidelity2
-        self.logger.log(f'A fidelidade entre o qubit {fidelity1} e o qubit {fidelity2} é {combined_fidelity}')
+        self.logger.log('A fidelidade entre o qubit %s e o qubit %s é %s', fidelity1, fidelity2, combined_fidelity)
         return combined_fidelity
     
     def entanglement_creation_heralding_protocol(self, alice: Host, bob: Host):
@@ -235,7 +243,7 @@ class PhysicalLayer:
         q2 = qubit2.get_current_fidelity()
 
         epr_fidelity = q1 * q2
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par epr criado com fidelidade {epr_fidelity}')
+        self.logger.log('Timeslot %s: Par epr criado com fidelidade %s', self._network.get_timeslot(), epr_fidelity)
         epr = self.create_epr_pair(epr_fidelity)
 
         # Armazena o EPR criado na lista de EPRs criados
@@ -246,14 +254,16 @@ class PhysicalLayer:
 
         if epr_fidelity >= 0.8:
             # Se a fidelidade for adequada, adiciona o EPR ao canal da rede
-            self._network.graph.edges[(alice_host_id, bob_host_id)]['eprs'].append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: O protocolo de criação de emaranhamento foi bem sucedido com a fidelidade necessária.')
+            self._network.get_channel(alice_host_id, bob_host_id).eprs.append(epr)
+            self._trace_epr(EPR_CREATED, epr, alice_host_id, bob_host_id)
+            self.logger.log('Timeslot %s: O protocolo de criação de emaranhamento foi bem sucedido com a fidelidade necessária.', self._network.get_timeslot())
             return True
         else:
             # Adiciona o EPR ao canal mesmo com baixa fidelidade
-            self._network.graph.edges[(alice_host_id, bob_host_id)]['eprs'].append(epr)
+            self._network.get_channel(alice_host_id, bob_host_id).eprs.append(epr)
+            self._trace_epr(EPR_CREATED, epr, alice_host_id, bob_host_id)
             self._failed_eprs.append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: O protocolo de criação de emaranhamento foi bem sucedido, mas com fidelidade baixa.')
+            self.logger.log('Timeslot %s: O protocolo de criação de emaranhamento foi bem sucedido, mas com fidelidade baixa.', self._network.get_timeslot())
             return False
 
     def echp_on_demand(self, alice_host_id: int, bob_host_id: int):
@@ -276,16 +286,18 @@ class PhysicalLayer:
         fidelity_qubit1 = self.fidelity_measurement_only_one(qubit1)
         fidelity_qubit2 = self.fidelity_measurement_only_one(qubit2)
                 
-        prob_on_demand_epr_create = self._network.edges[alice_host_id, bob_host_id]['prob_on_demand_epr_create']
+        channel = self._network.get_channel(alice_host_id, bob_host_id)
+        prob_on_demand_epr_create = channel.prob_on_demand_epr_create
         echp_success_probability = prob_on_demand_epr_create * fidelity_qubit1 * fidelity_qubit2
             
         if uniform(0, 1) < echp_success_probability:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par EPR criado com a fidelidade de {fidelity_qubit1 * fidelity_qubit2}')
+            self.logger.log('Timeslot %s: Par EPR criado com a fidelidade de %s', self._network.get_timeslot(), fidelity_qubit1 * fidelity_qubit2)
             epr = self.create_epr_pair(fidelity_qubit1 * fidelity_qubit2)
-            self._network.edges[alice_host_id, bob_host_id]['eprs'].append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP é {echp_success_probability}')
+            channel.eprs.append(epr)
+            self._trace_epr(EPR_CREATED, epr, alice_host_id, bob_host_id)
+            self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP é %s', self._network.get_timeslot(), echp_success_probability)
             return True
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP falhou.')
+        self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP falhou.', self._network.get_timeslot())
         return False
 
     def echp_on_replay(self, alice_host_id: int, bob_host_id: int):
@@ -308,14 +320,16 @@ class PhysicalLayer:
         fidelity_qubit1 = self.fidelity_measurement_only_one(qubit1)
         fidelity_qubit2 = self.fidelity_measurement_only_one(qubit2)
                
-        prob_replay_epr_create = self._network.edges[alice_host_id, bob_host_id]['prob_replay_epr_create']
+        channel = self._network.get_channel(alice_host_id, bob_host_id)
+        prob_replay_epr_create = channel.prob_replay_epr_create
         echp_success_probability = prob_replay_epr_create * fidelity_qubit1 * fidelity_qubit2
         
         if uniform(0, 1) < echp_success_probability:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Par EPR criado com a fidelidade de {fidelity_qubit1 * fidelity_qubit2}')
+            self.logger.log('Timeslot %s: Par EPR criado com a fidelidade de %s', self._network.get_timeslot(), fidelity_qubit1 * fidelity_qubit2)
             epr = self.create_epr_pair(fidelity_qubit1 * fidelity_qubit2)
-            self._network.edges[alice_host_id, bob_host_id]['eprs'].append(epr)
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP é {echp_success_probability}')
+            channel.eprs.append(epr)
+            self._trace_epr(EPR_CREATED, epr, alice_host_id, bob_host_id)
+            self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP é %s', self._network.get_timeslot(), echp_success_probability)
             return True
-        self.logger.log(f'Timeslot {self._network.get_timeslot()}: A probabilidade de sucesso do ECHP falhou.')
+        self.logger.log('Timeslot %s: A probabilidade de sucesso do ECHP falhou.', self._network.get_timeslot())
         return False
\ No newline at end of file
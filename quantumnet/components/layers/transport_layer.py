@@ -1,6 +1,7 @@
 import networkx as nx
-from quantumnet.components import Host
+from quantumnet.components import Host, RoutePlan
 from quantumnet.objects import Logger, Epr
+from quantumnet.objects.trace import EPR_CREATED, EPR_CONSUMED, TELEPORT, TRANSPORT
 from random import uniform
 import math
 
@@ -41,7 +42,7 @@ class TransportLayer:
         Returns:
             list: Lista de pares EPRs usados.
         """
-        self.logger.debug(f"Eprs usados na camada {self.__class__.__name__}: {self.used_eprs}")
+        self.logger.debug("Eprs usados na camada %s: %s", self.__class__.__name__, self.used_eprs)
         return self.used_eprs
     
     def get_used_qubits(self):
@@ -51,7 +52,7 @@ class TransportLayer:
         Returns:
             list: Lista de qubits usados.
         """
-        self.logger.debug(f"Qubits usados na camada {self.__class__.__name__}: {self.used_qubits}")
+        self.logger.debug("Qubits usados na camada %s: %s", self.__class__.__name__, self.used_qubits)
         return self.used_qubits
     
     def request_transmission(self, alice_id: int, bob_id: int, num_qubits: int):
@@ -70,11 +71,11 @@ class TransportLayer:
         available_qubits = len(alice.memory)
 
         if available_qubits < num_qubits:
-            self.logger.log(f'Número insuficiente de qubits na memória de Alice (Host:{alice_id}). Tentando transmitir os {available_qubits} qubits disponíveis.')
+            self.logger.log('Número insuficiente de qubits na memória de Alice (Host:%s). Tentando transmitir os %s qubits disponíveis.', alice_id, available_qubits)
             num_qubits = available_qubits
 
         if num_qubits == 0:
-            self.logger.log(f'Nenhum qubit disponível na memória de Alice ({alice_id}) para transmissão.')
+            self.logger.log('Nenhum qubit disponível na memória de Alice (%s) para transmissão.', alice_id)
             return False
 
         max_attempts = 2
@@ -82,13 +83,13 @@ class TransportLayer:
         success = False
 
         while attempts < max_attempts and not success:
-            self.logger.log(f'Timeslot {self._network.get_timeslot()}: Tentativa de transmissão {attempts + 1} entre {alice_id} e {bob_id}.')
+            self.logger.log('Timeslot %s: Tentativa de transmissão %s entre %s e %s.', self._network.get_timeslot(), attempts + 1, alice_id, bob_id)
             
             routes = []
             for _ in range(num_qubits):
                 route = self._network_layer.short_route_valid(alice_id, bob_id)
                 if route is None:
-                    self.logger.log(f'Não foi possível encontrar uma rota válida na tentativa {attempts + 1}. Timeslot: {self._network.get_timeslot()}')
+                    self.logger.log('Não foi possível encontrar uma rota válida na tentativa %s. Timeslot: %s', attempts + 1, self._network.get_timeslot())
                     break
                 routes.append(route)
             
@@ -100,7 +101,7 @@ class TransportLayer:
                         node2 = route[i + 1]
                         # Verifica se há pelo menos um par EPR disponível no canal
                         if len(self._network.get_eprs_from_edge(node1, node2)) < 1:
-                            self.logger.log(f'Falha ao encontrar par EPR entre {node1} e {node2} na tentativa {attempts + 1}. Timeslot: {self._network.get_timeslot()}')
+                            self.logger.log('Falha ao encontrar par EPR entre %s e %s na tentativa %s. Timeslot: %s', node1, node2, attempts + 1, self._network.get_timeslot())
                             success = False
                             break
                     if not success:
@@ -118,10 +119,10 @@ class TransportLayer:
                     'bob_id': bob_id,
                 }
                 self.transmitted_qubits.append(qubit_info)
-            self.logger.log(f'Transmissão de {num_qubits} qubits entre {alice_id} e {bob_id} concluída com sucesso. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Transmissão de %s qubits entre %s e %s concluída com sucesso. Timeslot: %s', num_qubits, alice_id, bob_id, self._network.get_timeslot())
             return True
         else:
-            self.logger.log(f'Falha na transmissão de {num_qubits} qubits entre {alice_id} e {bob_id} após {attempts} tentativas. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Falha na transmissão de %s qubits entre %s e %s após %s tentativas. Timeslot: %s', num_qubits, alice_id, bob_id, attempts, self._network.get_timeslot())
             return False
 
     def teleportation_protocol(self, alice_id: int, bob_id: int):
@@ -139,7 +140,7 @@ class TransportLayer:
         # Estabelece uma rota válida
         route = self._network_layer.short_route_valid(alice_id, bob_id)
         if route is None:
-            self.logger.log(f'Não foi possível encontrar uma rota válida para teletransporte entre {alice_id} e {bob_id}. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Não foi possível encontrar uma rota válida para teletransporte entre %s e %s. Timeslot: %s', alice_id, bob_id, self._network.get_timeslot())
             return False
         
         # Pega um qubit de Alice e um qubit de Bob
@@ -147,7 +148,7 @@ class TransportLayer:
         bob = self._network.get_host(bob_id)
         
         if len(alice.memory) < 1 or len(bob.memory) < 1:
-            self.logger.log(f'Alice ou Bob não possuem qubits suficientes para teletransporte. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Alice ou Bob não possuem qubits suficientes para teletransporte. Timeslot: %s', self._network.get_timeslot())
             return False
         
         qubit_alice = alice.memory.pop(0)  
@@ -164,7 +165,7 @@ class TransportLayer:
             fidelities.extend([epr.get_current_fidelity() for epr in epr_pairs])
         
         if not fidelities:
-            self.logger.log(f'Não foi possível encontrar pares EPR na rota entre {alice_id} e {bob_id}. Timeslot: {self._network.get_timeslot()}')
+            self.logger.log('Não foi possível encontrar pares EPR na rota entre %s e %s. Timeslot: %s', alice_id, bob_id, self._network.get_timeslot())
             return False
         
         f_route = sum(fidelities) / len(fidelities)
@@ -186,9 +187,9 @@ class TransportLayer:
         }
         
         # Adiciona o qubit teletransportado à memória de Bob com a fidelidade final calculada
-        qubit_alice.fidelity = F_final
         bob.memory.append(qubit_alice)
-        self.logger.log(f'Teletransporte de qubit de {alice_id} para {bob_id} foi bem-sucedido com fidelidade final de {F_final}. Timeslot: {self._network.get_timeslot()}')
+        self._network.trace.record(TELEPORT, TRANSPORT, self._network.get_timeslot(), alice_id, bob_id, F_final, qubit_alice.qubit_id)
+        self.logger.log('Teletransporte de qubit de %s para %s foi bem-sucedido com fidelidade final de %s. Timeslot: %s', alice_id, bob_id, F_final, self._network.get_timeslot())
         
         # Par virtual é deletado no final
         for i in range(len(route) - 1):
@@ -212,7 +213,7 @@ class TransportLayer:
             fidelity = qubit_info['F_final']
             total_fidelity += fidelity
             total_qubits_used += 1
-            self.logger.log(f'Fidelidade do qubit utilizado de {qubit_info["alice_id"]} para {qubit_info["bob_id"]}: {fidelity}')
+            self.logger.log('Fidelidade do qubit utilizado de %s para %s: %s', qubit_info["alice_id"], qubit_info["bob_id"], fidelity)
 
         # Considera apenas os qubits efetivamente transmitidos (não inclui os qubits que permanecem na memória dos hosts)
         if total_qubits_used == 0:
@@ -220,7 +221,7 @@ class TransportLayer:
             return 0.0
 
         avg_fidelity = total_fidelity / total_qubits_used
-        self.logger.log(f'A fidelidade média de todos os qubits utilizados na camada de transporte é {avg_fidelity}')
+        self.logger.log('A fidelidade média de todos os qubits utilizados na camada de transporte é %s', avg_fidelity)
         
         return avg_fidelity
 
@@ -234,14 +235,20 @@ class TransportLayer:
         """
         return self.transmitted_qubits
     
-    def run_transport_layer(self, alice_id: int, bob_id: int, num_qubits: int, route=None):
+    def run_transport_layer(self, alice_id: int, bob_id: int, num_qubits: int, route=None, k_paths: int = 1):
         """
         Executa a requisição de transmissão e o protocolo de teletransporte.
 
+        Com `k_paths` > 1 e sem rota fornecida, os qubits de cada tentativa são divididos entre
+        até `k_paths` rotas na proporção do estoque de pares EPR de cada uma (ver
+        `NetworkLayer.multipath_routes`), em vez de seguirem todos a mesma rota.
+
         args:
             alice_id : int : Id do host Alice.
             bob_id : int : Id do host Bob.
             num_qubits : int : Número de qubits a serem transmitidos.
+            route : list : Rota a ser usada (opcional).
+            k_paths : int : Número máximo de rotas entre as quais os qubits são divididos.
 
         returns:
             bool : True se a operação foi bem-sucedida, False caso contrário.
@@ -259,7 +266,7 @@ class TransportLayer:
             available_qubits = len(alice.memory)
 
         if available_qubits != num_qubits:
-            self.logger.log(f'Erro: Alice tem {available_qubits} qubits, mas deveria ter {num_qubits} qubits. Abortando transmissão.')
+            self.logger.log('Erro: Alice tem %s qubits, mas deveria ter %s qubits. Abortando transmissão.', available_qubits, num_qubits)
             return False
 
         max_attempts = 2
@@ -267,25 +274,34 @@ class TransportLayer:
         success_count = 0
         route_fidelities = []  
         used_eprs = 0 
+        multipath = route is None and k_paths > 1
 
         while attempts < max_attempts and success_count < num_qubits:
-            for _ in range(num_qubits - success_count):
+            if multipath:
+                plan = self._network_layer.multipath_routes(alice_id, bob_id, num_qubits - success_count, k_paths)
+                if plan is None:
+                    self.logger.log('Não foi possível encontrar uma rota válida na tentativa %s.', attempts + 1)
+                    attempts += 1
+                    continue
+            for i in range(num_qubits - success_count):
                 # Usa a rota fornecida ou calcula uma nova rota, se necessário
-                if route is None:
+                if multipath:
+                    route = plan[i]
+                elif route is None:
                     route = self._network_layer.short_route_valid(alice_id, bob_id)
                     if route is None:
-                        self.logger.log(f'Não foi possível encontrar uma rota válida na tentativa {attempts + 1}.')
+                        self.logger.log('Não foi possível encontrar uma rota válida na tentativa %s.', attempts + 1)
                         break
                 else:
-                    self.logger.log(f"Usando a rota fornecida: {route}")
+                    self.logger.log("Usando a rota fornecida: %s", route)
 
 
                 # Verifica a fidelidade dos pares EPR ao longo da rota
                 fidelities = []
                 eprs_used_in_current_transmission = 0  # Contador de EPRs para a rota atual
-                for i in range(len(route) - 1):
-                    node1 = route[i]
-                    node2 = route[i + 1]
+                for hop in range(len(route) - 1):
+                    node1 = route[hop]
+                    node2 = route[hop + 1]
                     epr_pairs = self._network.get_eprs_from_edge(node1, node2)
                     
                     # Seleciona apenas os pares EPR necessários para a transmissão de um qubit
@@ -293,7 +309,7 @@ class TransportLayer:
                         fidelities.append(epr_pairs[0].get_current_fidelity())
                         eprs_used_in_current_transmission += 1
                     else:
-                        self.logger.log(f'Não foi possível encontrar pares EPR suficientes na rota {route[i]} -> {route[i + 1]}.')
+                        self.logger.log('Não foi possível encontrar pares EPR suficientes na rota %s -> %s.', node1, node2)
                         break
             
                 if not fidelities:
@@ -310,13 +326,13 @@ class TransportLayer:
                     F_final = f_alice * f_route
                     route_fidelities.append(F_final) 
 
-                    qubit_alice.fidelity = F_final
                     bob.memory.append(qubit_alice)
+                    self._network.trace.record(TELEPORT, TRANSPORT, self._network.get_timeslot(), alice_id, bob_id, F_final, qubit_alice.qubit_id)
 
                     success_count += 1
                     self.used_qubits += 1
                     used_eprs += eprs_used_in_current_transmission 
-                    self.logger.log(f'Timeslot {self._network.get_timeslot()}: Teletransporte de qubit de {alice_id} para {bob_id} na rota {route} foi bem-sucedido com fidelidade final de {F_final}.')
+                    self.logger.log('Timeslot %s: Teletransporte de qubit de %s para %s na rota %s foi bem-sucedido com fidelidade final de %s.', self._network.get_timeslot(), alice_id, bob_id, route, F_final)
 
                     self.transmitted_qubits.append({
                         'alice_id': alice_id,
@@ -329,7 +345,7 @@ class TransportLayer:
                         'qubit': qubit_alice
                     })
                 else:
-                    self.logger.log(f'Alice não possui qubits suficientes para continuar a transmissão.')
+                    self.logger.log('Alice não possui qubits suficientes para continuar a transmissão.')
                     break
 
             attempts += 1
@@ -339,10 +355,10 @@ class TransportLayer:
         self._network.application_layer.record_used_eprs(used_eprs)  # Registra apenas EPRs usados na transmissão bem-sucedida
 
         if success_count == num_qubits:
-            self.logger.log(f'Transmissão e teletransporte de {num_qubits} qubits entre {alice_id} e {bob_id} concluídos com sucesso.')
+            self.logger.log('Transmissão e teletransporte de %s qubits entre %s e %s concluídos com sucesso.', num_qubits, alice_id, bob_id)
             return True
         else:
-            self.logger.log(f'Falha na transmissão de {num_qubits} qubits entre {alice_id} e {bob_id}. Apenas {success_count} qubits foram transmitidos com sucesso.')
+            self.logger.log('Falha na transmissão de %s qubits entre %s e %s. Apenas %s qubits foram transmitidos com sucesso.', num_qubits, alice_id, bob_id, success_count)
             return False
 
     def run_transport_layer_eprs(self, alice_id: int, bob_id: int, num_qubits: int, route=None, is_return=False, scenario=1):
@@ -372,7 +388,7 @@ class TransportLayer:
             available_qubits = len(alice.memory)
 
         if available_qubits != num_qubits:
-            self.logger.log(f'Erro: Alice tem {available_qubits} qubits, mas deveria ter {num_qubits} qubits. Abortando transmissão.')
+            self.logger.log('Erro: Alice tem %s qubits, mas deveria ter %s qubits. Abortando transmissão.', available_qubits, num_qubits)
             return False
 
         # Calcular rota, se necessário
@@ -382,40 +398,47 @@ class TransportLayer:
                 self.logger.log('Não foi possível encontrar uma rota válida.')
                 return False
         else:
-            self.logger.log(f"Usando a rota fornecida: {route}")
+            self.logger.log("Usando a rota fornecida: %s", route)
+
+        # Resolve os canais da rota uma única vez
+        plan = self._network.plan_route(route)
+        trace = self._network.trace
         
         # Lógica para Gerar Pares EPRs Baseada no Cenário
         if scenario == 1:
             if not is_return:
                 # Criar todos os pares EPRs no início
                 num_eprs_per_channel = num_qubits * 2
-                for i in range(len(route) - 1):
-                    u, v = route[i], route[i + 1]
+                for u, v, channel in plan.segments:
                     for _ in range(num_eprs_per_channel):
                         epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False, increment_eprs=False)
-                        self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
-                self.logger.log(f'{num_eprs_per_channel} pares EPRs criados para cada segmento da rota {route}.')
+                        channel.eprs.append(epr_pair)
+                        if trace.enabled:
+                            trace.record(EPR_CREATED, TRANSPORT, self._network.get_timeslot(), u, v, 1.0, epr_pair.epr_id)
+                self.logger.log('%s pares EPRs criados para cada segmento da rota %s.', num_eprs_per_channel, route)
             else:
-                self.logger.log(f"Etapa de retorno: consumindo EPRs existentes na rota {route}.")
+                self.logger.log("Etapa de retorno: consumindo EPRs existentes na rota %s.", route)
         if scenario == 2:
             # Dividir os pares EPRs entre ida e volta
             eprs_to_create = (num_qubits * 2) // 2
             if not is_return:
                 # Criar metade dos pares EPRs na ida
-                for i in range(len(route) - 1):
-                    u, v = route[i], route[i + 1]
-                    self.logger.log(f"Ida: Criando {eprs_to_create} pares EPRs no segmento {u} -> {v}.")
+                for u, v, channel in plan.segments:
+                    self.logger.log("Ida: Criando %s pares EPRs no segmento %s -> %s.", eprs_to_create, u, v)
                     for _ in range(eprs_to_create):
                         epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False, increment_eprs=False)
-                        self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
+                        channel.eprs.append(epr_pair)
+                        if trace.enabled:
+                            trace.record(EPR_CREATED, TRANSPORT, self._network.get_timeslot(), u, v, 1.0, epr_pair.epr_id)
             elif is_return:
                 # Criar a outra metade na volta
-                for i in range(len(route) - 1):
-                    u, v = route[i], route[i + 1]
-                    self.logger.log(f"Volta: Criando {eprs_to_create} pares EPRs no segmento {u} -> {v}.")
+                for u, v, channel in plan.segments:
+                    self.logger.log("Volta: Criando %s pares EPRs no segmento %s -> %s.", eprs_to_create, u, v)
                     for _ in range(eprs_to_create):
                         epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False, increment_eprs=True)
-                        self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
+                        channel.eprs.append(epr_pair)
+                        if trace.enabled:
+                            trace.record(EPR_CREATED, TRANSPORT, self._network.get_timeslot(), u, v, 1.0, epr_pair.epr_id)
 
         success_count = 0
         total_eprs_used = 0
@@ -423,24 +446,22 @@ class TransportLayer:
 
         while success_count < num_qubits:
             # Verificar fidelidade da rota
-            f_route = self.calculate_average_fidelity(route)
-            self.logger.log(f"Fidelidade atual da rota: {f_route}")
+            f_route = self.calculate_average_fidelity(plan)
+            self.logger.log("Fidelidade atual da rota: %s", f_route)
 
             # Consumir EPRs da rota
             eprs_used_in_current_transmission = 0
-            for i in range(len(route) - 1):
-                node1 = route[i]
-                node2 = route[i + 1]
-                epr_pairs = self._network.get_eprs_from_edge(node1, node2)
+            for node1, node2, channel in plan.segments:
+                epr_pairs = channel.eprs
                 if len(epr_pairs) == 0:
-                    self.logger.log(f"Sem pares EPRs disponíveis no segmento {node1} -> {node2}. Interrompendo transmissão.")
+                    self.logger.log("Sem pares EPRs disponíveis no segmento %s -> %s. Interrompendo transmissão.", node1, node2)
                     return False
 
-                # Usar o primeiro EPR disponível
-                epr_pair = epr_pairs[0]
                 eprs_used_in_current_transmission += 1
                 total_eprs_used += 1
-                self._network.remove_epr(node1, node2)
+                epr = epr_pairs.pop()
+                if trace.enabled:
+                    trace.record(EPR_CONSUMED, TRANSPORT, self._network.get_timeslot(), node1, node2, epr.get_current_fidelity(), epr.epr_id)
 
             self._network.timeslot()
             # Teletransportar qubit
@@ -448,12 +469,12 @@ class TransportLayer:
                 qubit_alice = alice.memory.pop(0)
                 f_qubit = qubit_alice.get_current_fidelity()
                 F_final = f_route
-                qubit_alice.fidelity = F_final
                 bob.memory.append(qubit_alice)
+                trace.record(TELEPORT, TRANSPORT, self._network.get_timeslot(), alice_id, bob_id, F_final, qubit_alice.qubit_id)
 
-                self.logger.log(f"Fidelidade final: {F_final:.4f} (F_qubit: {f_qubit:.4f} * F_rota: {f_route:.4f})")
+                self.logger.log("Fidelidade final: %.4f (F_qubit: %.4f * F_rota: %.4f)", F_final, f_qubit, f_route)
                 if F_final < 0.85:
-                    self.logger.log(f"Fidelidade final {F_final:.4f} abaixo de 0.85. Interrompendo transmissão.")
+                    self.logger.log("Fidelidade final %.4f abaixo de 0.85. Interrompendo transmissão.", F_final)
                     break
 
                 success_count += 1
@@ -462,13 +483,13 @@ class TransportLayer:
         # Registros e finalização
         self._network.application_layer.record_route_fidelities(route_fidelities)
         self._network.application_layer.record_used_eprs(total_eprs_used)
-        self.logger.log(f"Foram utilizados {total_eprs_used} pares EPRs ao longo da transmissão.")
+        self.logger.log("Foram utilizados %s pares EPRs ao longo da transmissão.", total_eprs_used)
         
         if success_count == num_qubits:
-            self.logger.log(f'Transmissão de {num_qubits} qubits entre {alice_id} e {bob_id} concluída com sucesso.')
+            self.logger.log('Transmissão de %s qubits entre %s e %s concluída com sucesso.', num_qubits, alice_id, bob_id)
             return True
         else:
-            self.logger.log(f'Transmissão falhou. Apenas {success_count} qubits foram transmitidos com sucesso.')
+            self.logger.log('Transmissão falhou. Apenas %s qubits foram transmitidos com sucesso.', success_count)
             self.register_failed_request(alice_id, bob_id, num_qubits, route, "Transmissão incompleta")
             return False
 
@@ -498,17 +519,21 @@ class TransportLayer:
                 self._physical_layer.create_qubit(alice_id, increment_timeslot=False)
 
         if len(alice.memory) != num_qubits:
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Erro: Alice tem {len(alice.memory)} qubits, mas deveria ter {num_qubits} qubits. Abortando transmissão.")
+            self.logger.log("Timeslot %s Erro: Alice tem %s qubits, mas deveria ter %s qubits. Abortando transmissão.", self._network.get_timeslot(), len(alice.memory), num_qubits)
             return False
 
         # Calcular rota, se necessário
         if route is None:
             route = self._network_layer.short_route_valid(alice_id, bob_id, increment_timeslot=False)
             if route is None:
-                self.logger.log(f"Timeslot {self._network.get_timeslot()} Não foi possível encontrar uma rota válida.")
+                self.logger.log("Timeslot %s Não foi possível encontrar uma rota válida.", self._network.get_timeslot())
                 return False
         else:
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Usando a rota fornecida: {route}")
+            self.logger.log("Timeslot %s Usando a rota fornecida: %s", self._network.get_timeslot(), route)
+
+        # Resolve os canais da rota uma única vez
+        plan = self._network.plan_route(route)
+        trace = self._network.trace
 
         success_count = 0
         total_eprs_used = 0
@@ -516,55 +541,57 @@ class TransportLayer:
 
         # Cenário 2: Criar todos os pares EPRs no início
         if scenario == 2 and not is_return:
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Iniciando criação de pares EPRs para o Cenário 2.")
-            for i in range(len(route) - 1):
-                u, v = route[i], route[i + 1]
+            self.logger.log("Timeslot %s Iniciando criação de pares EPRs para o Cenário 2.", self._network.get_timeslot())
+            for u, v, channel in plan.segments:
                 for _ in range(num_qubits):
                     epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False)
-                    self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
-                self.logger.log(f"Timeslot {self._network.get_timeslot()} Pares EPRs criados para o enlace {u} -> {v}.")
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Pares EPRs criados para toda a rota.")
+                    channel.eprs.append(epr_pair)
+                    if trace.enabled:
+                        trace.record(EPR_CREATED, TRANSPORT, self._network.get_timeslot(), u, v, 1.0, epr_pair.epr_id)
+                self.logger.log("Timeslot %s Pares EPRs criados para o enlace %s -> %s.", self._network.get_timeslot(), u, v)
+            self.logger.log("Timeslot %s Pares EPRs criados para toda a rota.", self._network.get_timeslot())
 
         while success_count < num_qubits:
             # Cenário 1: Criar EPRs a cada transmissão
             if scenario == 1:
-                self.logger.log(f"Timeslot {self._network.get_timeslot()} Iniciando criação de pares EPRs para o Cenário 1.")
-                for i in range(len(route) - 1):
-                    u, v = route[i], route[i + 1]
+                self.logger.log("Timeslot %s Iniciando criação de pares EPRs para o Cenário 1.", self._network.get_timeslot())
+                for u, v, channel in plan.segments:
                     epr_pair = self._physical_layer.create_epr_pair(fidelity=1.0, increment_timeslot=False)
-                    self._physical_layer.add_epr_to_channel(epr_pair, (u, v))
-                    self.logger.log(f"Timeslot {self._network.get_timeslot()} Par EPR criado e adicionado ao canal {u} -> {v}. Avançando timeslot...")
+                    channel.eprs.append(epr_pair)
+                    if trace.enabled:
+                        trace.record(EPR_CREATED, TRANSPORT, self._network.get_timeslot(), u, v, 1.0, epr_pair.epr_id)
+                    self.logger.log("Timeslot %s Par EPR criado e adicionado ao canal %s -> %s. Avançando timeslot...", self._network.get_timeslot(), u, v)
                     self._network.timeslot()
 
             # Consumir EPRs da rota
-            for i in range(len(route) - 1):
-                node1 = route[i]
-                node2 = route[i + 1]
-                epr_pairs = self._network.get_eprs_from_edge(node1, node2)
+            for node1, node2, channel in plan.segments:
+                epr_pairs = channel.eprs
                 if not epr_pairs:
-                    self.logger.log(f"Timeslot {self._network.get_timeslot()} Sem pares EPRs disponíveis no segmento {node1} -> {node2}. Interrompendo transmissão.")
+                    self.logger.log("Timeslot %s Sem pares EPRs disponíveis no segmento %s -> %s. Interrompendo transmissão.", self._network.get_timeslot(), node1, node2)
                     return False
 
                 # Usar o primeiro EPR disponível e logar fidelidade
                 epr_pair = epr_pairs[0]
                 fidelity_epr = epr_pair.get_current_fidelity()
-                self.logger.log(f"Timeslot {self._network.get_timeslot()} EPR consumido no segmento {node1} -> {node2} com fidelidade {fidelity_epr:.4f}.")
+                self.logger.log("Timeslot %s EPR consumido no segmento %s -> %s com fidelidade %.4f.", self._network.get_timeslot(), node1, node2, fidelity_epr)
                 total_eprs_used += 1
-                self._network.remove_epr(node1, node2)
+                epr = epr_pairs.pop()
+                if trace.enabled:
+                    trace.record(EPR_CONSUMED, TRANSPORT, self._network.get_timeslot(), node1, node2, epr.get_current_fidelity(), epr.epr_id)
 
             # Teletransportar um único qubit
             if alice.memory:
                 self._network.timeslot()
                 qubit_alice = alice.memory.pop(0)
                 f_final = qubit_alice.get_current_fidelity()
-                qubit_alice.fidelity = f_final
                 bob.memory.append(qubit_alice)
+                trace.record(TELEPORT, TRANSPORT, self._network.get_timeslot(), alice_id, bob_id, f_final, qubit_alice.qubit_id)
 
-                self.logger.log(f"Timeslot {self._network.get_timeslot()} Fidelidade final do teletransporte: {f_final:.4f}")
+                self.logger.log("Timeslot %s Fidelidade final do teletransporte: %.4f", self._network.get_timeslot(), f_final)
                 
                 # Verificar fidelidade final do qubit
                 if f_final < 0.85:
-                    self.logger.log(f"Timeslot {self._network.get_timeslot()} Fidelidade final {f_final:.2f} abaixo de 0.85. Interrompendo transmissão.")
+                    self.logger.log("Timeslot %s Fidelidade final %.2f abaixo de 0.85. Interrompendo transmissão.", self._network.get_timeslot(), f_final)
                     break
                 
                 success_count += 1
@@ -573,21 +600,20 @@ class TransportLayer:
         # Registros e finalização
         self._network.application_layer.record_route_fidelities(fidelidades_finais)
         self._network.application_layer.record_used_eprs(total_eprs_used)
-        self.logger.log(f"Timeslot {self._network.get_timeslot()} Foram utilizados {total_eprs_used} pares EPRs ao longo da transmissão.")
+        self.logger.log("Timeslot %s Foram utilizados %s pares EPRs ao longo da transmissão.", self._network.get_timeslot(), total_eprs_used)
 
         # Log final dos EPRs restantes na rota
-        self.logger.log("Pares EPRs restantes na rota:")
-        for i in range(len(route) - 1):
-            node1 = route[i]
-            node2 = route[i + 1]
-            remaining_eprs = len(self._network.get_eprs_from_edge(node1, node2))
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Segmento {node1} -> {node2}: {remaining_eprs} pares EPRs restantes.")
+        if self.logger.enabled_for('log'):
+            self.logger.log("Pares EPRs restantes na rota:")
+            for node1, node2, channel in plan.segments:
+                remaining_eprs = len(channel.eprs)
+                self.logger.log("Timeslot %s Segmento %s -> %s: %s pares EPRs restantes.", self._network.get_timeslot(), node1, node2, remaining_eprs)
 
         if success_count == num_qubits:
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Transmissão de {num_qubits} qubits entre {alice_id} e {bob_id} concluída com sucesso.")
+            self.logger.log("Timeslot %s Transmissão de %s qubits entre %s e %s concluída com sucesso.", self._network.get_timeslot(), num_qubits, alice_id, bob_id)
             return True
         else:
-            self.logger.log(f"Timeslot {self._network.get_timeslot()} Transmissão falhou. Apenas {success_count} qubits foram transmitidos com sucesso.")
+            self.logger.log("Timeslot %s Transmissão falhou. Apenas %s qubits foram transmitidos com sucesso.", self._network.get_timeslot(), success_count)
             self.register_failed_request(alice_id, bob_id, num_qubits, route, "Transmissão incompleta")
             return False
 
@@ -602,7 +628,7 @@ class TransportLayer:
             u, v = route[i], route[i + 1]
             channel = (u, v)
             self._physical_layer.remove_all_eprs_from_channel(channel)
-            self.logger.log(f"Todos os pares EPRs removidos do canal {u} -> {v}.")
+            self.logger.log("Todos os pares EPRs removidos do canal %s -> %s.", u, v)
 
 
     def register_failed_request(self, alice_id, bob_id, num_qubits, route, reason):
@@ -623,32 +649,32 @@ class TransportLayer:
         }
         if hasattr(self._network, 'controller') and self._network.controller:
             self._network.controller.record_failed_request(failed_request)
-        self.logger.log(f"Falha registrada: {failed_request}")
+        self.logger.log("Falha registrada: %s", failed_request)
 
     def calculate_average_fidelity(self, route):
         """
         Calcula a fidelidade média ao longo de uma rota especificada na rede.
 
         Args:
-            route (list): Lista de nós que compõem a rota (ex: [u, v, w]).
+            route (list | RoutePlan): Lista de nós que compõem a rota (ex: [u, v, w]) ou rota com os canais já resolvidos.
 
         Returns:
             float: O produto das fidelidades dos pares EPR ao longo da rota, ou 0.0 se algum 
             canal não tiver pares disponíveis.
         """
         fidelities = []
+        plan = route if isinstance(route, RoutePlan) else self._network.plan_route(route)
 
         # Percorre a rota, considerando pares de nós consecutivos como canais.
-        for i in range(len(route)-1):
-            u, v = route[i], route[i+1]
+        for u, v, channel in plan.segments:
             # Obtém os pares EPR do canal atual.
-            eprs = self._network.get_eprs_from_edge(u, v)
+            eprs = channel.eprs
             if not eprs:
-                self.logger.log(f"Sem pares EPR disponíveis no canal {u}->{v}. Fidelidade = 0.")
+                self.logger.log("Sem pares EPR disponíveis no canal %s->%s. Fidelidade = 0.", u, v)
                 return 0.0
             # Obtém a fidelidade do último EPR disponível no canal.
             fidelity = eprs[-1].get_current_fidelity()  
-            self.logger.log(f"Fidelidade do EPR {u}->{v}: {fidelity}")
+            self.logger.log("Fidelidade do EPR %s->%s: %s", u, v, fidelity)
             fidelities.append(fidelity)
 
         # Se existirem fidelidades, calcula o produto delas.
@@ -656,7 +682,7 @@ class TransportLayer:
             product = 1.0
             for f in fidelities:
                 product *= f
-            self.logger.log(f"Produto das fidelidades para rota {route}: {product}")
+            self.logger.log("Produto das fidelidades para rota %s: %s", plan.nodes, product)
             return product
         return 0.0
 
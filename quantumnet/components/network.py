@@ -1,24 +1,31 @@
 import networkx as nx
-from qiskit import QuantumCircuit
-from ..objects import Logger, Qubit
+from ..objects import Logger, Qubit, Epr, FidelityStore, EprPool, FillEpoch, VirtualLinkStore, IdAllocator, Trace, CircuitSpec, random_circuit
+from ..objects.trace import EPR_CREATED, EPR_CONSUMED, REQUEST_STATUS, REQUEST_ARRIVAL, PHYSICAL, NETWORK, CONTROLLER
 from ..components import *
 from .layers import *
+from .parallel import execute_groups, fork_available
 import random
 import os
 import csv
-import matplotlib.pyplot as plt
 
 
 class Network():
     """
     Um objeto para utilizar como rede.
     """
-    def __init__(self) -> None:
+    def __init__(self, lazy_decoherence: bool = False, virtual_link_ttl: int = 10) -> None:
         # Sobre a rede
         self._graph = nx.Graph()
         self._topology = None
         self._hosts = {}
+        self._channels = {}
+        self.topology_version = 0
+        self.fill_epoch = FillEpoch()
         self.node_colors = []
+        self.fidelity_store = FidelityStore(lazy=lazy_decoherence)
+        self.virtual_links = VirtualLinkStore(self.fidelity_store, virtual_link_ttl)
+        self.ids = IdAllocator()
+        self.trace = Trace(enabled=False)
         # Camadas
         self._physical = PhysicalLayer(self)
         self._link = LinkLayer(self, self._physical)
@@ -143,6 +150,7 @@ class Network():
         # Adiciona o host ao dicionário de hosts, se não existir
         if host.host_id not in self._hosts:        
             self._hosts[host.host_id] = host
+            self.bind_host(host)
             Logger.get_instance().debug(f'Host {host.host_id} adicionado aos hosts da rede.')
         else:
             raise Exception(f'Host {host.host_id} já existe nos hosts da rede.')
@@ -156,6 +164,7 @@ class Network():
         for connection in host.connections:
             if not self._graph.has_edge(host.host_id, connection):
                 self._graph.add_edge(host.host_id, connection)
+                self.topology_version += 1
                 Logger.get_instance().debug(f'Conexões do {host.host_id} adicionados ao grafo da rede.')
     
     def get_host(self, host_id: int) -> Host:
@@ -170,6 +179,111 @@ class Network():
         """
         return self._hosts[host_id]
 
+    def bind_host(self, host: Host):
+        """
+        Associa a memória de um host ao armazenamento de fidelidades da rede.
+
+        Args:
+            host (Host): O host cuja memória passará a sofrer decoerência.
+        """
+        host.memory.bind(self.fidelity_store, self.get_qubit_creation_timeslot)
+
+    def get_qubit_creation_timeslot(self, qubit: Qubit) -> int:
+        """
+        Retorna o timeslot em que um qubit foi registrado, ou o timeslot atual se não houver registro.
+
+        Args:
+            qubit (Qubit): Qubit consultado.
+
+        Returns:
+            int : Timeslot de criação do qubit.
+        """
+        info = self.qubit_timeslots.get(qubit.qubit_id)
+        return info['timeslot'] if info is not None else self.get_timeslot()
+
+    def release_channels(self):
+        """
+        Esvazia os canais do grafo atual e os pares EPR virtuais, deixando de aplicar decoerência aos seus pares EPR.
+        """
+        for channel in set(self._channels.values()):
+            channel.eprs.clear()
+        self._channels = {}
+        self.virtual_links.clear()
+        self.topology_version += 1
+
+    def add_channel(self, u: int, v: int, prob_on_demand_epr_create: float = None, prob_replay_epr_create: float = None) -> Channel:
+        """
+        Cria o canal entre dois nós, adicionando a aresta ao grafo se necessário.
+
+        Os atributos da aresta ('eprs', 'busy_timeslots' e probabilidades) continuam disponíveis
+        e compartilham os mesmos objetos do canal.
+
+        Args:
+            u (int): ID de um dos nós.
+            v (int): ID do outro nó.
+            prob_on_demand_epr_create (float, optional): Probabilidade de criar um EPR sob demanda.
+            prob_replay_epr_create (float, optional): Probabilidade de criar um EPR de replay.
+
+        Returns:
+            Channel : O canal criado.
+        """
+        channel = Channel(u, v, EprPool(store=self.fidelity_store, epoch=self.fill_epoch), prob_on_demand_epr_create, prob_replay_epr_create)
+        if not self._graph.has_edge(u, v):
+            self._graph.add_edge(u, v)
+        edge_data = self._graph.edges[u, v]
+        edge_data['channel'] = channel
+        edge_data['eprs'] = channel.eprs
+        edge_data['busy_timeslots'] = channel.busy_timeslots
+        if prob_on_demand_epr_create is not None:
+            edge_data['prob_on_demand_epr_create'] = prob_on_demand_epr_create
+        if prob_replay_epr_create is not None:
+            edge_data['prob_replay_epr_create'] = prob_replay_epr_create
+        self._channels[(u, v)] = channel
+        self._channels[(v, u)] = channel
+        self.topology_version += 1
+        return channel
+
+    def get_channel(self, u: int, v: int) -> Channel:
+        """
+        Retorna o canal entre dois nós.
+
+        Args:
+            u (int): ID de um dos nós.
+            v (int): ID do outro nó.
+
+        Returns:
+            Channel : O canal entre os nós.
+
+        Raises:
+            KeyError: Se não houver canal entre os nós.
+        """
+        return self._channels[(u, v)]
+
+    def has_channel(self, u: int, v: int) -> bool:
+        """
+        Verifica se existe um canal entre dois nós.
+
+        Returns:
+            bool : True se o canal existir.
+        """
+        return (u, v) in self._channels
+
+    def plan_route(self, route: list) -> RoutePlan:
+        """
+        Resolve uma rota (lista de nós) para os canais correspondentes, uma única vez.
+
+        Args:
+            route (list): Lista de nós da rota.
+
+        Returns:
+            RoutePlan : Rota com os canais resolvidos.
+
+        Raises:
+            KeyError: Se algum par de nós consecutivos não possuir canal.
+        """
+        channels = self._channels
+        return RoutePlan(route, [channels[(route[i], route[i + 1])] for i in range(len(route) - 1)])
+
     def get_eprs(self):
         """
         Cria uma lista de qubits entrelaçados (EPRs) associadas a cada aresta do grafo.
@@ -183,7 +297,7 @@ class Network():
             eprs[edge] = self._graph.edges[edge]['eprs']
         return eprs
     
-    def get_eprs_from_edge(self, alice: int, bob: int) -> list:
+    def get_eprs_from_edge(self, alice: int, bob: int) -> EprPool:
         """
         Retorna os EPRs de uma aresta específica.
 
@@ -191,21 +305,25 @@ class Network():
             alice (int): ID do host Alice.
             bob (int): ID do host Bob.
         Returns:
-            list : Lista de EPRs da aresta.
+            EprPool : Pool de EPRs da aresta.
         """
-        edge = (alice, bob)
-        return self._graph.edges[edge]['eprs']
+        return self._channels[(alice, bob)].eprs
     
-    def remove_epr(self, alice: int, bob: int) -> list:
+    def remove_epr(self, alice: int, bob: int) -> Epr:
         """
-        Remove um EPR de um canal.
+        Remove o último EPR de um canal em O(1).
 
         Args:
-            channel (tuple): Canal de comunicação.
+            alice (int): ID do host Alice.
+            bob (int): ID do host Bob.
+
+        Returns:
+            Epr : O EPR removido.
         """
-        channel = (alice, bob)
         try:
-            epr = self._graph.edges[channel]['eprs'].pop(-1)   
+            epr = self._channels[(alice, bob)].eprs.pop()
+            if self.trace.enabled:
+                self.trace.record(EPR_CONSUMED, NETWORK, self.timeslot_total, alice, bob, epr.get_current_fidelity(), epr.epr_id)
             return epr
         except IndexError:
             raise Exception('Não há Pares EPRs.')   
@@ -220,6 +338,8 @@ class Network():
             clients (list): IDs dos nós que serão configurados como clientes.
             server (int): ID do nó que será configurado como servidor.
         """
+        self.release_channels()
+
         # Cria a topologia
         if graph_type == 'grade':
             if len(dimensions) != 2:
@@ -268,7 +388,7 @@ class Network():
         self.start_eprs()
 
         # Log e confirmação
-        self.logger.log(f"Topologia configurada: {graph_type} ({dimensions}) com {len(clients)} clientes e 1 servidor.")
+        self.logger.log("Topologia configurada: %s (%s) com %s clientes e 1 servidor.", graph_type, dimensions, len(clients))
         print("Topologia configurada com sucesso para slices!")
 
     def calculate_paths(self, clients, server):
@@ -313,6 +433,7 @@ class Network():
             slice_paths (list): Lista de caminhos para cada cliente (slice).
         """
         pos = nx.spring_layout(self._graph)
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(10, 10))
 
         # Desenha a base do grafo
@@ -361,7 +482,7 @@ class Network():
         # Visualiza os slices
         self.visualize_slices(clients, server, slice_paths)
 
-        self.logger.log(f"Simulação de slices concluída para {len(clients)} clientes e servidor {server}.")
+        self.logger.log("Simulação de slices concluída para %s clientes e servidor %s.", len(clients), server)
 
         # Retorna os caminhos para a camada de aplicação
         return self.final_slice_paths
@@ -381,6 +502,8 @@ class Network():
         # Converter o nome da topologia para minúsculas para aceitar qualquer variação de letras
         topology_name = topology_name.lower()
 
+        self.release_channels()
+
         # Cria a topologia conforme o nome
         if topology_name == 'grade':
             if len(args) != 2:
@@ -433,6 +556,7 @@ class Network():
         self.start_eprs()
 
     def draw(self):
+        import matplotlib.pyplot as plt
         node_colors = [self._hosts[node].color() for node in self._graph.nodes()]
         nx.draw(self._graph, with_labels=True, node_color=node_colors, node_size=800)
         plt.show()
@@ -446,15 +570,17 @@ class Network():
             num_qubits (int): Número de qubits a serem inicializados para cada host, exceto o host 0 (servidor).
         """
         for host_id in self._hosts:
+            self.bind_host(self._hosts[host_id])
+
             # Evita que o servidor (host 0) receba qubits
             if host_id == 10:
-                self.logger.log(f"Host {host_id} é o servidor, não receberá qubits.")
+                self.logger.log("Host %s é o servidor, não receberá qubits.", host_id)
                 continue
             
             # Inicializa os qubits para os demais hosts
             for i in range(num_qubits):
                 self.physical.create_qubit(host_id, increment_timeslot=False, increment_qubits=False)
-            self.logger.log(f"Host {host_id} inicializado com {num_qubits} qubits.")
+            self.logger.log("Host %s inicializado com %s qubits.", host_id, num_qubits)
         
         print("Hosts inicializados")
 
@@ -467,11 +593,11 @@ class Network():
             prob_on_demand_epr_create (float): Probabilidade de criar um EPR sob demanda.
             prob_replay_epr_create (float): Probabilidade de criar um EPR de replay.
         """
-        for edge in self.edges:
-            self._graph.edges[edge]['busy_timeslots'] = set()  # Adiciona atributo de timeslots ocupados
-            self._graph.edges[edge]['prob_on_demand_epr_create'] = random.uniform(self.min_prob, self.max_prob)
-            self._graph.edges[edge]['prob_replay_epr_create'] = random.uniform(self.min_prob, self.max_prob)
-            self._graph.edges[edge]['eprs'] = list()
+        self.release_channels()
+        for u, v in self.edges:
+            prob_on_demand_epr_create = random.uniform(self.min_prob, self.max_prob)
+            prob_replay_epr_create = random.uniform(self.min_prob, self.max_prob)
+            self.add_channel(u, v, prob_on_demand_epr_create, prob_replay_epr_create)
         print("Canais inicializados")
         
     def start_eprs(self, num_eprs: int = 2):
@@ -481,19 +607,66 @@ class Network():
         Args:
             num_eprs (int): Número de pares EPR a serem inicializados para cada canal.
         """
-        for edge in self.edges:
+        trace = self.trace
+        for u, v in self.edges:
+            eprs = self._channels[(u, v)].eprs
             for i in range(num_eprs):
                 epr = self.physical.create_epr_pair(increment_timeslot=False,increment_eprs=False)
-                self._graph.edges[edge]['eprs'].append(epr)
-                self.logger.debug(f'Par EPR {epr} adicionado ao canal.')
+                eprs.append(epr)
+                if trace.enabled:
+                    trace.record(EPR_CREATED, PHYSICAL, self.timeslot_total, u, v, epr.get_current_fidelity(), epr.epr_id)
+                self.logger.debug('Par EPR %s adicionado ao canal.', epr)
         print("Pares EPRs adicionados")
         
     def timeslot(self):
         """
         Incrementa o timeslot da rede.
+
+        No modo de decoerência preguiçosa, apenas o relógio avança; a decoerência é
+        calculada quando a fidelidade de um qubit ou EPR é lida.
+        """
+        self.advance(1)
+
+    def advance(self, n: int = 1):
+        """
+        Avança n timeslots da rede aplicando a decoerência acumulada de uma só vez.
+
+        Args:
+            n (int): Número de timeslots a avançar.
         """
-        self.timeslot_total += 1
-        self.apply_decoherence_to_all_layers()
+        if n <= 0:
+            return
+        self.timeslot_total += n
+        if self.fidelity_store.lazy:
+            self.fidelity_store.now = self.timeslot_total
+        else:
+            self.apply_decoherence_to_all_layers(ticks=n)
+        self.virtual_links.expire(self.timeslot_total)
+
+    def enable_trace(self, path: str = None, chunk_size: int = 65536) -> Trace:
+        """
+        Ativa o registro estruturado de eventos (criação e consumo de EPRs, swapping, purificação,
+        teletransporte e status das requisições).
+
+        Args:
+            path (str, optional): Arquivo .h5/.hdf5 para onde os blocos são descarregados. Se omitido, os eventos ficam em memória.
+            chunk_size (int): Número de eventos por bloco.
+
+        Returns:
+            Trace : O registro de eventos da rede.
+        """
+        self.trace.close()
+        self.trace = Trace(chunk_size=chunk_size, path=path)
+        return self.trace
+
+    def set_lazy_decoherence(self, lazy: bool = True):
+        """
+        Ativa ou desativa a decoerência preguiçosa, em que avançar o timeslot tem custo O(1).
+
+        Args:
+            lazy (bool): True para calcular a decoerência apenas na leitura das fidelidades.
+        """
+        self.fidelity_store.set_lazy(lazy)
 
     def get_timeslot(self):
         """
@@ -620,7 +793,7 @@ class Network():
         else:
             raise ValueError("Tipo de saída inválido. Escolha entre 'print', 'csv' ou 'variable'.")
 
-    def apply_decoherence_to_all_layers(self, decoherence_factor: float = 0.01):
+    def apply_decoherence_to_all_layers(self, decoherence_factor: float = 0.01, ticks: int = 1):
         """
         Aplica decoerência a todos os qubits e EPRs nas camadas da rede que já avançaram nos timeslots.
 
@@ -629,25 +802,11 @@ class Network():
 
         Args:
             decoherence_factor (float): Fator de decoerência aplicado, que reduz a fidelidade. 
+            ticks (int): Número de timeslots de decoerência aplicados, usando o fator composto.
         """
-        current_timeslot = self.get_timeslot()
-
-        # Aplicar decoerência nos qubits de cada host
-        for host_id, host in self.hosts.items():
-            for qubit in host.memory:
-                creation_timeslot = self.qubit_timeslots[qubit.qubit_id]['timeslot']
-                if creation_timeslot < current_timeslot:
-                    current_fidelity = qubit.get_current_fidelity()
-                    new_fidelity = current_fidelity - (current_fidelity * decoherence_factor)
-                    qubit.set_current_fidelity(new_fidelity)
-
-        # Aplicar decoerência nos EPRs em todos os canais (arestas da rede)
-        for edge in self.edges:
-            if 'eprs' in self._graph.edges[edge]:
-                for epr in self._graph.edges[edge]['eprs']:
-                    current_fidelity = epr.get_current_fidelity()
-                    new_fidelity = current_fidelity - (current_fidelity * decoherence_factor)
-                    epr.set_fidelity(new_fidelity)
+        # Qubits nas memórias dos hosts e EPRs nos canais estão anexados ao armazenamento de
+        # fidelidades, então um timeslot de decoerência é uma única multiplicação vetorizada.
+        self.fidelity_store.decay(decoherence_factor, self.get_timeslot(), ticks)
 
     def is_link_busy(self, node, timeslot):
         """
@@ -661,8 +820,8 @@ class Network():
             bool: True se algum link está ocupado, False caso contrário.
         """
         for neighbor in self._graph.neighbors(node):
-            edge_data = self._graph.get_edge_data(node, neighbor)
-            if 'busy_timeslots' in edge_data and timeslot in edge_data['busy_timeslots']:
+            channel = self._channels.get((node, neighbor))
+            if channel is not None and channel.is_busy(timeslot):
                 return True  # Retorna True se qualquer link do nó estiver ocupado
         return False
     
@@ -675,10 +834,10 @@ class Network():
             timeslot (int): O timeslot a ser reservado.
         """
         for neighbor in self._graph.neighbors(node):
-            edge_data = self._graph.get_edge_data(node, neighbor)
-            if 'busy_timeslots' not in edge_data:
-                edge_data['busy_timeslots'] = set()
-            edge_data['busy_timeslots'].add(timeslot)
+            channel = self._channels.get((node, neighbor))
+            if channel is None:
+                channel = self.add_channel(node, neighbor)
+            channel.busy_timeslots.add(timeslot)
     
     def restart_network(self):
         """
@@ -708,8 +867,9 @@ class Network():
 
     def generate_random_circuit(self, num_qubits=10, num_gates=30, custom_circuit=None):
         """
-        Gera um circuito quântico aleatório ou usa um circuito customizado, 
-        armazena suas instruções e exibe o circuito.
+        Gera um circuito quântico aleatório ou usa um circuito customizado e registra suas instruções.
+
+        O circuito não é mais desenhado aqui; use `draw_circuit` para visualizá-lo.
 
         Args:
             num_qubits (int): Número de qubits no circuito.
@@ -722,44 +882,16 @@ class Network():
         if custom_circuit is not None:
             # Usa o circuito customizado fornecido (gerado pelo ClassificadorQML)
             qc = custom_circuit
-            self.logger.log(f"Usando circuito customizado com {num_qubits} qubits.")
+            self.logger.log("Usando circuito customizado com %s qubits.", num_qubits)
         else:
             # Gera um circuito aleatório
-            qc = QuantumCircuit(num_qubits)
-            single_qubit_gates = ['h', 'x', 'y', 'z', 's', 't']
-            two_qubit_gates = ['cx', 'cz', 'swap']
-
-            for _ in range(num_gates):
-                gate_type = random.choice(['single', 'two'])
-                if gate_type == 'single':
-                    gate = random.choice(single_qubit_gates)
-                    qubit = random.randint(0, num_qubits - 1)
-                    getattr(qc, gate)(qubit)
-                elif gate_type == 'two':
-                    gate = random.choice(two_qubit_gates)
-                    qubit1 = random.randint(0, num_qubits - 1)
-                    qubit2 = random.randint(0, num_qubits - 1)
-                    while qubit1 == qubit2:
-                        qubit2 = random.randint(0, num_qubits - 1)
-                    if gate == 'cx':
-                        qc.cx(qubit1, qubit2)
-                    elif gate == 'cz':
-                        qc.cz(qubit1, qubit2)
-                    elif gate == 'swap':
-                        qc.swap(qubit1, qubit2)
-
-        # **Agora garantindo que o circuito é salvo e registrado**
-        
-        # Desenha e exibe o circuito graficamente (opcional para debug)
-        fig = qc.draw("mpl", style="clifford")
-        plt.show()
+            qc = random_circuit(num_qubits, num_gates).to_qiskit()
 
         # **Salva as instruções para log e debug**
-        saved_instructions = self.save_circuit_instructions(qc)
-        self.logger.log(f"Circuito gerado com {num_qubits} qubits e {num_gates} portas. Instruções salvas.")
-
-        for instr in saved_instructions:
-            self.logger.log(f"Instrução: {instr}")
+        self.logger.log("Circuito gerado com %s qubits e %s portas.", num_qubits, num_gates)
+        if self.logger.enabled_for('log'):
+            for instr in self.save_circuit_instructions(qc):
+                self.logger.log("Instrução: %s", instr)
 
         # **Calcula a profundidade do circuito**
         circuit_depth = qc.depth()
@@ -767,6 +899,27 @@ class Network():
         return qc, num_qubits, circuit_depth
 
 
+    def draw_circuit(self, circuit, output: str = "mpl", style: str = "clifford", show: bool = True):
+        """
+        Desenha um circuito quântico (QuantumCircuit ou CircuitSpec).
+
+        Args:
+            circuit (QuantumCircuit | CircuitSpec): Circuito a ser desenhado.
+            output (str): Formato de saída do qiskit.
+            style (str): Estilo do desenho.
+            show (bool): Se True, exibe a figura com matplotlib.
+
+        Returns:
+            A figura gerada pelo qiskit.
+        """
+        if isinstance(circuit, CircuitSpec):
+            circuit = circuit.to_qiskit()
+        fig = circuit.draw(output, style=style)
+        if show:
+            import matplotlib.pyplot as plt
+            plt.show()
+        return fig
+
     def save_circuit_instructions(self, circuit):
         """
         Salva as instruções de um circuito quântico em uma lista de dicionários.
@@ -777,6 +930,8 @@ class Network():
         Returns:
             list: Lista de instruções do circuito em formato de dicionário.
         """
+        if isinstance(circuit, CircuitSpec):
+            return circuit.instructions()
         instructions = []
         for instruction in circuit.data:
             operation = instruction.operation.name
@@ -824,7 +979,8 @@ class Network():
 
         # Adiciona a requisição à fila
         self.requests_queue.append(request)
-        self.logger.log(f"Requisição adicionada: Alice {alice_id} -> Bob {bob_id} com protocolo {protocols} e cenário {scenario}.")
+        self.record_arrival(request)
+        self.logger.log("Requisição adicionada: Alice %s -> Bob %s com protocolo %s e cenário %s.", alice_id, bob_id, protocols, scenario)
         return request
 
     def generate_request_slice(self, alice_id, bob_id, num_qubits, num_gates, protocol=None, slice_path=None, scenario=None, custom_circuit=None):
@@ -849,10 +1005,10 @@ class Network():
         if custom_circuit is not None:
             quantum_circuit = custom_circuit  # ✅ Usa o circuito do ClassificadorQML
             circuit_depth = custom_circuit.depth()  # ✅ Obtém a profundidade real do circuito
-            self.logger.log(f"Usando circuito personalizado com {num_qubits} qubits e profundidade {circuit_depth}.")
+            self.logger.log("Usando circuito personalizado com %s qubits e profundidade %s.", num_qubits, circuit_depth)
         else:
             quantum_circuit, _, circuit_depth = self.generate_random_circuit(num_qubits, num_gates)
-            self.logger.log(f"Gerado circuito aleatório com {num_qubits} qubits e {circuit_depth} camadas.")
+            self.logger.log("Gerado circuito aleatório com %s qubits e %s camadas.", num_qubits, circuit_depth)
 
         # **Cria a requisição com os dados fornecidos**
         request = {
@@ -868,11 +1024,78 @@ class Network():
 
         # **Adiciona a requisição à fila**
         self.requests_queue.append(request)
-        self.logger.log(f"Requisição adicionada: Alice {alice_id} -> Bob {bob_id} com protocolo {protocol} e cenário {scenario}.")
+        self.record_arrival(request)
+        self.logger.log("Requisição adicionada: Alice %s -> Bob %s com protocolo %s e cenário %s.", alice_id, bob_id, protocol, scenario)
         
         return request
 
 
+    def generate_requests(self, n: int, alice_ids, bob_ids, num_qubits, num_gates, protocols=None, slice_path=None, scenario=None, enqueue: bool = True) -> list:
+        """
+        Gera requisições em lote sem construir circuitos do qiskit nem desenhá-los.
+
+        Cada requisição recebe um CircuitSpec com a lista de portas, a profundidade e a contagem
+        de operações. Use `draw_circuit` ou `CircuitSpec.to_qiskit` para obter o circuito completo.
+
+        Args:
+            n (int): Número de requisições.
+            alice_ids (int | list): ID do cliente ou lista de IDs sorteados a cada requisição.
+            bob_ids (int | list): ID do servidor ou lista de IDs sorteados a cada requisição.
+            num_qubits (int | list): Número de qubits ou lista de valores sorteados.
+            num_gates (int | list): Número de portas ou lista de valores sorteados.
+            protocols (str | list, opcional): Protocolo ou lista de protocolos sorteados. Padrão: 'AC_BQC' ou 'BFK_BQC'.
+            slice_path (list, opcional): Caminho do slice associado.
+            scenario (int, opcional): Cenário para execução (1 ou 2).
+            enqueue (bool): Se True, adiciona as requisições à fila da rede.
+
+        Returns:
+            list : Requisições geradas.
+        """
+        def pick(value):
+            return random.choice(value) if isinstance(value, (list, tuple)) else value
+
+        if protocols is None or (isinstance(protocols, list) and len(protocols) == 0):
+            protocols = ['AC_BQC', 'BFK_BQC']
+
+        requests = []
+        for _ in range(n):
+            alice_id = pick(alice_ids)
+            bob_id = pick(bob_ids)
+            protocol = pick(protocols)
+            qubits = pick(num_qubits)
+            circuit = random_circuit(qubits, pick(num_gates))
+            requests.append({
+                "alice_id": alice_id,
+                "bob_id": bob_id,
+                "num_qubits": qubits,
+                "quantum_circuit": circuit,
+                "circuit_depth": circuit.depth(),
+                "protocol": protocol,
+                "slice_path": slice_path,
+                "scenario": scenario
+            })
+
+        if enqueue:
+            self.requests_queue.extend(requests)
+            for request in requests:
+                self.record_arrival(request)
+        self.logger.log("%s requisições geradas em lote.", n)
+        return requests
+
+    def record_arrival(self, request, timeslot=None):
+        """
+        Registra no trace a chegada de uma requisição (evento REQUEST_ARRIVAL), com o número de
+        qubits como valor. É o evento reproduzido por `trace_arrivals`.
+
+        Args:
+            request (dict): Requisição que chegou.
+            timeslot (int, optional): Timeslot da chegada. Padrão: o timeslot atual.
+        """
+        if timeslot is None:
+            timeslot = self.timeslot_total
+        self.trace.record(REQUEST_ARRIVAL, CONTROLLER, timeslot, request['alice_id'], request['bob_id'],
+                          value=request.get('num_qubits', -1))
+
     def send_requests_to_controller(self, controller):
         """
         Envia todas as requisições para o controlador e esvazia a fila de requisições.
@@ -891,41 +1114,169 @@ class Network():
             raise AttributeError("O controlador fornecido não possui o método 'schedule_requests'.")
 
 
-    def execute_scheduled_requests(self, scheduled_requests, slice_paths=None):
+    def execute_scheduled_requests(self, scheduled_requests, slice_paths=None, parallel=False):
         """
         Recebe e executa as requisições agendadas pelo controlador na rede.
         
         Args:
             scheduled_requests (dict): Dicionário de requisições agendadas por timeslot.
             slice_paths (dict, optional): Caminhos associados aos slices, se disponíveis.
+            parallel (bool): Se True, requisições sem canais nem hosts em comum são executadas em processos paralelos (ver `execute_concurrently`).
         """
         for timeslot, requests in scheduled_requests.items():
             # Reinicia a rede antes de processar o timeslot atual
-            self.logger.log(f"Reiniciando a rede antes de processar o timeslot {timeslot}.")
+            self.logger.log("Reiniciando a rede antes de processar o timeslot %s.", timeslot)
             self.restart_network()  # Corrigido para chamar diretamente o método da instância atual
-            self.logger.log(f"Rede reiniciada. Timeslot atual: {timeslot}.")
+            self.logger.log("Rede reiniciada. Timeslot atual: %s.", timeslot)
 
             # Avança para o timeslot correspondente
-            while self.get_timeslot() < timeslot:
-                self.timeslot()  # Incrementa o timeslot da rede
-                self.logger.log(f"Timeslot avançado para {self.get_timeslot()}.")
+            if self.get_timeslot() < timeslot:
+                self.advance(timeslot - self.get_timeslot())
+                self.logger.log("Timeslot avançado para %s.", self.get_timeslot())
 
             # Executa as requisições do timeslot
-            self.logger.log(f"Executando requisições do timeslot {timeslot}.")
-            for request in requests:
+            self.logger.log("Executando requisições do timeslot %s.", timeslot)
+            if parallel:
+                # As rotas são escolhidas antes da divisão, para que cada grupo use apenas os seus canais
+                routes = [self.execution_route(request) for request in requests]
+                resources = [self.route_resources(route, request['alice_id'], request['bob_id'])
+                             for request, route in zip(requests, routes)]
+                groups = partition_disjoint(resources)
+                statuses = self.execute_concurrently(
+                    requests, groups, lambda i: self.execute_request(requests[i], slice_paths, route=routes[i]), resources)
+            else:
+                statuses = [self.execute_request(request, slice_paths) for request in requests]
+            for request, status in zip(requests, statuses):
                 # Adiciona status à requisição
-                status = self.execute_request(request, slice_paths)
                 request['status'] = 'executado' if status else 'falhou'
-                self.logger.log(f"Requisição {request} - Status: {request['status']}")
-                
-           
-    def execute_request(self, request, slice_paths=None):
+                self.logger.log("Requisição %s - Status: %s", request, request['status'])
+
+    def planned_route(self, request) -> list:
+        """
+        Retorna a rota prevista para uma requisição, sem consumir recursos da rede.
+
+        Usa o slice_path da requisição, se houver, ou o caminho mais curto no grafo.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            list : Rota prevista, ou None se não houver caminho.
+        """
+        slice_path = request.get('slice_path')
+        if isinstance(slice_path, dict):
+            slice_path = slice_path.get('path')
+        if slice_path:
+            return list(slice_path)
+        try:
+            return nx.shortest_path(self._graph, request['alice_id'], request['bob_id'])
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            return None
+
+    def route_resources(self, route, alice_id=None, bob_id=None) -> set:
+        """
+        Retorna os recursos usados por uma rota: os canais (sem direção) e os hosts das extremidades,
+        cujas memórias são modificadas pela execução.
+
+        Args:
+            route (list): Rota.
+            alice_id (int, optional): Host de origem, se a rota não estiver disponível.
+            bob_id (int, optional): Host de destino, se a rota não estiver disponível.
+
+        Returns:
+            set : Conjunto de recursos.
+        """
+        resources = {('host', alice_id), ('host', bob_id)}
+        if route:
+            resources.add(('host', route[0]))
+            resources.add(('host', route[-1]))
+            for i in range(len(route) - 1):
+                u, v = route[i], route[i + 1]
+                resources.add(('channel', min(u, v), max(u, v)))
+        return resources
+
+    def partition_requests(self, requests, routes=None) -> list:
+        """
+        Divide as requisições em grupos que não compartilham canais nem hosts das extremidades.
+
+        Args:
+            requests (list): Requisições.
+            routes (list, optional): Rota de cada requisição. Se omitido, usa `planned_route`.
+
+        Returns:
+            list : Grupos com os índices das requisições, em ordem determinística.
+        """
+        if routes is None:
+            routes = [self.planned_route(request) for request in requests]
+        return partition_disjoint([self.route_resources(route, request['alice_id'], request['bob_id'])
+                                   for request, route in zip(requests, routes)])
+
+    def execute_concurrently(self, requests, groups, execute, resources, max_workers=None) -> list:
+        """
+        Executa grupos de requisições sem canais nem hosts em comum em processos paralelos.
+
+        Cada grupo roda em um processo próprio, com semente, relógio e estado da rede próprios, e
+        os resultados são incorporados à rede em ordem fixa (ver `parallel.execute_groups`). O
+        relógio da rede avança pelo tempo do grupo mais longo. Com um único grupo, ou em
+        plataformas sem fork, as requisições são executadas em sequência neste processo.
+
+        Args:
+            requests (list): Requisições.
+            groups (list): Grupos de índices, como retornados por `partition_requests`.
+            execute (callable): Função chamada com o índice de cada requisição.
+            resources (list): Recursos de cada requisição (ver `route_resources`).
+            max_workers (int, optional): Número máximo de processos.
+
+        Returns:
+            list : Resultado de cada requisição, na ordem dos índices.
+        """
+        if len(groups) > 1 and fork_available():
+            return execute_groups(self, requests, groups, execute, resources, max_workers)
+        if len(groups) > 1:
+            self.logger.log("Fork indisponível nesta plataforma; executando %s grupos em sequência.", len(groups))
+        results = {}
+        for group in groups:
+            for i in group:
+                results[i] = execute(i)
+        return [results[i] for i in sorted(results)]
+
+    def execution_route(self, request) -> list:
+        """
+        Retorna a rota em que uma requisição será executada: a do slice_path, se houver, ou a
+        calculada por `short_route_valid`.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            list : Rota, ou None se nenhuma rota válida for encontrada.
+
+        Raises:
+            ValueError: Se o slice_path da requisição for inválido.
+        """
+        slice_path = request.get('slice_path', None)
+        if slice_path:
+            self.logger.log("Slice Path fornecido: %s", slice_path)
+            if isinstance(slice_path, dict):
+                route = slice_path.get('path', None)  # Extrai a rota do dicionário
+                if not route:
+                    raise ValueError(f"O slice_path fornecido é inválido: {slice_path}")
+                return route
+            if isinstance(slice_path, list):
+                return slice_path  # Já é uma lista
+            raise ValueError(f"Formato inválido para slice_path: {slice_path}")
+        # Se não há slice_path, calcula a rota automaticamente
+        self.logger.log("Nenhum slice_path fornecido. Tentando calcular rota automaticamente.")
+        return self.networklayer.short_route_valid(request['alice_id'], request['bob_id'])
+
+    def execute_request(self, request, slice_paths=None, route=None):
         """
         Executa uma requisição, enviando os detalhes para a camada de aplicação da rede.
 
         Args:
             request (dict): Requisição contendo informações como Alice, Bob, circuito, qubits e opcionalmente slice_path.
             slice_paths (dict, optional): Dicionário com os caminhos dos slices. Se None, tenta usar o slice_path da requisição ou cálculo automático.
+            route (list, optional): Rota já escolhida (por exemplo, a reservada no agendamento). Tem precedência sobre o slice_path; a rota só é calculada se nenhuma das duas for fornecida.
         """
         alice_id = request['alice_id']
         bob_id = request['bob_id']
@@ -935,27 +1286,13 @@ class Network():
         circuit_depth = request.get('circuit_depth', 0)
         scenario = request.get('scenario', 1)
 
-        self.logger.log(f"Executando requisição: Alice {alice_id} -> Bob {bob_id}, Protocolo: {protocol}")
-
-        # Verifica se a requisição já possui um slice_path
-        slice_path = request.get('slice_path', None)
-        route = None
+        self.logger.log("Executando requisição: Alice %s -> Bob %s, Protocolo: %s", alice_id, bob_id, protocol)
 
         # Valida e extrai a rota
-        if slice_path:
-            self.logger.log(f"Slice Path fornecido: {slice_path}")
-            if isinstance(slice_path, dict):
-                route = slice_path.get('path', None)  # Extrai a rota do dicionário
-                if not route:
-                    raise ValueError(f"O slice_path fornecido é inválido: {slice_path}")
-            elif isinstance(slice_path, list):
-                route = slice_path  # Já é uma lista
-            else:
-                raise ValueError(f"Formato inválido para slice_path: {slice_path}")
+        if route is not None:
+            self.logger.log("Rota fornecida: %s", route)
         else:
-            # Se não há slice_path, calcula a rota automaticamente
-            self.logger.log("Nenhum slice_path fornecido. Tentando calcular rota automaticamente.")
-            route = self.networklayer.short_route_valid(alice_id, bob_id)
+            route = self.execution_route(request)
 
         if not route:
             raise ValueError("Nenhuma rota válida foi encontrada para a requisição.")
@@ -964,7 +1301,7 @@ class Network():
             raise ValueError(f"Rota inválida: {route}. Esperado uma lista.")
 
         # Log da rota antes de continuar
-        self.logger.log(f"Rota extraída para execução: {route}")
+        self.logger.log("Rota extraída para execução: %s", route)
 
         success = False
         # Executa o protocolo específico
@@ -983,11 +1320,12 @@ class Network():
                 # Simulação básica sem protocolo
                 success = self.transport_layer.simple_teleport(alice_id, bob_id, num_qubits, route, scenario)
         except Exception as e:
-            self.logger.log(f"Erro ao executar protocolo: {str(e)}")
+            self.logger.log("Erro ao executar protocolo: %s", str(e))
             raise
 
         # Atualiza o status da requisição
         request['status'] = 'executado' if success else 'falhou'
-        self.logger.log(f"Resultado da execução: {request['status']}")
+        self.trace.record(REQUEST_STATUS, CONTROLLER, self.timeslot_total, alice_id, bob_id, value=int(bool(success)))
+        self.logger.log("Resultado da execução: %s", request['status'])
 
         return success
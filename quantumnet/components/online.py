@@ -0,0 +1,352 @@
+import asyncio
+import random
+import numpy as np
+from ..objects import Logger, LatencyHistogram
+from ..objects.trace import REQUEST_ARRIVAL
+from .reservation import ReservationCalendar, ScheduledRequest
+
+_END = object()
+
+
+def request_factory(network, alice_ids, bob_ids, num_qubits, num_gates, protocols=None, scenario=None):
+    """
+    Cria uma função que gera uma requisição por chamada, no formato de `Network.generate_requests`.
+
+    Args:
+        network (Network): Rede usada para gerar as requisições.
+        alice_ids (int | list): ID do cliente ou lista de IDs sorteados.
+        bob_ids (int | list): ID do servidor ou lista de IDs sorteados.
+        num_qubits (int | list): Número de qubits ou lista de valores sorteados.
+        num_gates (int | list): Número de portas ou lista de valores sorteados.
+        protocols (str | list, opcional): Protocolo ou lista de protocolos sorteados.
+        scenario (int, opcional): Cenário para execução (1 ou 2).
+
+    Returns:
+        callable : Função `make_request(alice_id=None, bob_id=None) -> dict`.
+    """
+    def make_request(alice_id=None, bob_id=None):
+        alice = alice_ids if alice_id is None else alice_id
+        bob = bob_ids if bob_id is None else bob_id
+        return network.generate_requests(1, alice, bob, num_qubits, num_gates, protocols=protocols, scenario=scenario, enqueue=False)[0]
+    return make_request
+
+
+async def poisson_arrivals(rate: float, make_request, count: int = None, start: int = 0, rng=random):
+    """
+    Chegadas de Poisson: intervalos exponenciais com média 1 / rate timeslots.
+
+    Args:
+        rate (float): Taxa média de chegadas por timeslot.
+        make_request (callable): Função que cria cada requisição.
+        count (int, optional): Número de requisições. Se omitido, o fluxo é infinito.
+        start (int): Timeslot inicial.
+        rng (random.Random): Gerador de números aleatórios.
+
+    Yields:
+        tuple : (timeslot de chegada, requisição).
+    """
+    t = float(start)
+    n = 0
+    while count is None or n < count:
+        t += rng.expovariate(rate)
+        yield int(t), make_request()
+        n += 1
+
+
+async def bursty_arrivals(rate_on: float, rate_off: float, mean_on: float, mean_off: float, make_request, count: int = None, start: int = 0, rng=random):
+    """
+    Chegadas em rajadas (Poisson modulado por uma cadeia on/off).
+
+    O processo alterna entre um período de rajada, com taxa `rate_on`, e um período calmo, com
+    taxa `rate_off`. A duração de cada período é exponencial, com médias `mean_on` e `mean_off`.
+
+    Args:
+        rate_on (float): Taxa de chegadas por timeslot durante a rajada.
+        rate_off (float): Taxa de chegadas por timeslot fora da rajada (pode ser 0).
+        mean_on (float): Duração média da rajada, em timeslots.
+        mean_off (float): Duração média do período calmo, em timeslots.
+        make_request (callable): Função que cria cada requisição.
+        count (int, optional): Número de requisições. Se omitido, o fluxo é infinito.
+        start (int): Timeslot inicial.
+        rng (random.Random): Gerador de números aleatórios.
+
+    Yields:
+        tuple : (timeslot de chegada, requisição).
+    """
+    t = float(start)
+    on = True
+    end = t + rng.expovariate(1 / mean_on)
+    n = 0
+    while count is None or n < count:
+        rate = rate_on if on else rate_off
+        next_t = t + rng.expovariate(rate) if rate > 0 else float('inf')
+        if next_t >= end:
+            t = end
+            on = not on
+            end = t + rng.expovariate(1 / (mean_on if on else mean_off))
+            continue
+        t = next_t
+        yield int(t), make_request()
+        n += 1
+
+
+async def trace_arrivals(records, make_request=None):
+    """
+    Reproduz chegadas registradas.
+
+    Aceita um iterável de pares (timeslot, requisição), em ordem de chegada, ou os vetores de
+    um trace (`Trace.to_arrays` ou `Trace.load`). Nesse caso, cada evento REQUEST_ARRIVAL
+    (gravado quando a requisição é gerada ou admitida, ver `Network.record_arrival`) é
+    reproduzido como uma chegada entre node_a e node_b no timeslot registrado, e a requisição
+    é criada com `make_request(alice_id, bob_id)`.
+
+    Args:
+        records (iterable | dict): Chegadas ou vetores do trace.
+        make_request (callable, optional): Função que cria a requisição; obrigatória para traces.
+
+    Yields:
+        tuple : (timeslot de chegada, requisição).
+    """
+    if isinstance(records, dict):
+        if make_request is None:
+            raise ValueError('make_request é obrigatório para reproduzir um trace.')
+        mask = records['kind'] == REQUEST_ARRIVAL
+        timeslots = records['timeslot'][mask]
+        order = np.argsort(timeslots, kind='stable')
+        for ts, alice_id, bob_id in zip(timeslots[order], records['node_a'][mask][order], records['node_b'][mask][order]):
+            yield int(ts), make_request(int(alice_id), int(bob_id))
+        return
+    for ts, request in records:
+        yield int(ts), request
+
+
+class OnlineController():
+    """
+    Laço online do controlador, orientado por asyncio.
+
+    Uma tarefa produtora consome um gerador de chegadas e alimenta uma fila assíncrona limitada;
+    o laço do controlador avança o tempo simulado timeslot a timeslot, admite as requisições
+    que já chegaram na fila de pendentes do controlador, agenda-as de forma incremental no
+    calendário de reservas e executa as requisições agendadas para o timeslot atual.
+
+    Para cada requisição são medidos o atraso de fila (início da execução - chegada) e a
+    latência de conclusão (fim da execução - chegada), em timeslots, em histogramas de memória
+    constante. A memória do laço é limitada pelo tamanho da fila de entrada (`buffer_size`) e
+    pelo número máximo de requisições admitidas e ainda não executadas (`max_in_flight`):
+    quando o limite é atingido, a produtora é bloqueada até que o controlador alcance as
+    chegadas. O histórico de requisições executadas e falhas do controlador é desativado.
+
+    Args:
+        controller (Controller): Controlador usado para agendar e executar as requisições.
+        buffer_size (int): Capacidade da fila assíncrona de chegadas.
+        max_in_flight (int): Número máximo de requisições admitidas (pendentes ou agendadas) e ainda não executadas.
+        refill (bool): Se True, reinicia os pares EPR da rede após cada timeslot com execuções, como `Controller.send_scheduled_requests`.
+        execute (callable, optional): Função `execute(request, timeslot) -> bool`. Padrão: `Controller.execute_request_one`. O tempo de serviço é o quanto o relógio da rede avança durante a chamada (no mínimo 1 timeslot).
+        max_latency (int): Maior latência representada individualmente nos histogramas.
+    """
+    def __init__(self, controller, buffer_size: int = 1024, max_in_flight: int = 4096, refill: bool = True, execute=None, max_latency: int = 1 << 16) -> None:
+        self.controller = controller
+        self.network = controller.network
+        self.logger = Logger.get_instance()
+        self.buffer_size = buffer_size
+        self.max_in_flight = max_in_flight
+        self.refill = refill
+        self.execute = execute or controller.execute_request_one
+        self.queueing_delay = LatencyHistogram(max_latency)
+        self.latency = LatencyHistogram(max_latency)
+        self.now = 0
+        self.arrived = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self._arrivals = {}
+        self.node_calendar = ReservationCalendar()
+        controller.keep_history = False
+
+    def report(self) -> dict:
+        """
+        Resumo da simulação online.
+
+        Returns:
+            dict : Contagens de requisições, timeslot atual e percentis (p50/p95/p99) do atraso de fila e da latência de conclusão.
+        """
+        return {
+            'timeslot': self.now,
+            'arrived': self.arrived,
+            'completed': self.completed,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'in_flight': len(self._arrivals),
+            'queueing_delay': self.queueing_delay.summary(),
+            'latency': self.latency.summary(),
+        }
+
+    def simulate(self, arrivals, until: int = None) -> dict:
+        """
+        Executa `run` em um novo laço de eventos.
+
+        Args:
+            arrivals (iterable | async iterable): Chegadas (timeslot, requisição).
+            until (int, optional): Timeslot em que a simulação é interrompida.
+
+        Returns:
+            dict : Resumo da simulação (ver `report`).
+        """
+        return asyncio.run(self.run(arrivals, until))
+
+    async def run(self, arrivals, until: int = None) -> dict:
+        """
+        Consome as chegadas até esgotá-las (e concluir as requisições em andamento) ou até o timeslot `until`.
+
+        Args:
+            arrivals (iterable | async iterable): Chegadas (timeslot, requisição), em ordem não decrescente de timeslot.
+            until (int, optional): Timeslot em que a simulação é interrompida.
+
+        Returns:
+            dict : Resumo da simulação (ver `report`).
+        """
+        queue = asyncio.Queue(maxsize=self.buffer_size)
+        producer = asyncio.create_task(self._produce(arrivals, queue))
+        try:
+            await self._consume(queue, until)
+        finally:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        return self.report()
+
+    async def _produce(self, arrivals, queue):
+        if hasattr(arrivals, '__aiter__'):
+            async for item in arrivals:
+                await queue.put(item)
+        else:
+            for item in arrivals:
+                await queue.put(item)
+        await queue.put(_END)
+
+    async def _consume(self, queue, until):
+        controller = self.controller
+        pending = controller.pending_requests
+        lookahead = None
+        exhausted = False
+        refilled = False
+        while until is None or self.now < until:
+            # Admite as requisições que já chegaram, respeitando o limite de requisições em andamento
+            while not exhausted and len(self._arrivals) < self.max_in_flight:
+                item = lookahead if lookahead is not None else await queue.get()
+                lookahead = None
+                if item is _END:
+                    exhausted = True
+                    break
+                arrival, request = item
+                if arrival > self.now:
+                    lookahead = item
+                    break
+                pending.push(request, arrival)
+                self._arrivals[id(request)] = arrival
+                self.arrived += 1
+                self.network.record_arrival(request, arrival)
+
+            self._schedule()
+            if not controller.scheduled_requests and pending:
+                # Nenhuma requisição pendente tem rota com pares EPR e nada está agendado: reinicia
+                # os pares EPR uma vez; se nem assim houver rota, as requisições são descartadas
+                if self.refill and not refilled:
+                    self.network.restart_network()
+                    self._schedule()
+                if not controller.scheduled_requests:
+                    self._drop_pending()
+
+            refilled = False
+            if self._execute_timeslot() and self.refill:
+                self.network.restart_network()
+                refilled = True
+
+            if exhausted and lookahead is None and not pending and not controller.scheduled_requests:
+                break
+
+            # Sem trabalho em andamento, salta direto para a próxima chegada
+            if lookahead is not None and not pending and not controller.scheduled_requests:
+                self.now = max(self.now + 1, lookahead[0])
+            else:
+                self.now += 1
+            if self.now % 64 == 0:
+                controller.calendar.prune(self.now)
+                self.node_calendar.prune(self.now)
+            await asyncio.sleep(0)
+
+    def _schedule(self):
+        """
+        Agenda as requisições pendentes no primeiro timeslot >= agora em que a rota está livre
+        e não compartilha nós com as rotas já agendadas nele. Os nós também têm um calendário de
+        reservas, de modo que o timeslot sai de buscas binárias nos dois calendários, sem
+        percorrer os timeslots ocupados. Requisições sem rota com pares EPR permanecem pendentes.
+        """
+        controller = self.controller
+        pending = controller.pending_requests
+        networklayer = self.network.networklayer
+        deferred = []
+        while pending:
+            request = pending.pop()
+            route = networklayer.short_route_valid(request['alice_id'], request['bob_id'], increment_timeslot=False)
+            if not route:
+                deferred.append(request)
+                continue
+            record = ScheduledRequest(request, route)
+            timeslot = self.now
+            while True:
+                fit = controller.calendar.earliest_fit(record.links, timeslot, record.duration)
+                fit = self.node_calendar.earliest_fit(record.nodes, fit, record.duration)
+                if fit == timeslot:
+                    break
+                timeslot = fit
+            controller.schedule_record(record, timeslot)
+            self.node_calendar.reserve(record.nodes, timeslot, record.duration)
+        for request in deferred:
+            pending.push(request, self._arrivals[id(request)])
+
+    def _execute_timeslot(self) -> int:
+        """
+        Executa as requisições agendadas para o timeslot atual e registra as latências.
+
+        Returns:
+            int : Número de requisições executadas.
+        """
+        controller = self.controller
+        requests = controller.scheduled_requests.pop(self.now, None)
+        controller.timeslot_nodes.pop(self.now, None)
+        if not requests:
+            return 0
+
+        network = self.network
+        if network.get_timeslot() < self.now:
+            network.advance(self.now - network.get_timeslot())
+        for request in requests:
+            arrival = self._arrivals.pop(id(request))
+            self.queueing_delay.add(self.now - arrival)
+            record = controller.schedule_records.get(id(request))
+            start = network.get_timeslot()
+            success = self.execute(request, self.now)
+            if record is not None:
+                # Controller.execute_request_one já libera a rota; outras funções de execução não
+                if controller.schedule_records.pop(id(request), None) is not None:
+                    controller.release_route(record.route, self.now, record.duration)
+                self.node_calendar.release(record.nodes, self.now, record.duration)
+            service = max(network.get_timeslot() - start, 1)
+            self.latency.add(self.now + service - arrival)
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+        return len(requests)
+
+    def _drop_pending(self):
+        pending = self.controller.pending_requests
+        while pending:
+            request = pending.pop()
+            self._arrivals.pop(id(request), None)
+            self.controller.record_failed_request(request, "Sem rota com pares EPR")
+            self.dropped += 1
+        self.logger.log("Timeslot %s: requisições pendentes descartadas por falta de pares EPR.", self.now)
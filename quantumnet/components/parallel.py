@@ -0,0 +1,290 @@
+import os
+import pickle
+import random
+import multiprocessing
+from collections import Counter
+import numpy as np
+from ..objects import IdAllocator, Trace
+
+# Atributos das camadas alterados pela execução de uma requisição e incorporados à rede ao
+# final de cada grupo: contadores são somados, listas recebem os itens novos e perdem os
+# removidos, dicionários recebem as chaves novas ou alteradas.
+COUNTERS = ('used_eprs', 'used_qubits')
+LISTS = ('created_eprs', 'transmitted_qubits', 'route_fidelities', '_qubits', '_failed_eprs', '_requests', '_failed_requests')
+DICTS = ('routes_used',)
+
+# Tarefa em execução, herdada pelos processos filhos no fork
+_task = None
+
+
+def fork_available() -> bool:
+    """
+    Verifica se a plataforma permite criar processos por fork, que herdam o estado da rede sem cópia explícita.
+
+    Returns:
+        bool : True se o método 'fork' estiver disponível.
+    """
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _layers(network) -> tuple:
+    return (network.physical, network.linklayer, network.networklayer, network.transportlayer, network.application_layer)
+
+
+def _snapshot(network) -> list:
+    snapshot = []
+    for layer in _layers(network):
+        snapshot.append(({name: getattr(layer, name) for name in COUNTERS if hasattr(layer, name)},
+                         {name: list(getattr(layer, name)) for name in LISTS if hasattr(layer, name)},
+                         {name: dict(getattr(layer, name)) for name in DICTS if hasattr(layer, name)}))
+    return snapshot
+
+
+def _dict_changes(before: dict, after: dict) -> dict:
+    return {key: value for key, value in after.items() if key not in before or before[key] != value}
+
+
+def _list_changes(before: list, after: list) -> tuple:
+    """
+    Compara duas versões de uma lista pela identidade dos itens.
+
+    Returns:
+        tuple : (índices removidos da lista original, itens novos na ordem em que aparecem).
+    """
+    remaining = Counter(id(item) for item in after)
+    removed = []
+    for i, item in enumerate(before):
+        if remaining[id(item)]:
+            remaining[id(item)] -= 1
+        else:
+            removed.append(i)
+    removed_set = set(removed)
+    pending = Counter(id(item) for i, item in enumerate(before) if i not in removed_set)
+    added = []
+    for item in after:
+        if pending[id(item)]:
+            pending[id(item)] -= 1
+        else:
+            added.append(item)
+    return removed, added
+
+
+def _portable(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+
+def _run_group(position: int) -> dict:
+    """
+    Executa um grupo no processo filho e devolve as alterações feitas no estado da rede.
+
+    O processo é uma cópia da rede no início do lote, criada só para este grupo, de modo que
+    as alterações se referem sempre ao estado inicial. Cada grupo recebe semente, IDs e trace
+    próprios.
+    """
+    network, requests, groups, execute, resources, seeds, start, first_id = _task
+    group = groups[position]
+
+    store = network.fidelity_store
+    if not store.lazy:
+        # Com decoerência preguiçosa, o relógio do grupo pode partir do início do lote
+        store.set_lazy(True)
+    network.timeslot_total = store.now = start
+    random.seed(seeds[position])
+    network.ids = IdAllocator(first_id + position, len(groups))
+    network.trace = Trace(enabled=network.trace.enabled)
+
+    layers_before = _snapshot(network)
+    virtual_before = {key: list(network.virtual_links.get(*key)) for key in network.virtual_links}
+    busy_before = {(u, v): set(network.get_channel(u, v).busy_timeslots)
+                   for u, v in network.graph.edges() if network.has_channel(u, v)}
+    timeslots_before = dict(network.qubit_timeslots)
+    requests_before = {i: dict(requests[i]) for i in group}
+
+    results = []
+    error = None
+    for i in group:
+        try:
+            results.append(execute(i))
+        except Exception as exc:
+            error = _portable(exc)
+            break
+
+    channels = {}
+    hosts = {}
+    for resource in set().union(*(resources[i] for i in group)):
+        if resource[0] == 'channel':
+            _, u, v = resource
+            if network.has_channel(u, v):
+                channels[u, v] = list(network.get_channel(u, v).eprs)
+        elif resource[1] in network.hosts:
+            hosts[resource[1]] = list(network.hosts[resource[1]].memory)
+
+    virtual_links = {}
+    expiry_times = None
+    for key in set(virtual_before).union(network.virtual_links):
+        before = virtual_before.get(key, [])
+        pool = network.virtual_links.get(*key)
+        removed, added = _list_changes(before, list(pool) if pool is not None else [])
+        if removed or added:
+            if added and expiry_times is None:
+                expiry_times = network.virtual_links.expiry_times()
+            virtual_links[key] = ([before[i].epr_id for i in removed],
+                                  [(epr, expiry_times.get(epr.epr_id)) for epr in added])
+
+    busy_timeslots = {}
+    for (u, v), before in busy_before.items():
+        after = network.get_channel(u, v).busy_timeslots
+        if after != before:
+            busy_timeslots[u, v] = (before - after, after - before)
+
+    layers = []
+    for layer, (counters, lists, dicts) in zip(_layers(network), layers_before):
+        layers.append(({name: getattr(layer, name) - value for name, value in counters.items()},
+                       {name: _list_changes(value, getattr(layer, name)) for name, value in lists.items()},
+                       {name: _dict_changes(value, getattr(layer, name)) for name, value in dicts.items()}))
+
+    return {
+        'results': results,
+        'error': error,
+        'elapsed': network.timeslot_total - start,
+        'next_id': network.ids.peek(),
+        'channels': channels,
+        'hosts': hosts,
+        'virtual_links': virtual_links,
+        'busy_timeslots': busy_timeslots,
+        'layers': layers,
+        'qubit_timeslots': _dict_changes(timeslots_before, network.qubit_timeslots),
+        'requests': {i: _dict_changes(requests_before[i], requests[i]) for i in group},
+        'trace': network.trace.to_arrays() if network.trace.enabled else None,
+    }
+
+
+def execute_groups(network, requests, groups, execute, resources, max_workers: int = None) -> list:
+    """
+    Executa grupos de requisições disjuntas em processos separados e incorpora os resultados à rede.
+
+    Cada grupo roda em um processo novo, criado por fork a partir da rede no início do lote e
+    descartado ao fim do grupo (nenhum processo executa dois grupos), com semente própria
+    (sorteada do gerador global, na ordem dos grupos), relógio próprio a partir do timeslot
+    atual, IDs intercalados com os dos outros grupos e trace próprio. Ao final, na ordem dos
+    grupos:
+
+    - o relógio da rede avança pelo maior tempo gasto por um grupo, já que os grupos rodaram
+      ao mesmo tempo; o relógio nunca volta;
+    - os pares EPR dos canais e os qubits dos hosts de cada grupo substituem os da rede, com a
+      decoerência do tempo que falta até o fim do lote;
+    - os pares EPR virtuais consumidos por um grupo são removidos, pelo ID, e os criados são
+      guardados com a mesma validade, também com a decoerência que falta; os que expiraram
+      até o fim do lote são descartados;
+    - os timeslots ocupados e liberados nos canais (`Channel.busy_timeslots`) são aplicados;
+    - contadores, listas e registros das camadas, os timeslots de criação dos qubits, as
+      alterações nas requisições e os eventos do trace (ordenados por timeslot) são incorporados.
+
+    O resultado depende apenas do estado inicial e dos grupos, e não do número de processos.
+
+    Args:
+        network (Network): Rede.
+        requests (list): Requisições; as alterações feitas nelas durante a execução são copiadas de volta.
+        groups (list): Grupos de índices, sem canais nem hosts em comum.
+        execute (callable): Função chamada com o índice de cada requisição; o retorno deve ser serializável.
+        resources (list): Recursos (ver `Network.route_resources`) de cada requisição, indexados como `requests`.
+        max_workers (int, optional): Número máximo de processos. Padrão: o número de CPUs.
+
+    Returns:
+        list : Resultado de cada requisição executada, na ordem dos índices.
+
+    Raises:
+        Exception: A primeira exceção levantada por uma requisição, na ordem dos grupos, depois
+            de incorporados os resultados de todos os grupos.
+    """
+    global _task
+    seeds = [random.getrandbits(64) for _ in groups]
+    start = network.timeslot_total
+    _task = (network, requests, groups, execute, resources, seeds, start, network.ids.peek())
+    try:
+        workers = min(len(groups), max_workers or os.cpu_count() or 1)
+        # maxtasksperchild=1: cada grupo roda em um processo recém-criado a partir do estado inicial
+        with multiprocessing.get_context('fork').Pool(workers, maxtasksperchild=1) as pool:
+            outcomes = pool.map(_run_group, range(len(groups)), chunksize=1)
+    finally:
+        _task = None
+
+    elapsed = max(outcome['elapsed'] for outcome in outcomes)
+    network.advance(elapsed)
+    network.ids.skip_to(max(outcome['next_id'] for outcome in outcomes))
+
+    for outcome in outcomes:
+        network.qubit_timeslots.update(outcome['qubit_timeslots'])
+        for i, changes in outcome['requests'].items():
+            requests[i].update(changes)
+
+    for k, layer in enumerate(_layers(network)):
+        for outcome in outcomes:
+            counters, _, dicts = outcome['layers'][k]
+            for name, delta in counters.items():
+                setattr(layer, name, getattr(layer, name) + delta)
+            for name, changes in dicts.items():
+                getattr(layer, name).update(changes)
+        for name in outcomes[0]['layers'][k][1]:
+            removed = set()
+            added = []
+            for outcome in outcomes:
+                group_removed, group_added = outcome['layers'][k][1][name]
+                removed.update(group_removed)
+                added.extend(group_added)
+            if removed or added:
+                items = getattr(layer, name)
+                items[:] = [item for i, item in enumerate(items) if i not in removed] + added
+
+    if network.trace.enabled:
+        parts = [outcome['trace'] for outcome in outcomes if outcome['trace'] is not None]
+        if parts:
+            events = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+            order = np.argsort(events['timeslot'], kind='stable')
+            network.trace.extend({name: values[order] for name, values in events.items()})
+
+    retention = 1 - network.fidelity_store.decoherence_factor
+    for outcome in outcomes:
+        factor = retention ** (elapsed - outcome['elapsed'])
+        for (u, v), eprs in outcome['channels'].items():
+            if factor != 1:
+                for epr in eprs:
+                    epr.set_fidelity(epr.get_current_fidelity() * factor)
+            pool = network.get_channel(u, v).eprs
+            pool.clear()
+            pool.extend(eprs)
+        for host_id, qubits in outcome['hosts'].items():
+            if factor != 1:
+                for qubit in qubits:
+                    qubit.set_current_fidelity(qubit.get_current_fidelity() * factor)
+            memory = network.hosts[host_id].memory
+            memory.clear()
+            memory.extend(qubits)
+        for key, (removed, added) in outcome['virtual_links'].items():
+            pool = network.virtual_links.get(*key)
+            if removed and pool is not None:
+                removed = set(removed)
+                for epr in [epr for epr in pool if epr.epr_id in removed]:
+                    network.virtual_links.remove(epr, *key)
+            for epr, expiry in added:
+                if factor != 1:
+                    epr.set_fidelity(epr.get_current_fidelity() * factor)
+                created = start if expiry is None else expiry - network.virtual_links.ttl
+                network.virtual_links.add(epr, *key, created)
+        for (u, v), (released, reserved) in outcome['busy_timeslots'].items():
+            busy = network.get_channel(u, v).busy_timeslots
+            busy.difference_update(released)
+            busy.update(reserved)
+    network.virtual_links.expire(network.timeslot_total)
+
+    results = {}
+    for group, outcome in zip(groups, outcomes):
+        results.update(zip(group, outcome['results']))
+    for outcome in outcomes:
+        if outcome['error'] is not None:
+            raise outcome['error']
+    return [results[i] for i in sorted(results)]
@@ -0,0 +1,140 @@
+import heapq
+import itertools
+import networkx as nx
+
+
+def qubits_gates_policy(request, arrival, network=None):
+    """
+    Prioriza requisições com menos qubits e, em seguida, com mais portas no circuito.
+    """
+    circuit = request.get('quantum_circuit')
+    num_gates = len(circuit.data) if circuit is not None else 0
+    return (request['num_qubits'], -num_gates)
+
+
+def fifo_policy(request, arrival, network=None):
+    """
+    Atende as requisições na ordem de chegada.
+    """
+    return ()
+
+
+def shortest_route_policy(request, arrival, network=None):
+    """
+    Prioriza requisições com rotas mais curtas (menos saltos).
+
+    Usa o caminho do slice, se houver, ou a distância no grafo da rede.
+    """
+    slice_path = request.get('slice_path')
+    if slice_path:
+        return (len(slice_path) - 1,)
+    if network is None:
+        return (0,)
+    try:
+        return (nx.shortest_path_length(network.graph, request['alice_id'], request['bob_id']),)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return (float('inf'),)
+
+
+class AgingPolicy():
+    """
+    Política com envelhecimento: a prioridade base é penalizada pelo instante de chegada.
+
+    A chave é base + rate * chegada. Como todas as chaves envelhecem na mesma taxa, a chave
+    pode ser calculada uma única vez na chegada e a ordem do heap continua válida: uma
+    requisição antiga acaba passando à frente de requisições novas com prioridade base melhor.
+    """
+    def __init__(self, rate: float = 1.0, base=None) -> None:
+        self.rate = rate
+        self.base = base or (lambda request, arrival, network=None: request['num_qubits'])
+
+    def __call__(self, request, arrival, network=None):
+        return (self.base(request, arrival, network) + self.rate * arrival,)
+
+
+POLICIES = {
+    'qubits_gates': qubits_gates_policy,
+    'fifo': fifo_policy,
+    'shortest_route': shortest_route_policy,
+    'aging': AgingPolicy(),
+}
+
+
+class RequestQueue():
+    """
+    Fila de requisições pendentes baseada em heap.
+
+    A chave de prioridade de cada requisição é calculada uma única vez, na chegada, pela
+    política configurada, e desempatada pela ordem de chegada. Inserir e retirar custam O(log n).
+
+    Políticas disponíveis: 'qubits_gates' (padrão do controlador), 'fifo', 'shortest_route' e
+    'aging'. Também é possível passar qualquer função `policy(request, arrival, network) -> tuple`.
+    """
+    def __init__(self, policy='qubits_gates', network=None) -> None:
+        self._heap = []
+        self._counter = itertools.count()
+        self.network = network
+        self.policy = self._resolve(policy)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __iter__(self):
+        """
+        Itera sobre as requisições em ordem de prioridade, sem removê-las.
+        """
+        return (entry[-1] for entry in sorted(self._heap))
+
+    def _resolve(self, policy):
+        if isinstance(policy, str):
+            try:
+                return POLICIES[policy]
+            except KeyError:
+                raise ValueError(f'Política de prioridade desconhecida: {policy}')
+        return policy
+
+    def push(self, request: dict, arrival: int = 0):
+        """
+        Adiciona uma requisição à fila.
+
+        Args:
+            request (dict): Requisição.
+            arrival (int): Instante (timeslot) de chegada, usado pelas políticas com envelhecimento.
+        """
+        seq = next(self._counter)
+        heapq.heappush(self._heap, (self.policy(request, arrival, self.network), seq, arrival, request))
+
+    def peek(self) -> dict:
+        """
+        Retorna a requisição de maior prioridade sem removê-la.
+
+        Raises:
+            IndexError: Se a fila estiver vazia.
+        """
+        return self._heap[0][-1]
+
+    def pop(self) -> dict:
+        """
+        Remove e retorna a requisição de maior prioridade.
+
+        Raises:
+            IndexError: Se a fila estiver vazia.
+        """
+        return heapq.heappop(self._heap)[-1]
+
+    def set_policy(self, policy):
+        """
+        Troca a política de prioridade, recalculando as chaves das requisições pendentes.
+
+        Args:
+            policy (str | callable): Nome da política ou função de prioridade.
+        """
+        self.policy = self._resolve(policy)
+        self._heap = [(self.policy(request, arrival, self.network), seq, arrival, request) for _, seq, arrival, request in self._heap]
+        heapq.heapify(self._heap)
+
+    def clear(self):
+        self._heap = []
@@ -0,0 +1,659 @@
+import heapq
+from collections import OrderedDict
+
+# Largura, em timeslots, das folhas da árvore de LinkCalendar, guardadas como máscaras de bits
+LEAF = 64
+FULL = (1 << LEAF) - 1
+
+
+def _leaf(mask: int) -> list:
+    """
+    Folha da árvore: [livre no início, livre no fim, maior trecho livre, reservas, None, None, máscara],
+    em que o bit i da máscara indica se o timeslot i da folha está reservado.
+    """
+    if mask == 0:
+        return [LEAF, LEAF, LEAF, 0, None, None, 0]
+    if mask == FULL:
+        return [0, 0, 0, 1, None, None, FULL]
+    # levels[j] marca os timeslots que iniciam um trecho livre de pelo menos 2**j timeslots
+    free = ~mask & FULL
+    levels = [(1, free)]
+    while True:
+        length, bits = levels[-1]
+        longer = bits & (bits >> length)
+        if not longer:
+            break
+        levels.append((2 * length, longer))
+    best, bits = levels.pop()
+    for length, starts in reversed(levels):
+        longer = bits & (starts >> best)
+        if longer:
+            best, bits = best + length, longer
+    return [(mask & -mask).bit_length() - 1, LEAF - mask.bit_length(), best,
+            bin(mask & ~(mask << 1)).count('1'), None, None, mask]
+
+
+def _runs(bits: int):
+    """
+    Percorre os trechos de bits 1 consecutivos de uma máscara, gerando (posição, comprimento).
+    """
+    while bits:
+        position = (bits & -bits).bit_length() - 1
+        shifted = bits >> position
+        length = (~shifted & (shifted + 1)).bit_length() - 1
+        yield position, length
+        bits = (shifted >> length) << (position + length)
+
+
+def _uniform(length: int, busy: bool) -> list:
+    # Nó interno: [livre no início, livre no fim, maior trecho livre, reservas, filho esquerdo, filho direito];
+    # um nó sem filhos é uniforme
+    if length == LEAF:
+        return _leaf(FULL if busy else 0)
+    return [0, 0, 0, 1, None, None] if busy else [length, length, length, 0, None, None]
+
+
+def _assign(node: list, lo: int, hi: int, start: int, end: int, busy: bool):
+    """
+    Marca [start, end) como reservado ou livre no nó de [lo, hi), que não está contido em [start, end).
+    """
+    if hi - lo == LEAF:
+        first = start if start > lo else lo
+        last = end if end < hi else hi
+        bits = ((1 << (last - first)) - 1) << (first - lo)
+        mask = node[6] | bits if busy else node[6] & ~bits
+        if mask != node[6]:
+            node[:] = _leaf(mask)
+        return
+    half = (hi - lo) >> 1
+    mid = lo + half
+    left, right = node[4], node[5]
+    if left is None:
+        if (node[2] == 0) == busy:
+            return
+        left = _uniform(half, not busy)
+        right = _uniform(half, not busy)
+    if start < mid:
+        if start <= lo and mid <= end:
+            left = _uniform(half, busy)
+        else:
+            _assign(left, lo, mid, start, end, busy)
+    if end > mid:
+        if start <= mid and hi <= end:
+            right = _uniform(half, busy)
+        else:
+            _assign(right, mid, hi, start, end, busy)
+    # Atualiza o nó a partir dos filhos (o mesmo que LinkCalendar._pull, repetido por desempenho)
+    lpre, lsuf, lbest = left[0], left[1], left[2]
+    rpre, rsuf, rbest = right[0], right[1], right[2]
+    if left[4] is None and right[4] is None and lbest == rbest and (lbest == 0 or lbest == half):
+        node[0] = node[1] = node[2] = 2 * lbest
+        node[3] = 1 if lbest == 0 else 0
+        node[4] = node[5] = None
+        return
+    node[0] = lpre if lpre < half else half + rpre
+    node[1] = rsuf if rsuf < half else half + lsuf
+    best = lsuf + rpre
+    if lbest > best:
+        best = lbest
+    if rbest > best:
+        best = rbest
+    node[2] = best
+    node[3] = left[3] + right[3] - (lsuf == 0 and rpre == 0)
+    node[4] = left
+    node[5] = right
+
+
+class LinkCalendar():
+    """
+    Calendário de reservas de um link.
+
+    As reservas são intervalos semiabertos [início, fim) de timeslots, fundidos quando
+    sobrepostos ou adjacentes. Elas ficam em uma árvore de segmentos dinâmica sobre a janela
+    de timeslots [base, base + T), com T uma potência de 2: a janela dobra quando uma reserva
+    cai fora dela e encolhe quando `prune` descarta a sua primeira metade. Cada nó guarda os
+    trechos livres no início e no fim do seu intervalo, o maior trecho livre e o número de
+    reservas; um trecho uniforme (todo livre ou todo reservado) é um único nó, e as folhas
+    cobrem LEAF timeslots em uma máscara de bits. Timeslots fora da janela estão livres.
+
+    Reservar, liberar, verificar um intervalo e encontrar a primeira janela livre de qualquer
+    duração custam O(log T) nós, mais operações de bits em até duas folhas, sem percorrer as
+    reservas uma a uma. Listar n reservas custa O(n log T).
+
+    Args:
+        intervals (iterable, optional): Intervalos (início, fim) reservados, ordenados e disjuntos.
+    """
+    __slots__ = ('base', 'size', '_root')
+
+    def __init__(self, intervals=()) -> None:
+        intervals = list(intervals)
+        self.base = intervals[0][0] if intervals else 0
+        self.size = LEAF
+        while intervals and self.base + self.size < intervals[-1][1]:
+            self.size *= 2
+        self._root = self._build(self.base, self.base + self.size, intervals, 0, len(intervals))
+
+    def __len__(self):
+        return self._root[3]
+
+    def _build(self, lo: int, hi: int, intervals: list, i: int, j: int) -> list:
+        """
+        Monta a subárvore de [lo, hi) a partir dos intervalos intervals[i:j], que o intersectam.
+        """
+        if i == j:
+            return _uniform(hi - lo, False)
+        if j - i == 1 and intervals[i][0] <= lo and hi <= intervals[i][1]:
+            return _uniform(hi - lo, True)
+        if hi - lo == LEAF:
+            mask = 0
+            for start, end in intervals[i:j]:
+                start, end = max(start, lo), min(end, hi)
+                mask |= ((1 << (end - start)) - 1) << (start - lo)
+            return _leaf(mask)
+        half = (hi - lo) >> 1
+        mid = lo + half
+        k = i
+        while k < j and intervals[k][1] <= mid:
+            k += 1
+        # intervals[k] é o primeiro que termina depois de mid; ele pode começar antes de mid
+        split = k + 1 if k < j and intervals[k][0] < mid else k
+        node = [0, 0, 0, 0, self._build(lo, mid, intervals, i, split), self._build(mid, hi, intervals, k, j)]
+        self._pull(node, half)
+        return node
+
+    @staticmethod
+    def _pull(node: list, half: int):
+        left, right = node[4], node[5]
+        lpre, lsuf, lbest = left[0], left[1], left[2]
+        rpre, rsuf, rbest = right[0], right[1], right[2]
+        if left[4] is None and right[4] is None and lbest == rbest and (lbest == 0 or lbest == half):
+            # Os dois filhos são uniformes e iguais: o nó volta a ser uniforme
+            node[0] = node[1] = node[2] = 2 * lbest
+            node[3] = 1 if lbest == 0 else 0
+            node[4] = node[5] = None
+            return
+        node[0] = lpre if lpre < half else half + rpre
+        node[1] = rsuf if rsuf < half else half + lsuf
+        node[2] = max(lbest, rbest, lsuf + rpre)
+        node[3] = left[3] + right[3] - (lsuf == 0 and rpre == 0)
+
+    def _grow(self, start: int, end: int):
+        while start < self.base:
+            self._root = [0, 0, 0, 0, _uniform(self.size, False), self._root]
+            self._pull(self._root, self.size)
+            self.base -= self.size
+            self.size *= 2
+        while self.base + self.size < end:
+            self._root = [0, 0, 0, 0, self._root, _uniform(self.size, False)]
+            self._pull(self._root, self.size)
+            self.size *= 2
+
+    def _shrink(self):
+        # Enquanto a primeira metade da janela estiver livre, a janela passa a ser a segunda metade
+        root = self._root
+        while self.size > LEAF:
+            half = self.size >> 1
+            if root[4] is None:
+                if root[2] == 0:
+                    break
+                root = _uniform(half, False)
+            elif root[4][0] == half:
+                root = root[5]
+            else:
+                break
+            self.base += half
+            self.size = half
+        self._root = root
+
+    def _set(self, start: int, end: int, busy: bool):
+        lo, hi = self.base, self.base + self.size
+        if start <= lo and hi <= end:
+            self._root = _uniform(self.size, busy)
+        else:
+            _assign(self._root, lo, hi, start, end, busy)
+
+    def _fit(self, node: list, lo: int, hi: int, start: int, duration: int, run: int) -> tuple:
+        """
+        Procura a primeira janela livre no intervalo do nó, dado o trecho livre `run` que
+        termina logo antes dele. Retorna (início da janela ou None, trecho livre no fim do nó).
+        """
+        if lo >= start:
+            if run + node[0] >= duration:
+                return lo - run, 0
+            if node[2] < duration:
+                suf = node[1]
+                return None, (run + hi - lo if suf == hi - lo else suf)
+        if hi - lo == LEAF:
+            # Percorre os trechos livres da folha a partir de `start`
+            offset = start - lo if start > lo else 0
+            tail = 0
+            for position, length in _runs(~node[6] & (FULL << offset) & FULL):
+                if position == 0:
+                    length += run
+                    position -= run
+                if length >= duration:
+                    return lo + position, 0
+                tail = length if position + length == LEAF else 0
+            return None, tail
+        if node[4] is None:
+            # Nó uniforme que contém `start`
+            if node[2] == 0:
+                return None, 0
+            run = hi - start
+            return (start, 0) if run >= duration else (None, run)
+        mid = lo + ((hi - lo) >> 1)
+        if start < mid:
+            fit, run = self._fit(node[4], lo, mid, start, duration, run)
+            if fit is not None:
+                return fit, 0
+        return self._fit(node[5], mid, hi, start, duration, run)
+
+    def _last_free(self, node: list, lo: int, hi: int, before: int) -> int:
+        if lo >= before or node[2] == 0:
+            return lo - 1
+        if hi - lo == LEAF:
+            free = ~node[6] & ((1 << (min(hi, before) - lo)) - 1)
+            return lo + free.bit_length() - 1
+        if node[4] is None:
+            return min(hi, before) - 1
+        mid = lo + ((hi - lo) >> 1)
+        if before > mid:
+            found = self._last_free(node[5], mid, hi, before)
+            if found >= mid:
+                return found
+        return self._last_free(node[4], lo, mid, before)
+
+    def _collect(self, node: list, lo: int, hi: int, start: int, end: int, out: list):
+        if end <= lo or hi <= start or node[2] == hi - lo:
+            return
+        if hi - lo == LEAF:
+            first = start if start > lo else lo
+            last = end if end < hi else hi
+            runs = _runs(node[6] & (((1 << (last - first)) - 1) << (first - lo)))
+        elif node[4] is None:
+            first = lo if lo > start else start
+            runs = [(first - lo, (hi if hi < end else end) - first)]
+        else:
+            mid = lo + ((hi - lo) >> 1)
+            self._collect(node[4], lo, mid, start, end, out)
+            self._collect(node[5], mid, hi, start, end, out)
+            return
+        for position, length in runs:
+            first = lo + position
+            if out and out[-1][1] == first:
+                out[-1] = (out[-1][0], first + length)
+            else:
+                out.append((first, first + length))
+
+    def intervals(self, start: int = None, end: int = None) -> list:
+        """
+        Retorna os intervalos reservados, recortados a [start, end) se informados.
+
+        Args:
+            start (int, optional): Primeiro timeslot considerado.
+            end (int, optional): Fim (exclusivo) do trecho considerado.
+
+        Returns:
+            list : Lista de tuplas (início, fim).
+        """
+        lo, hi = self.base, self.base + self.size
+        start = lo if start is None else max(start, lo)
+        end = hi if end is None else min(end, hi)
+        out = []
+        if start < end:
+            self._collect(self._root, lo, hi, start, end, out)
+        return out
+
+    def is_free(self, start: int, duration: int = 1) -> bool:
+        """
+        Verifica se o link está livre em [start, start + duration).
+
+        Args:
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+
+        Returns:
+            bool : True se nenhum timeslot do intervalo estiver reservado.
+        """
+        return self.earliest_fit(start, duration) == start
+
+    def earliest_fit(self, start: int, duration: int = 1) -> int:
+        """
+        Retorna o primeiro timeslot t >= start em que o link fica livre por `duration` timeslots.
+
+        A busca desce pela árvore usando o maior trecho livre de cada nó, em O(log T) para
+        qualquer duração.
+
+        Args:
+            start (int): Timeslot a partir do qual procurar.
+            duration (int): Número de timeslots consecutivos necessários.
+
+        Returns:
+            int : Primeiro timeslot livre.
+        """
+        lo, hi = self.base, self.base + self.size
+        if duration <= 0 or start >= hi or start + duration <= lo:
+            return start
+        run = 0
+        if start < lo:
+            # Os timeslots antes da janela estão livres
+            run, start = lo - start, lo
+        fit, run = self._fit(self._root, lo, hi, start, duration, run)
+        # Depois do fim da janela todos os timeslots estão livres
+        return fit if fit is not None else hi - run
+
+    def reserve(self, start: int, duration: int = 1):
+        """
+        Reserva [start, start + duration), fundindo com reservas sobrepostas ou adjacentes.
+
+        Args:
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+        """
+        if duration <= 0:
+            return
+        if len(self) == 0 and (start < self.base or start + duration > self.base + self.size):
+            # Calendário vazio: a janela é recomeçada na reserva, em vez de crescer até ela
+            self.base, self.size = start, LEAF
+            self._root = _uniform(LEAF, False)
+        self._grow(start, start + duration)
+        self._set(start, start + duration, True)
+
+    def release(self, start: int, duration: int = 1):
+        """
+        Libera [start, start + duration), dividindo reservas que só se sobrepõem em parte.
+
+        Args:
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+        """
+        end = min(start + duration, self.base + self.size)
+        start = max(start, self.base)
+        if start < end:
+            self._set(start, end, False)
+
+    def prune(self, before: int):
+        """
+        Descarta as reservas que terminam até o timeslot `before`.
+
+        Args:
+            before (int): Timeslot limite.
+        """
+        lo, hi = self.base, self.base + self.size
+        before = min(before, hi)
+        if before <= lo:
+            return
+        # Uma reserva que continua depois de `before` é mantida inteira
+        cut = before if self.is_free(before) else self._last_free(self._root, lo, hi, before) + 1
+        if cut > lo:
+            self._set(lo, cut, False)
+            self._shrink()
+
+
+class ReservationCalendar():
+    """
+    Calendário de reservas dos links da rede, com um LinkCalendar por link dirigido (u, v).
+
+    Em consultas sobre vários links, a busca alterna entre os calendários dos links por poucas
+    rodadas. Se as reservas dos links se intercalam e a busca não converge, o calendário passa
+    a guardar a união das reservas dos links da rota (até `max_routes` rotas, descartando a
+    menos usada), ela própria um LinkCalendar atualizado a cada reserva ou liberação de um dos
+    seus links. Assim, a primeira janela livre da rota sai de uma única busca de O(log T) na
+    união, sem alternar entre os links janela a janela.
+
+    Uma consulta custa O(max_rounds * L * log T) para L links, mais O(log T) quando a união já
+    existe. Montar a união custa O(n log T) para n reservas nos links da rota; reservar em um
+    link custa O(log T) por rota em cache que o contém, e liberar, O(L log T) por rota, mais
+    O(log T) por reserva dos links dentro do trecho liberado.
+
+    Args:
+        max_routes (int, optional): Número máximo de rotas com a união em cache.
+        max_rounds (int, optional): Rodadas de alternância entre os links antes de usar a união.
+    """
+    def __init__(self, max_routes: int = 256, max_rounds: int = 4) -> None:
+        self._links = {}
+        self.max_routes = max_routes
+        self.max_rounds = max_rounds
+        self._unions = OrderedDict()
+        self._dependents = {}
+
+    def __contains__(self, link):
+        return link in self._links and len(self._links[link]) > 0
+
+    def link(self, link: tuple) -> LinkCalendar:
+        """
+        Retorna o calendário de um link, criando-o se necessário.
+
+        Args:
+            link (tuple): Link (u, v).
+
+        Returns:
+            LinkCalendar : Calendário do link.
+        """
+        calendar = self._links.get(link)
+        if calendar is None:
+            calendar = self._links[link] = LinkCalendar()
+        return calendar
+
+    def reservations(self) -> dict:
+        """
+        Retorna as reservas de todos os links.
+
+        Returns:
+            dict : Intervalos (início, fim) reservados, indexados pelo link.
+        """
+        return {link: calendar.intervals() for link, calendar in self._links.items() if len(calendar)}
+
+    def is_free(self, links, start: int, duration: int = 1) -> bool:
+        """
+        Verifica se todos os links estão livres em [start, start + duration).
+
+        Args:
+            links (iterable): Links (u, v).
+            start (int): Primeiro timeslot.
+            duration (int): Número de timeslots.
+
+        Returns:
+            bool : True se todos os links estiverem livres.
+        """
+        calendars = self._links
+        for link in links:
+            calendar = calendars.get(link)
+            if calendar is not None and not calendar.is_free(start, duration):
+                return False
+        return True
+
+    def _union(self, key: tuple) -> LinkCalendar:
+        """
+        Retorna a união das reservas dos links de uma rota, montando-a na primeira consulta.
+        """
+        union = self._unions.get(key)
+        if union is not None:
+            self._unions.move_to_end(key)
+            return union
+        intervals = []
+        for start, end in heapq.merge(*(self._links[link].intervals() for link in key if link in self._links)):
+            if intervals and start <= intervals[-1][1]:
+                if end > intervals[-1][1]:
+                    intervals[-1] = (intervals[-1][0], end)
+            else:
+                intervals.append((start, end))
+        union = LinkCalendar(intervals)
+        for link in key:
+            self._dependents.setdefault(link, set()).add(key)
+        self._unions[key] = union
+        if len(self._unions) > self.max_routes:
+            self._drop_union(next(iter(self._unions)))
+        return union
+
+    def _drop_union(self, key: tuple):
+        del self._unions[key]
+        for link in key:
+            keys = self._dependents.get(link)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[link]
+
+    def _refresh(self, keys, start: int, end: int, released=()):
+        """
+        Recalcula o trecho [start, end) das uniões após uma liberação: o trecho é liberado e as
+        reservas que os links ainda têm nele são refeitas. Os links em `released` acabaram de
+        ser liberados no trecho inteiro e não precisam ser consultados.
+        """
+        for key in keys:
+            union = self._unions[key]
+            union.release(start, end - start)
+            for link in key:
+                calendar = self._links.get(link)
+                if calendar is not None and link not in released:
+                    for first, last in calendar.intervals(start, end):
+                        union.reserve(first, last - first)
+
+    def earliest_fit(self, links, start: int, duration: int = 1) -> int:
+        """
+        Retorna o primeiro timeslot t >= start em que todos os links ficam livres por `duration` timeslots.
+
+        Com um único link reservado a busca é feita no calendário dele. Com mais de um, cada link
+        avança t até a sua próxima janela livre, por no máximo `max_rounds` rodadas; se t ainda
+        não estiver livre em todos, a busca continua na união das reservas da rota (ver a
+        descrição da classe). O custo é O(max_rounds * L * log T), mais O(log T) na união.
+
+        Args:
+            links (iterable): Links (u, v).
+            start (int): Timeslot a partir do qual procurar.
+            duration (int): Número de timeslots consecutivos necessários.
+
+        Returns:
+            int : Primeiro timeslot em que a rota inteira está livre.
+        """
+        key = tuple(dict.fromkeys(links))
+        calendars = [self._links[link] for link in key if link in self._links]
+        if not calendars:
+            return start
+        if len(calendars) == 1:
+            return calendars[0].earliest_fit(start, duration)
+        union = self._unions.get(key)
+        if union is None:
+            t = start
+            for _ in range(self.max_rounds):
+                moved = False
+                for calendar in calendars:
+                    fit = calendar.earliest_fit(t, duration)
+                    if fit != t:
+                        t = fit
+                        moved = True
+                if not moved:
+                    return t
+            # Reservas intercaladas entre os links: a união evita avançar janela a janela
+            start = t
+            union = self._union(key)
+        else:
+            self._unions.move_to_end(key)
+        return union.earliest_fit(start, duration)
+
+    def reserve(self, links, start: int, duration: int = 1):
+        """
+        Reserva [start, start + duration) em todos os links.
+        """
+        keys = set()
+        for link in links:
+            self.link(link).reserve(start, duration)
+            keys.update(self._dependents.get(link, ()))
+        for key in keys:
+            self._unions[key].reserve(start, duration)
+
+    def release(self, links, start: int = None, duration: int = 1):
+        """
+        Libera [start, start + duration) nos links. Sem `start`, libera todas as reservas dos links.
+        """
+        keys = set()
+        links = set(links)
+        for link in links:
+            calendar = self._links.get(link)
+            if calendar is None:
+                continue
+            keys.update(self._dependents.get(link, ()))
+            if start is None:
+                del self._links[link]
+            else:
+                calendar.release(start, duration)
+        if start is None:
+            # As uniões afetadas são montadas de novo na próxima consulta
+            for key in keys:
+                self._drop_union(key)
+        else:
+            self._refresh(keys, start, start + duration, links)
+
+    def prune(self, before: int):
+        """
+        Descarta as reservas que terminam até o timeslot `before` em todos os links.
+        """
+        for calendar in self._links.values():
+            calendar.prune(before)
+        self._refresh(list(self._unions), 0, before)
+
+    def clear(self):
+        self._links = {}
+        self._unions = OrderedDict()
+        self._dependents = {}
+
+
+class ScheduledRequest():
+    """
+    Registro de agendamento de uma requisição.
+
+    Guarda a rota calculada no momento do agendamento, junto com os conjuntos de links e de nós
+    usados nas verificações de conflito, para que a rota não precise ser recalculada ao
+    compartilhar o timeslot nem ao executar a requisição.
+    """
+    __slots__ = ('request', 'route', 'links', 'nodes', 'timeslot', 'duration')
+
+    def __init__(self, request: dict, route: list, timeslot: int = None, duration: int = 1) -> None:
+        self.request = request
+        self.route = route
+        self.links = [(route[i], route[i + 1]) for i in range(len(route) - 1)]
+        self.nodes = frozenset(route[:-1])
+        self.timeslot = timeslot
+        self.duration = duration
+
+    def __repr__(self):
+        return f'ScheduledRequest(route={self.route}, timeslot={self.timeslot})'
+
+
+def partition_disjoint(resource_sets) -> list:
+    """
+    Agrupa itens que compartilham recursos (canais, hosts) em componentes conexos.
+
+    Dois itens ficam no mesmo grupo se tiverem algum recurso em comum, direta ou
+    transitivamente. Itens de grupos diferentes não disputam nenhum recurso e podem ser
+    executados de forma independente. Os grupos são ordenados pelo primeiro item e, dentro de
+    cada grupo, os itens mantêm a ordem original, de modo que o resultado é determinístico.
+
+    Args:
+        resource_sets (list): Conjunto de recursos de cada item.
+
+    Returns:
+        list : Lista de grupos, cada um com os índices dos itens.
+    """
+    parent = list(range(len(resource_sets)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, resources in enumerate(resource_sets):
+        for resource in resources:
+            j = owner.setdefault(resource, i)
+            if j != i:
+                a, b = find(i), find(j)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    groups = {}
+    for i in range(len(resource_sets)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
@@ -0,0 +1,139 @@
+from collections.abc import Mapping
+import numpy as np
+import networkx as nx
+
+NO_ROUTE = -9999
+
+
+class RoutingTable():
+    """
+    Tabelas de roteamento de todos os hosts em uma única matriz de predecessores int32.
+
+    A linha i da matriz guarda, para cada destino, o nó anterior no caminho mais curto (em
+    saltos) a partir do nó i, calculado por scipy.sparse.csgraph.shortest_path em blocos de
+    origens. Cada bloco é escrito direto na matriz pré-alocada, de modo que as matrizes
+    temporárias de distâncias e predecessores nunca passam de `chunk_entries` elementos, e o
+    pico de memória fica em 4 bytes por par de nós mais um bloco. Os caminhos são
+    reconstruídos sob demanda. Entre caminhos mais curtos empatados, a busca pode escolher um
+    caminho diferente do escolhido por nx.shortest_path.
+
+    Args:
+        graph (nx.Graph): Grafo da rede.
+        chunk_entries (int, optional): Número máximo de elementos das matrizes de cada bloco.
+    """
+    def __init__(self, graph, chunk_entries: int = 1 << 18) -> None:
+        from scipy.sparse.csgraph import shortest_path
+
+        self.nodes = list(graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+        adjacency = nx.to_scipy_sparse_array(graph, nodelist=self.nodes, weight=None, format='csr')
+        self.predecessors = np.empty((n, n), dtype=np.int32)
+        rows = max(1, chunk_entries // max(n, 1))
+        for first in range(0, n, rows):
+            last = min(first + rows, n)
+            _, predecessors = shortest_path(adjacency, unweighted=True, directed=False,
+                                            return_predecessors=True, indices=np.arange(first, last))
+            self.predecessors[first:last] = predecessors.astype(np.int32, copy=False)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _path_indices(self, i: int, j: int) -> list:
+        if i == j:
+            return [i]
+        row = self.predecessors[i]
+        if row[j] == NO_ROUTE:
+            return None
+        path = [j]
+        while j != i:
+            j = int(row[j])
+            path.append(j)
+        path.reverse()
+        return path
+
+    def path(self, source, destination) -> list:
+        """
+        Reconstrói o caminho mais curto entre dois nós.
+
+        Args:
+            source (int): Nó de origem.
+            destination (int): Nó de destino.
+
+        Returns:
+            list : Nós do caminho, ou None se não houver caminho.
+        """
+        try:
+            i, j = self.index[source], self.index[destination]
+        except KeyError:
+            return None
+        path = self._path_indices(i, j)
+        if path is None:
+            return None
+        nodes = self.nodes
+        return [nodes[k] for k in path]
+
+    def next_hop(self, source, destination):
+        """
+        Retorna o próximo nó no caminho mais curto de `source` até `destination`.
+
+        Args:
+            source (int): Nó de origem.
+            destination (int): Nó de destino.
+
+        Returns:
+            int : Próximo nó, o próprio nó se origem e destino coincidirem, ou None se não houver caminho.
+        """
+        path = self.path(source, destination)
+        if path is None:
+            return None
+        return path[1] if len(path) > 1 else path[0]
+
+    def view(self, source) -> 'RouteView':
+        """
+        Retorna a tabela de roteamento de um host.
+
+        Args:
+            source (int): Host de origem.
+
+        Returns:
+            RouteView : Mapeamento {destino: caminho} reconstruído sob demanda.
+        """
+        return RouteView(self, source)
+
+
+class RouteView(Mapping):
+    """
+    Tabela de roteamento de um host: um mapeamento {destino: caminho} somente leitura,
+    compatível com o dicionário de caminhos devolvido por nx.shortest_path, mas sem guardar
+    os caminhos.
+    """
+    __slots__ = ('_table', '_source', '_row')
+
+    def __init__(self, table: RoutingTable, source) -> None:
+        self._table = table
+        self._source = source
+        self._row = table.index[source]
+
+    def __getitem__(self, destination) -> list:
+        path = self._table.path(self._source, destination)
+        if path is None:
+            raise KeyError(destination)
+        return path
+
+    def __contains__(self, destination):
+        j = self._table.index.get(destination)
+        return j is not None and (j == self._row or self._table.predecessors[self._row, j] != NO_ROUTE)
+
+    def __iter__(self):
+        row = self._table.predecessors[self._row]
+        nodes = self._table.nodes
+        for j in range(len(nodes)):
+            if j == self._row or row[j] != NO_ROUTE:
+                yield nodes[j]
+
+    def __len__(self):
+        return int(np.count_nonzero(self._table.predecessors[self._row] != NO_ROUTE)) + 1
+
+    def __repr__(self):
+        return f'RouteView(source={self._source}, destinations={len(self)})'
@@ -0,0 +1,140 @@
+from collections import deque
+
+
+def estimate_epr_cost(request) -> int:
+    """
+    Estima quantos pares EPR uma requisição consome: um par por qubit em cada salto da rota,
+    em cada sentido do teletransporte (o AC_BQC devolve os qubits ao cliente).
+
+    Args:
+        request (dict): Requisição, com `num_qubits`, `protocol` e, se houver, `slice_path`.
+
+    Returns:
+        int : Número estimado de pares EPR.
+    """
+    path = request.get('slice_path')
+    if isinstance(path, dict):
+        path = path.get('path')
+    hops = len(path) - 1 if path else 1
+    passes = 2 if request.get('protocol') == 'AC_BQC' else 1
+    return max(request['num_qubits'] * hops * passes, 1)
+
+
+class SliceScheduler():
+    """
+    Escalonador de slices por deficit round robin (DRR) ponderado pelo orçamento de EPRs.
+
+    Os slices são indexados por (cliente, protocolo), de modo que encontrar o slice de uma
+    requisição custa O(1). Cada slice tem uma fila própria. A cada timeslot, cada slice com
+    requisições recebe seu orçamento de EPRs como crédito (déficit) e envia requisições
+    enquanto o custo estimado da próxima couber no crédito. Um slice com circuitos grandes
+    não monopoliza o servidor: ele precisa acumular crédito por vários timeslots, enquanto
+    os outros slices continuam sendo atendidos na proporção dos seus orçamentos.
+
+    Args:
+        slices (dict): Slices no formato de `Controller.slices` ({slice_id: {'client', 'server', 'path', 'protocol'}}).
+        budgets (dict, optional): Orçamento de EPRs por timeslot de cada slice. Slices sem orçamento recebem o maior custo entre as requisições enfileiradas, o que equivale a um round robin por EPRs.
+        cost (callable, optional): Função `cost(request) -> int`. Padrão: `estimate_epr_cost`.
+    """
+    def __init__(self, slices: dict, budgets: dict = None, cost=None) -> None:
+        self.slices = slices
+        self.budgets = dict(budgets or {})
+        for slice_id, budget in self.budgets.items():
+            if budget <= 0:
+                raise ValueError(f"Orçamento de EPRs inválido para o slice {slice_id}: {budget}")
+        self.cost = cost or estimate_epr_cost
+        self._index = {}
+        for slice_id, slice_data in slices.items():
+            # O primeiro slice de cada (cliente, protocolo) prevalece, como na busca linear
+            self._index.setdefault((slice_data['client'], slice_data['protocol']), slice_id)
+        self.queues = {slice_id: deque() for slice_id in slices}
+        self.deficits = {slice_id: 0 for slice_id in slices}
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def slice_of(self, request) -> str:
+        """
+        Retorna o slice de uma requisição, indexado por (cliente, protocolo).
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            str : ID do slice, ou None se nenhum slice corresponder.
+        """
+        return self._index.get((request['alice_id'], request.get('protocol')))
+
+    def assign(self, request) -> str:
+        """
+        Vincula a requisição ao caminho do seu slice.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            str : ID do slice.
+
+        Raises:
+            ValueError: Se a requisição não tiver protocolo ou não corresponder a um slice.
+        """
+        if not request.get('protocol'):
+            raise ValueError(f"Requisição sem protocolo: {request}")
+        slice_id = self.slice_of(request)
+        if slice_id is None:
+            raise ValueError(f"Nenhum slice encontrado para a requisição: {request}")
+        request['slice_path'] = self.slices[slice_id]['path']
+        return slice_id
+
+    def enqueue(self, request) -> str:
+        """
+        Vincula a requisição ao seu slice e a coloca na fila do slice.
+
+        Args:
+            request (dict): Requisição.
+
+        Returns:
+            str : ID do slice.
+        """
+        slice_id = self.assign(request)
+        self.queues[slice_id].append((self.cost(request), request))
+        return slice_id
+
+    def schedule(self, start_timeslot: int = 1) -> dict:
+        """
+        Distribui as requisições enfileiradas em timeslots por deficit round robin.
+
+        Timeslots em que nenhum slice tem crédito suficiente não são gerados; o crédito continua
+        acumulando até o próximo timeslot com envios.
+
+        Args:
+            start_timeslot (int): Primeiro timeslot.
+
+        Returns:
+            dict : Requisições agendadas por timeslot.
+        """
+        queues, deficits = self.queues, self.deficits
+        default = max((cost for queue in queues.values() for cost, _ in queue), default=1)
+        quantum = {slice_id: self.budgets.get(slice_id, default) for slice_id in queues}
+
+        scheduled = {}
+        timeslot = start_timeslot
+        active = deque(slice_id for slice_id, queue in queues.items() if queue)
+        while active:
+            batch = []
+            for _ in range(len(active)):
+                slice_id = active.popleft()
+                queue = queues[slice_id]
+                deficits[slice_id] += quantum[slice_id]
+                while queue and queue[0][0] <= deficits[slice_id]:
+                    cost, request = queue.popleft()
+                    deficits[slice_id] -= cost
+                    batch.append(request)
+                if queue:
+                    active.append(slice_id)
+                else:
+                    deficits[slice_id] = 0
+            if batch:
+                scheduled[timeslot] = batch
+                timeslot += 1
+        return scheduled
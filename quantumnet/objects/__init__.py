@@ -1,3 +1,10 @@
 from .logger import Logger
 from .qubit import Qubit
-from .epr import Epr
\ No newline at end of file
+from .epr import Epr
+from .fidelity_store import FidelityStore, TrackedList
+from .epr_pool import EprPool, FillEpoch
+from .virtual_links import VirtualLinkStore
+from .ids import IdAllocator
+from .trace import Trace
+from .circuit import CircuitSpec, random_circuit
+from .histogram import LatencyHistogram
@@ -0,0 +1,131 @@
+import random
+
+SINGLE_QUBIT_GATES = ['h', 'x', 'y', 'z', 's', 't']
+TWO_QUBIT_GATES = ['cx', 'cz', 'swap']
+
+
+class CircuitSpec():
+    """
+    Descrição leve de um circuito quântico: lista de portas, profundidade e contagem de operações.
+
+    Não depende do qiskit nem do matplotlib. Expõe `data`, `depth()`, `count_ops()` e `size()`
+    com a mesma semântica do QuantumCircuit para os usos do simulador (ordenação de requisições,
+    profundidade do circuito). O circuito do qiskit só é construído quando `to_qiskit()` ou
+    `draw()` são chamados.
+    """
+    __slots__ = ('num_qubits', 'gates', '_layers', '_depth', '_counts')
+
+    def __init__(self, num_qubits: int) -> None:
+        self.num_qubits = num_qubits
+        self.gates = []
+        self._layers = [0] * num_qubits
+        self._depth = 0
+        self._counts = {}
+
+    def __len__(self):
+        return len(self.gates)
+
+    def __repr__(self):
+        return f'CircuitSpec(num_qubits={self.num_qubits}, size={len(self.gates)}, depth={self._depth})'
+
+    def append(self, name: str, qubits: tuple):
+        """
+        Adiciona uma porta ao circuito, atualizando a profundidade de forma incremental.
+
+        Args:
+            name (str): Nome da porta (ex: 'h', 'cx').
+            qubits (tuple): Índices dos qubits em que a porta atua.
+        """
+        self.gates.append((name, qubits))
+        layers = self._layers
+        layer = max(layers[q] for q in qubits) + 1
+        for q in qubits:
+            layers[q] = layer
+        if layer > self._depth:
+            self._depth = layer
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    @property
+    def data(self) -> list:
+        """
+        Lista de portas no formato (nome, qubits).
+
+        Returns:
+            list : Portas do circuito.
+        """
+        return self.gates
+
+    def depth(self) -> int:
+        return self._depth
+
+    def size(self) -> int:
+        return len(self.gates)
+
+    def count_ops(self) -> dict:
+        return dict(self._counts)
+
+    def instructions(self) -> list:
+        """
+        Retorna as instruções no mesmo formato de `Network.save_circuit_instructions`.
+
+        Returns:
+            list : Lista de dicionários com 'operation' e 'qubits'.
+        """
+        return [{'operation': name, 'qubits': list(qubits)} for name, qubits in self.gates]
+
+    def to_qiskit(self):
+        """
+        Constrói o QuantumCircuit correspondente.
+
+        Returns:
+            QuantumCircuit : Circuito do qiskit.
+        """
+        from qiskit import QuantumCircuit
+        qc = QuantumCircuit(self.num_qubits)
+        for name, qubits in self.gates:
+            getattr(qc, name)(*qubits)
+        return qc
+
+    def draw(self, output: str = 'mpl', **kwargs):
+        """
+        Desenha o circuito usando o qiskit.
+
+        Args:
+            output (str): Formato de saída aceito por QuantumCircuit.draw.
+
+        Returns:
+            A figura ou texto gerado pelo qiskit.
+        """
+        return self.to_qiskit().draw(output, **kwargs)
+
+
+def random_circuit(num_qubits: int, num_gates: int, rng=random) -> CircuitSpec:
+    """
+    Gera um circuito aleatório de portas de um e dois qubits.
+
+    Consome os números aleatórios na mesma ordem de `Network.generate_random_circuit`, de modo
+    que a mesma semente produz o mesmo circuito.
+
+    Args:
+        num_qubits (int): Número de qubits no circuito.
+        num_gates (int): Número de portas no circuito.
+        rng (random.Random): Gerador de números aleatórios.
+
+    Returns:
+        CircuitSpec : O circuito gerado.
+    """
+    spec = CircuitSpec(num_qubits)
+    for _ in range(num_gates):
+        gate_type = rng.choice(['single', 'two'])
+        if gate_type == 'single':
+            gate = rng.choice(SINGLE_QUBIT_GATES)
+            qubit = rng.randint(0, num_qubits - 1)
+            spec.append(gate, (qubit,))
+        else:
+            gate = rng.choice(TWO_QUBIT_GATES)
+            qubit1 = rng.randint(0, num_qubits - 1)
+            qubit2 = rng.randint(0, num_qubits - 1)
+            while qubit1 == qubit2:
+                qubit2 = rng.randint(0, num_qubits - 1)
+            spec.append(gate, (qubit1, qubit2))
+    return spec
@@ -1,10 +1,27 @@
 import random
 class Epr():
+    __slots__ = ('_epr_id', '_initial_fidelity', '_current_fidelity', '_store', '_slot')
+
     def __init__(self,  epr_id: int, initial_fidelity: float = None) -> None:
+        self._store = None
+        self._slot = -1
         self._epr_id = epr_id
         self._initial_fidelity = initial_fidelity  if initial_fidelity is not None else random.uniform(0, 1)
         self._current_fidelity = initial_fidelity  if initial_fidelity is not None else random.uniform(0, 1)
     
+    def __del__(self):
+        if self._store is not None:
+            self._store.release(self._slot)
+
+    def __getstate__(self):
+        # A cópia (por exemplo, enviada entre processos) leva a fidelidade atual, sem o armazenamento
+        return (self._epr_id, self._initial_fidelity, self.get_current_fidelity())
+
+    def __setstate__(self, state):
+        self._store = None
+        self._slot = -1
+        self._epr_id, self._initial_fidelity, self._current_fidelity = state
+
     @property
     def epr_id(self):
         return self._epr_id
@@ -13,8 +30,13 @@ class Epr():
         return self._initial_fidelity
     
     def get_current_fidelity(self):
+        if self._store is not None:
+            return self._store.get(self._slot)
         return self._current_fidelity
     
     def set_fidelity(self, new_fidelity: float):
         """Define a nova fidelidade do par EPR."""
-        self._current_fidelity = new_fidelity
\ No newline at end of file
+        if self._store is not None:
+            self._store.set(self._slot, new_fidelity)
+        else:
+            self._current_fidelity = new_fidelity
\ No newline at end of file
@@ -0,0 +1,273 @@
+import numpy as np
+from .fidelity_store import FidelityStore
+
+
+class FillEpoch():
+    """
+    Contador compartilhado pelos pools de uma rede, incrementado sempre que algum pool deixa
+    de estar vazio.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+
+class EprPool():
+    """
+    Conjunto de pares EPR de um canal, organizado como um buffer circular.
+
+    Inserções e remoções nas duas extremidades são O(1). Em paralelo aos pares, o pool mantém
+    o vetor com os slots de cada par no armazenamento de fidelidades da rede, o que permite
+    ler todas as fidelidades do canal com uma única operação vetorizada.
+
+    O atributo `version` é incrementado sempre que o pool passa de vazio para não vazio ou
+    vice-versa, e o `epoch` compartilhado (se houver) sempre que ele deixa de estar vazio. Isso
+    permite validar rotas guardadas em cache sem inspecionar os pares. Já `revision` muda a
+    cada inserção ou remoção, e `writes` a cada fidelidade escrita em um par do pool, para
+    caches que dependem do conteúdo do pool.
+    """
+    __slots__ = ('_items', '_slots', '_head', '_size', '_store', 'version', 'revision', 'writes', '_epoch')
+
+    def __init__(self, eprs=(), store: FidelityStore = None, capacity: int = 8, epoch: FillEpoch = None) -> None:
+        self._items = [None] * capacity
+        self._slots = np.full(capacity, -1, dtype=np.int64)
+        self._head = 0
+        self._size = 0
+        self._store = store
+        self.version = 0
+        self.revision = 0
+        self.writes = 0
+        self._epoch = epoch
+        for epr in eprs:
+            self.append(epr)
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        capacity = len(self._items)
+        for i in range(self._size):
+            yield self._items[(self._head + i) % capacity]
+
+    def __contains__(self, epr):
+        return any(item is epr for item in self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        return self._items[self._position(index)]
+
+    def __repr__(self):
+        return f'EprPool({list(self)})'
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('Índice fora do pool de EPRs.')
+        return (self._head + index) % len(self._items)
+
+    def _grow(self):
+        """
+        Dobra a capacidade do buffer, reorganizando os pares a partir da posição zero.
+        """
+        capacity = len(self._items)
+        order = [(self._head + i) % capacity for i in range(self._size)]
+        items = [self._items[i] for i in order]
+        slots = self._slots[order]
+        self._items = items + [None] * (2 * capacity - self._size)
+        self._slots = np.full(2 * capacity, -1, dtype=np.int64)
+        self._slots[:self._size] = slots
+        self._head = 0
+
+    def _attach(self, epr, position: int):
+        self.revision += 1
+        if self._store is not None:
+            self._store.attach(epr, owner=self)
+            self._slots[position] = epr._slot
+
+    def _detach(self, epr):
+        self.revision += 1
+        if self._store is not None:
+            self._store.detach(epr)
+
+    def _filled(self):
+        self.version += 1
+        if self._epoch is not None:
+            self._epoch.value += 1
+
+    def append(self, epr):
+        """
+        Adiciona um par EPR ao final do pool.
+
+        Args:
+            epr (Epr): Par EPR.
+        """
+        if self._size == len(self._items):
+            self._grow()
+        if self._size == 0:
+            self._filled()
+        position = (self._head + self._size) % len(self._items)
+        self._items[position] = epr
+        self._size += 1
+        self._attach(epr, position)
+
+    def appendleft(self, epr):
+        """
+        Adiciona um par EPR ao início do pool.
+
+        Args:
+            epr (Epr): Par EPR.
+        """
+        if self._size == len(self._items):
+            self._grow()
+        if self._size == 0:
+            self._filled()
+        self._head = (self._head - 1) % len(self._items)
+        self._items[self._head] = epr
+        self._size += 1
+        self._attach(epr, self._head)
+
+    def extend(self, eprs):
+        for epr in eprs:
+            self.append(epr)
+
+    def pop(self, index: int = -1):
+        """
+        Remove e retorna um par EPR. As extremidades (0 e -1) são O(1).
+
+        Args:
+            index (int): Posição do par EPR.
+
+        Returns:
+            Epr : Par EPR removido.
+        """
+        if self._size == 0:
+            raise IndexError('Não há pares EPR no pool.')
+        if index == 0 or index == -self._size:
+            return self.popleft()
+        position = self._position(index)
+        epr = self._items[position]
+        capacity = len(self._items)
+        # Desloca para a esquerda os pares posteriores ao removido
+        last = self._position(-1)
+        while position != last:
+            following = (position + 1) % capacity
+            self._items[position] = self._items[following]
+            self._slots[position] = self._slots[following]
+            position = following
+        self._items[last] = None
+        self._size -= 1
+        if self._size == 0:
+            self.version += 1
+        self._detach(epr)
+        return epr
+
+    def popleft(self):
+        """
+        Remove e retorna o primeiro par EPR do pool.
+
+        Returns:
+            Epr : Par EPR removido.
+        """
+        if self._size == 0:
+            raise IndexError('Não há pares EPR no pool.')
+        epr = self._items[self._head]
+        self._items[self._head] = None
+        self._head = (self._head + 1) % len(self._items)
+        self._size -= 1
+        if self._size == 0:
+            self.version += 1
+        self._detach(epr)
+        return epr
+
+    def remove(self, epr):
+        """
+        Remove um par EPR específico do pool.
+
+        Args:
+            epr (Epr): Par EPR a ser removido.
+
+        Raises:
+            ValueError: Se o par EPR não estiver no pool.
+        """
+        for i, item in enumerate(self):
+            if item is epr:
+                self.pop(i)
+                return
+        raise ValueError('Par EPR não encontrado no pool.')
+
+    def take(self, k: int) -> list:
+        """
+        Remove e retorna os k primeiros pares EPR do pool.
+
+        Args:
+            k (int): Número de pares EPR.
+
+        Returns:
+            list : Pares EPR removidos, do mais antigo ao mais novo.
+        """
+        k = min(k, self._size)
+        capacity = len(self._items)
+        positions = [(self._head + i) % capacity for i in range(k)]
+        eprs = [self._items[p] for p in positions]
+        self.revision += 1
+        if self._store is not None:
+            self._store.detach_many(self._slots[positions])
+        for p in positions:
+            self._items[p] = None
+        self._head = (self._head + k) % capacity
+        if k and self._size == k:
+            self.version += 1
+        self._size -= k
+        return eprs
+
+    def clear(self):
+        """
+        Remove todos os pares EPR do pool.
+
+        Custa O(size): só as posições ocupadas do buffer são limpas (e desanexadas do
+        armazenamento de fidelidades), sem realocar o buffer; um pool vazio é limpo em O(1).
+        """
+        if self._size:
+            if self._store is not None:
+                self._store.detach_many(self.slots())
+            capacity = len(self._items)
+            end = self._head + self._size
+            if end <= capacity:
+                self._items[self._head:end] = [None] * self._size
+            else:
+                self._items[self._head:] = [None] * (capacity - self._head)
+                self._items[:end - capacity] = [None] * (end - capacity)
+            self.version += 1
+            self.revision += 1
+        self._head = 0
+        self._size = 0
+
+    def slots(self) -> np.ndarray:
+        """
+        Retorna os slots dos pares EPR no armazenamento de fidelidades, na ordem do pool.
+
+        Returns:
+            np.ndarray : Vetor de slots.
+        """
+        capacity = len(self._slots)
+        end = self._head + self._size
+        if end <= capacity:
+            return self._slots[self._head:end]
+        return np.concatenate([self._slots[self._head:], self._slots[:end - capacity]])
+
+    def fidelities(self) -> np.ndarray:
+        """
+        Retorna as fidelidades atuais de todos os pares EPR do pool.
+
+        Returns:
+            np.ndarray : Vetor de fidelidades, na ordem do pool.
+        """
+        if self._store is None:
+            return np.array([epr.get_current_fidelity() for epr in self], dtype=np.float64)
+        return self._store.get_many(self.slots())
@@ -0,0 +1,348 @@
+import math
+import numpy as np
+
+
+class FidelityStore():
+    """
+    Armazenamento vetorizado (struct-of-arrays) das fidelidades de qubits e pares EPR.
+
+    Cada objeto recebe um índice (slot) na primeira vez que entra em uma memória de host
+    ou em um canal da rede, e o mantém durante toda a sua vida. Enquanto estiver anexado
+    a pelo menos um contêiner, o slot é considerado vivo e sofre decoerência.
+
+    No modo preguiçoso (lazy), avançar o tempo não altera os vetores: cada slot guarda a
+    fidelidade base f0 e o timeslot t0 em que ela foi definida, e a fidelidade atual é
+    calculada na leitura como f0 * (1 - d) ** (agora - t0).
+
+    A decoerência aplicada fica acumulada em `log_retention()`, o logaritmo da fração da
+    fidelidade retida por um slot vivo desde o início, com o fator efetivamente usado em cada
+    timeslot. A diferença entre duas leituras dá a decoerência sofrida entre elas por qualquer
+    slot vivo no intervalo.
+
+    Um slot pode ter um pool dono (ver `EprPool`), cujo contador `writes` é incrementado a cada
+    escrita de fidelidade no slot, o que permite a caches por pool ignorar escritas em outros pools.
+    """
+    def __init__(self, capacity: int = 1024, lazy: bool = False, decoherence_factor: float = 0.01) -> None:
+        self._fidelity = np.zeros(capacity, dtype=np.float64)
+        self._refs = np.zeros(capacity, dtype=np.int32)
+        self._since = np.zeros(capacity, dtype=np.int64)
+        self._stamp = np.zeros(capacity, dtype=np.int64)
+        self._owners = [None] * capacity
+        self._size = 0
+        self._free = []
+        self.now = 0
+        self.lazy = lazy
+        self.decoherence_factor = decoherence_factor
+        self.generation = 0  # Incrementado a cada escrita de fidelidade ou decoerência aplicada
+        self._log_retention = 0.0  # Decoerência acumulada até o timeslot _log_now
+        self._log_now = 0
+
+    def __len__(self):
+        return self._size - len(self._free)
+
+    def _grow(self):
+        """
+        Dobra a capacidade dos vetores internos.
+        """
+        extra = len(self._fidelity)
+        self._fidelity = np.concatenate([self._fidelity, np.zeros(extra, dtype=np.float64)])
+        self._refs = np.concatenate([self._refs, np.zeros(extra, dtype=np.int32)])
+        self._since = np.concatenate([self._since, np.zeros(extra, dtype=np.int64)])
+        self._stamp = np.concatenate([self._stamp, np.zeros(extra, dtype=np.int64)])
+        self._owners.extend([None] * extra)
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._size == len(self._fidelity):
+            self._grow()
+        slot = self._size
+        self._size += 1
+        return slot
+
+    def attach(self, obj, since: int = -1, owner=None):
+        """
+        Anexa um qubit ou par EPR ao armazenamento, passando a aplicar decoerência sobre ele.
+
+        Args:
+            obj (Qubit | Epr): Objeto a ser anexado.
+            since (int): Timeslot de criação. A decoerência só é aplicada em timeslots posteriores.
+            owner (EprPool, optional): Pool dono do slot, avisado das escritas de fidelidade.
+        """
+        if obj._store is not self:
+            value = obj.get_current_fidelity()
+            if obj._store is not None:
+                obj._store.release(obj._slot)
+            slot = self._allocate()
+            self._fidelity[slot] = value
+            self._refs[slot] = 0
+            obj._store = self
+            obj._slot = slot
+        slot = obj._slot
+        if self._refs[slot] == 0:
+            self._since[slot] = since
+            self._stamp[slot] = self.now
+        self._refs[slot] += 1
+        if owner is not None:
+            self._owners[slot] = owner
+
+    def detach(self, obj):
+        """
+        Desanexa um objeto de um contêiner. A fidelidade é congelada quando não há mais contêineres.
+
+        Args:
+            obj (Qubit | Epr): Objeto a ser desanexado.
+        """
+        slot = obj._slot
+        if obj._store is self and self._refs[slot] > 0:
+            if self._refs[slot] == 1:
+                if self.lazy:
+                    self._fidelity[slot] = self.get(slot)
+                    self._stamp[slot] = self.now
+                self._owners[slot] = None
+            self._refs[slot] -= 1
+
+    def release(self, slot: int):
+        """
+        Libera um slot para reutilização. Chamado quando o objeto deixa de existir.
+
+        Args:
+            slot (int): Slot a ser liberado.
+        """
+        self._refs[slot] = 0
+        self._owners[slot] = None
+        self._free.append(slot)
+
+    def log_retention(self) -> float:
+        """
+        Retorna o logaritmo natural da fração da fidelidade retida, desde o início, por um slot
+        sempre vivo, somando a decoerência de cada `decay` com o seu fator e, no modo preguiçoso,
+        a dos timeslots avançados desde então com `decoherence_factor`.
+
+        Returns:
+            float : Soma de log(1 - d) sobre os timeslots de decoerência aplicados (-inf se d = 1).
+        """
+        value = self._log_retention
+        if self.lazy and self.now > self._log_now:
+            value += (self.now - self._log_now) * _log_keep(self.decoherence_factor)
+        return value
+
+    def get(self, slot: int) -> float:
+        value = float(self._fidelity[slot])
+        if self.lazy and self._refs[slot] > 0:
+            elapsed = self.now - int(max(self._stamp[slot], self._since[slot]))
+            if elapsed > 0:
+                value *= (1 - self.decoherence_factor) ** elapsed
+        return value
+
+    def set(self, slot: int, value: float):
+        self._fidelity[slot] = value
+        self._stamp[slot] = self.now
+        self.generation += 1
+        owner = self._owners[slot]
+        if owner is not None:
+            owner.writes += 1
+
+    def get_many(self, slots: np.ndarray) -> np.ndarray:
+        """
+        Retorna as fidelidades atuais de vários slots de uma só vez.
+
+        Args:
+            slots (np.ndarray): Índices dos slots.
+
+        Returns:
+            np.ndarray : Fidelidades na mesma ordem dos slots.
+        """
+        values = self._fidelity[slots]
+        if self.lazy:
+            elapsed = self.now - np.maximum(self._stamp[slots], self._since[slots])
+            elapsed = np.where((self._refs[slots] > 0) & (elapsed > 0), elapsed, 0)
+            values = values * (1 - self.decoherence_factor) ** elapsed
+        return values
+
+    def detach_many(self, slots: np.ndarray):
+        """
+        Desanexa vários slots de uma só vez, como no esvaziamento de um canal.
+
+        Args:
+            slots (np.ndarray): Índices dos slots.
+        """
+        if len(slots) == 0:
+            return
+        ending = slots[self._refs[slots] == 1]
+        if self.lazy:
+            self._fidelity[ending] = self.get_many(ending)
+            self._stamp[ending] = self.now
+        owners = self._owners
+        for slot in ending.tolist():
+            owners[slot] = None
+        np.subtract.at(self._refs, slots, 1)
+        np.maximum(self._refs, 0, out=self._refs)
+
+    def _materialize(self):
+        """
+        Incorpora aos valores base a decoerência acumulada no modo preguiçoso.
+        """
+        self._log_retention = self.log_retention()
+        self._log_now = self.now
+        n = self._size
+        elapsed = self.now - np.maximum(self._stamp[:n], self._since[:n])
+        elapsed = np.where((self._refs[:n] > 0) & (elapsed > 0), elapsed, 0)
+        self._fidelity[:n] *= (1 - self.decoherence_factor) ** elapsed
+        self._stamp[:n] = self.now
+
+    def set_lazy(self, lazy: bool):
+        """
+        Alterna entre a decoerência imediata (vetorizada a cada timeslot) e a preguiçosa (na leitura).
+
+        Args:
+            lazy (bool): True para calcular a decoerência apenas na leitura.
+        """
+        if self.lazy and not lazy:
+            self._materialize()
+        elif lazy and not self.lazy:
+            self._stamp[:self._size] = self.now
+            self._log_now = self.now
+        self.lazy = lazy
+
+    def live_count(self) -> int:
+        """
+        Retorna o número de objetos que estão sofrendo decoerência.
+
+        Returns:
+            int : Número de slots vivos.
+        """
+        return int(np.count_nonzero(self._refs[:self._size]))
+
+    def decay(self, decoherence_factor: float, now: int, ticks: int = 1):
+        """
+        Aplica `ticks` timeslots de decoerência a todos os slots vivos de uma só vez.
+
+        Um único timeslot é uma multiplicação mascarada. Para vários timeslots, cada slot
+        recebe o fator composto (1 - d) ** k, onde k desconta os timeslots anteriores à
+        sua criação.
+
+        Args:
+            decoherence_factor (float): Fator de decoerência aplicado.
+            now (int): Timeslot atual da rede, já avançado.
+            ticks (int): Número de timeslots decorridos.
+        """
+        if self.lazy:
+            self._materialize()
+        self.now = now
+        self._log_retention += ticks * _log_keep(decoherence_factor)
+        self._log_now = now
+        self.generation += 1
+        n = self._size
+        if self.lazy:
+            self._stamp[:n] = now
+        live = self._refs[:n] > 0
+        if ticks == 1:
+            mask = live & (self._since[:n] < now)
+            np.multiply(self._fidelity[:n], 1 - decoherence_factor, out=self._fidelity[:n], where=mask)
+            return
+        elapsed = np.clip(now - np.maximum(now - ticks, self._since[:n]), 0, ticks)
+        elapsed = np.where(live, elapsed, 0)
+        self._fidelity[:n] *= (1 - decoherence_factor) ** elapsed
+
+
+def _log_keep(decoherence_factor: float) -> float:
+    return math.log1p(-decoherence_factor) if decoherence_factor < 1 else -math.inf
+
+
+class TrackedList(list):
+    """
+    Lista de qubits ou pares EPR que mantém o armazenamento de fidelidades sincronizado.
+
+    Elementos inseridos são anexados ao armazenamento e elementos removidos são desanexados.
+    Enquanto não houver armazenamento associado, comporta-se como uma lista comum.
+    """
+    __slots__ = ('_store', '_since')
+
+    def __init__(self, iterable=(), store: FidelityStore = None, since=None):
+        super().__init__(iterable)
+        self._store = None
+        self._since = since
+        if store is not None:
+            self.bind(store, since)
+
+    def bind(self, store: FidelityStore, since=None):
+        """
+        Associa a lista a um armazenamento de fidelidades, anexando os elementos já presentes.
+
+        Args:
+            store (FidelityStore): Armazenamento de fidelidades da rede.
+            since (callable, optional): Função que retorna o timeslot de criação de um elemento.
+        """
+        if self._store is store:
+            return
+        self._unbind_all()
+        self._store = store
+        self._since = since
+        for item in self:
+            self._attach(item)
+
+    def _unbind_all(self):
+        if self._store is not None:
+            for item in self:
+                self._store.detach(item)
+
+    def _attach(self, item):
+        if self._store is not None:
+            self._store.attach(item, self._since(item) if self._since is not None else -1)
+
+    def _detach(self, item):
+        if self._store is not None:
+            self._store.detach(item)
+
+    def append(self, item):
+        super().append(item)
+        self._attach(item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._attach(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._attach(item)
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._detach(item)
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._detach(item)
+
+    def clear(self):
+        self._unbind_all()
+        super().clear()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old = self[index]
+            value = list(value)
+            super().__setitem__(index, value)
+            for item in old:
+                self._detach(item)
+            for item in value:
+                self._attach(item)
+        else:
+            old = self[index]
+            super().__setitem__(index, value)
+            self._detach(old)
+            self._attach(value)
+
+    def __delitem__(self, index):
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for item in old:
+            self._detach(item)
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class LatencyHistogram():
+    """
+    Histograma de latências inteiras (em timeslots) com memória constante.
+
+    Cada valor incrementa um contador; valores a partir de `max_value` caem no último
+    compartimento. Os percentis são calculados pela soma acumulada dos contadores, sem guardar
+    as amostras, de modo que o histograma suporta fluxos de milhões de requisições.
+    """
+    def __init__(self, max_value: int = 1 << 16) -> None:
+        self.max_value = max_value
+        self.counts = np.zeros(max_value + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value: int):
+        """
+        Registra uma latência.
+
+        Args:
+            value (int): Latência em timeslots.
+        """
+        value = max(int(value), 0)
+        self.counts[min(value, self.max_value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float('nan')
+
+    def percentile(self, q: float) -> int:
+        """
+        Retorna o menor valor v tal que pelo menos q% das latências são <= v.
+
+        Args:
+            q (float): Percentil, entre 0 e 100.
+
+        Returns:
+            int : Latência do percentil, ou -1 se o histograma estiver vazio.
+        """
+        if not self.count:
+            return -1
+        rank = max(int(np.ceil(q / 100 * self.count)), 1)
+        return int(np.searchsorted(np.cumsum(self.counts), rank))
+
+    def percentiles(self, qs=(50, 95, 99)) -> dict:
+        """
+        Retorna vários percentis de uma só vez.
+
+        Args:
+            qs (iterable): Percentis desejados.
+
+        Returns:
+            dict : Latências indexadas pelo rótulo 'p50', 'p95', ...
+        """
+        if not self.count:
+            return {f'p{q:g}': -1 for q in qs}
+        cumulative = np.cumsum(self.counts)
+        return {f'p{q:g}': int(np.searchsorted(cumulative, max(int(np.ceil(q / 100 * self.count)), 1))) for q in qs}
+
+    def summary(self) -> dict:
+        """
+        Resumo do histograma: contagem, média, máximo e p50/p95/p99.
+
+        Returns:
+            dict : Estatísticas do histograma.
+        """
+        summary = {'count': self.count, 'mean': self.mean(), 'max': self.max}
+        summary.update(self.percentiles())
+        return summary
+
+    def clear(self):
+        self.counts[:] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
@@ -0,0 +1,61 @@
+class IdAllocator():
+    """
+    Alocador monotônico de IDs, compartilhado por todos os qubits e pares EPR de uma rede.
+
+    Com `step` > 1, os IDs avançam de `step` em `step`. Alocadores que partem de inícios
+    consecutivos com o mesmo passo nunca geram o mesmo ID, o que permite alocar IDs em
+    processos separados sem coordenação.
+
+    Args:
+        start (int): Primeiro ID.
+        step (int): Distância entre IDs consecutivos.
+    """
+    __slots__ = ('_next', 'step')
+
+    def __init__(self, start: int = 0, step: int = 1) -> None:
+        self._next = start
+        self.step = step
+
+    def next_id(self) -> int:
+        """
+        Retorna um novo ID, nunca usado antes nesta rede.
+
+        Returns:
+            int : Novo ID.
+        """
+        new_id = self._next
+        self._next += self.step
+        return new_id
+
+    def reserve(self, n: int) -> range:
+        """
+        Reserva um bloco de n IDs consecutivos (no passo do alocador).
+
+        Args:
+            n (int): Quantidade de IDs.
+
+        Returns:
+            range : IDs reservados.
+        """
+        start = self._next
+        self._next += n * self.step
+        return range(start, self._next, self.step)
+
+    def peek(self) -> int:
+        """
+        Retorna o próximo ID que será alocado, sem consumi-lo.
+
+        Returns:
+            int : Próximo ID.
+        """
+        return self._next
+
+    def skip_to(self, next_id: int):
+        """
+        Garante que o próximo ID alocado seja pelo menos `next_id`, por exemplo depois de IDs
+        alocados em outros processos.
+
+        Args:
+            next_id (int): Menor valor permitido para o próximo ID.
+        """
+        self._next = max(self._next, next_id)
@@ -3,7 +3,24 @@ import logging
 FORMAT = '%(asctime)s: %(message)s'
 logging.basicConfig(format=FORMAT)
 
+LEVELS = {
+    'debug': logging.DEBUG,
+    'log': logging.INFO,
+    'info': logging.INFO,
+    'warn': logging.WARNING,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
 class Logger(object):
+    """
+    Logger singleton do simulador.
+
+    As mensagens podem ser passadas como string de formato seguida dos argumentos
+    (`logger.log('Rota %s', route)`) ou como uma função sem argumentos que retorna a
+    mensagem (`logger.log(lambda: ...)`). Em ambos os casos a formatação só acontece se
+    o logger estiver ativo, de modo que o log desativado não tem custo de formatação.
+    """
     __instance = None
     DISABLED = True
 
@@ -22,19 +39,46 @@ class Logger(object):
 
     def activate(self):
         Logger.DISABLED = False
-    
-    def warn(self, message):
+
+    def deactivate(self):
+        Logger.DISABLED = True
+
+    def enabled_for(self, level='log') -> bool:
+        """
+        Verifica se mensagens do nível informado serão emitidas.
+
+        Usado para evitar montar mensagens (ou executar laços que só geram log) quando o
+        logger está desativado.
+
+        Args:
+            level (str | int): Nível ('debug', 'log', 'warn', 'error') ou nível numérico do módulo logging.
+
+        Returns:
+            bool : True se o logger estiver ativo para o nível.
+        """
+        if Logger.DISABLED:
+            return False
+        if isinstance(level, str):
+            level = LEVELS[level]
+        return self.logger.isEnabledFor(level)
+
+    def _emit(self, level, message, args):
+        if callable(message):
+            message = message()
+        self.logger.log(level, message, *args)
+
+    def warn(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.warning(message)
+            self._emit(logging.WARNING, message, args)
 
-    def error(self, message):
+    def error(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.error(message)
+            self._emit(logging.ERROR, message, args)
 
-    def log(self, message):
+    def log(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.info(message)
+            self._emit(logging.INFO, message, args)
 
-    def debug(self, message):
+    def debug(self, message, *args):
         if not Logger.DISABLED:
-            self.logger.debug(message)
\ No newline at end of file
+            self._emit(logging.DEBUG, message, args)
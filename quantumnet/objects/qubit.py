@@ -2,7 +2,11 @@ import random
 import math
 
 class Qubit():
+    __slots__ = ('qubit_id', '_qubit_state', '_phase', '_initial_fidelity', '_current_fidelity', '_store', '_slot')
+
     def __init__(self, qubit_id: int, initial_fidelity: float = None) -> None:
+        self._store = None
+        self._slot = -1
         self.qubit_id = qubit_id
         self._qubit_state = 0  
         self._phase = 1  
@@ -12,20 +16,38 @@ class Qubit():
     def __str__(self):
         return f"Qubit {self.qubit_id} with state {self._qubit_state} and phase {self._phase}"
 
+    def __del__(self):
+        if self._store is not None:
+            self._store.release(self._slot)
+
+    def __getstate__(self):
+        # A cópia (por exemplo, enviada entre processos) leva a fidelidade atual, sem o armazenamento
+        return (self.qubit_id, self._qubit_state, self._phase, self._initial_fidelity, self.get_current_fidelity())
+
+    def __setstate__(self, state):
+        self._store = None
+        self._slot = -1
+        self.qubit_id, self._qubit_state, self._phase, self._initial_fidelity, self._current_fidelity = state
+
     def update_fidelity(self):
-        self._current_fidelity = random.uniform(0, 1)
+        self.set_current_fidelity(random.uniform(0, 1))
 
     def get_initial_fidelity(self):
         return self._initial_fidelity
 
     def get_current_fidelity(self):
+        if self._store is not None:
+            return self._store.get(self._slot)
         return self._current_fidelity
 
     def set_current_fidelity(self, new_fidelity: float):
         """
         Define a fidelidade atual do qubit.
         """
-        self._current_fidelity = new_fidelity
+        if self._store is not None:
+            self._store.set(self._slot, new_fidelity)
+        else:
+            self._current_fidelity = new_fidelity
 
     def apply_x(self):
         """
@@ -0,0 +1,270 @@
+import numpy as np
+
+# Tipos de evento
+EPR_CREATED = 0
+EPR_CONSUMED = 1
+SWAP = 2
+PURIFICATION = 3
+TELEPORT = 4
+REQUEST_STATUS = 5
+REQUEST_ARRIVAL = 6
+
+EVENT_NAMES = {
+    EPR_CREATED: 'epr_created',
+    EPR_CONSUMED: 'epr_consumed',
+    SWAP: 'swap',
+    PURIFICATION: 'purification',
+    TELEPORT: 'teleport',
+    REQUEST_STATUS: 'request_status',
+    REQUEST_ARRIVAL: 'request_arrival',
+}
+
+# Camadas que emitem eventos
+PHYSICAL = 0
+LINK = 1
+NETWORK = 2
+TRANSPORT = 3
+APPLICATION = 4
+CONTROLLER = 5
+
+LAYER_NAMES = {
+    PHYSICAL: 'physical',
+    LINK: 'link',
+    NETWORK: 'network',
+    TRANSPORT: 'transport',
+    APPLICATION: 'application',
+    CONTROLLER: 'controller',
+}
+
+COLUMNS = (
+    ('kind', np.int8),
+    ('layer', np.int8),
+    ('timeslot', np.int64),
+    ('node_a', np.int32),
+    ('node_b', np.int32),
+    ('fidelity', np.float64),
+    ('value', np.int64),
+)
+
+
+class Trace():
+    """
+    Registro estruturado de eventos da simulação.
+
+    Os eventos são gravados em buffers colunares pré-alocados (um vetor NumPy por campo).
+    Registrar um evento custa apenas algumas escritas em vetores. Quando o buffer enche, ele é
+    descarregado em blocos: para um arquivo HDF5, se `path` terminar em .h5/.hdf5, ou para uma
+    lista de blocos em memória, que pode ser salva depois em NPZ ou HDF5 com `save`.
+
+    Campos de cada evento:
+        kind (int): Tipo do evento (EPR_CREATED, EPR_CONSUMED, SWAP, PURIFICATION, TELEPORT, REQUEST_STATUS, REQUEST_ARRIVAL).
+        layer (int): Camada que emitiu o evento.
+        timeslot (int): Timeslot da rede no momento do evento.
+        node_a, node_b (int): Nós envolvidos (-1 quando não se aplica).
+        fidelity (float): Fidelidade associada ao evento (NaN quando não se aplica).
+        value (int): Valor auxiliar (ID do EPR/qubit, sucesso da operação, status da requisição ou número de qubits da requisição que chegou).
+    """
+    def __init__(self, chunk_size: int = 65536, path: str = None, enabled: bool = True) -> None:
+        self.enabled = False
+        self.chunk_size = chunk_size
+        self.path = path
+        self._buffers = None
+        self._size = 0
+        self._chunks = []
+        self._flushed = 0
+        self._file = None
+        if enabled:
+            self.enable()
+
+    def __len__(self):
+        return self._flushed + self._size
+
+    def enable(self):
+        """
+        Ativa o registro de eventos, alocando os buffers na primeira ativação.
+        """
+        if self._buffers is None:
+            self._buffers = {name: np.empty(self.chunk_size, dtype=dtype) for name, dtype in COLUMNS}
+            self._kind = self._buffers['kind']
+            self._layer = self._buffers['layer']
+            self._timeslot = self._buffers['timeslot']
+            self._node_a = self._buffers['node_a']
+            self._node_b = self._buffers['node_b']
+            self._fidelity = self._buffers['fidelity']
+            self._value = self._buffers['value']
+        self.enabled = True
+
+    def disable(self):
+        """
+        Suspende o registro de eventos. Os eventos já registrados são mantidos.
+        """
+        self.enabled = False
+
+    def record(self, kind: int, layer: int, timeslot: int, node_a: int = -1, node_b: int = -1, fidelity: float = np.nan, value: int = -1):
+        """
+        Registra um evento.
+
+        Args:
+            kind (int): Tipo do evento.
+            layer (int): Camada que emitiu o evento.
+            timeslot (int): Timeslot atual.
+            node_a (int): Primeiro nó envolvido.
+            node_b (int): Segundo nó envolvido.
+            fidelity (float): Fidelidade associada ao evento.
+            value (int): Valor auxiliar do evento.
+        """
+        if not self.enabled:
+            return
+        i = self._size
+        self._kind[i] = kind
+        self._layer[i] = layer
+        self._timeslot[i] = timeslot
+        self._node_a[i] = node_a
+        self._node_b[i] = node_b
+        self._fidelity[i] = fidelity
+        self._value[i] = value
+        self._size = i + 1
+        if self._size == self.chunk_size:
+            self.flush()
+
+    def extend(self, events: dict):
+        """
+        Registra vários eventos de uma vez, por exemplo os de outro trace.
+
+        Args:
+            events (dict): Vetores indexados pelo nome do campo, como retornados por `to_arrays`.
+        """
+        if not self.enabled:
+            return
+        n = len(events['kind'])
+        done = 0
+        while done < n:
+            size = self._size
+            take = min(n - done, self.chunk_size - size)
+            for name, _ in COLUMNS:
+                self._buffers[name][size:size + take] = events[name][done:done + take]
+            self._size = size + take
+            done += take
+            if self._size == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """
+        Descarrega o buffer atual no arquivo HDF5 (se houver) ou na lista de blocos em memória.
+        """
+        n = self._size
+        if n == 0:
+            return
+        chunk = {name: self._buffers[name][:n].copy() for name, _ in COLUMNS}
+        if self.path is not None and self._is_hdf5(self.path):
+            self._append_hdf5(chunk)
+        else:
+            self._chunks.append(chunk)
+        self._flushed += n
+        self._size = 0
+
+    def _is_hdf5(self, path: str) -> bool:
+        return str(path).endswith(('.h5', '.hdf5'))
+
+    def _append_hdf5(self, chunk: dict):
+        import h5py
+        if self._file is None:
+            self._file = h5py.File(self.path, 'w')
+            group = self._file.create_group('events')
+            for name, dtype in COLUMNS:
+                group.create_dataset(name, shape=(0,), maxshape=(None,), dtype=dtype, chunks=(self.chunk_size,))
+            self._write_metadata(self._file)
+        group = self._file['events']
+        n = len(chunk['kind'])
+        for name, _ in COLUMNS:
+            dataset = group[name]
+            start = dataset.shape[0]
+            dataset.resize((start + n,))
+            dataset[start:] = chunk[name]
+
+    def _write_metadata(self, h5file):
+        h5file.attrs['event_names'] = [EVENT_NAMES[k] for k in sorted(EVENT_NAMES)]
+        h5file.attrs['layer_names'] = [LAYER_NAMES[k] for k in sorted(LAYER_NAMES)]
+
+    def close(self):
+        """
+        Descarrega os eventos pendentes e fecha o arquivo HDF5, se houver.
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """
+        Descarta todos os eventos registrados em memória.
+        """
+        self._size = 0
+        self._chunks = []
+        self._flushed = 0
+
+    def to_arrays(self) -> dict:
+        """
+        Retorna os eventos em memória como um dicionário de vetores, um por campo.
+
+        Eventos já gravados em arquivo HDF5 não são incluídos; use `load` para lê-los.
+
+        Returns:
+            dict : Vetores indexados pelo nome do campo.
+        """
+        parts = list(self._chunks)
+        if self._buffers is not None:
+            parts.append({name: self._buffers[name][:self._size] for name, _ in COLUMNS})
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+        return {name: np.concatenate([part[name] for part in parts]) for name, _ in COLUMNS}
+
+    def select(self, kind: int) -> dict:
+        """
+        Retorna apenas os eventos de um tipo.
+
+        Args:
+            kind (int): Tipo do evento.
+
+        Returns:
+            dict : Vetores filtrados indexados pelo nome do campo.
+        """
+        arrays = self.to_arrays()
+        mask = arrays['kind'] == kind
+        return {name: values[mask] for name, values in arrays.items()}
+
+    def save(self, path: str):
+        """
+        Salva os eventos em memória em um arquivo NPZ ou HDF5, de acordo com a extensão.
+
+        Args:
+            path (str): Caminho do arquivo (.npz, .h5 ou .hdf5).
+        """
+        arrays = self.to_arrays()
+        if self._is_hdf5(path):
+            import h5py
+            with h5py.File(path, 'w') as h5file:
+                group = h5file.create_group('events')
+                for name, values in arrays.items():
+                    group.create_dataset(name, data=values)
+                self._write_metadata(h5file)
+        else:
+            np.savez_compressed(path, **arrays)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """
+        Lê um trace salvo em NPZ ou HDF5.
+
+        Args:
+            path (str): Caminho do arquivo.
+
+        Returns:
+            dict : Vetores indexados pelo nome do campo.
+        """
+        if str(path).endswith(('.h5', '.hdf5')):
+            import h5py
+            with h5py.File(path, 'r') as h5file:
+                return {name: h5file['events'][name][:] for name, _ in COLUMNS}
+        with np.load(path) as data:
+            return {name: data[name] for name, _ in COLUMNS}
@@ -0,0 +1,140 @@
+import heapq
+from .epr_pool import EprPool
+from .fidelity_store import FidelityStore
+
+
+class VirtualLinkStore():
+    """
+    Pares EPR virtuais (fim a fim), criados pelo entanglement swapping, guardados fora do grafo da rede.
+
+    Os pares são indexados pelo par de extremidades, sem ordem, e ficam em pools anexados ao
+    armazenamento de fidelidades, então continuam sofrendo decoerência. Como nenhuma aresta é
+    adicionada ao grafo, a topologia física, as rotas em cache e a iteração sobre os canais não
+    mudam com os swaps. Cada par tem uma validade (ttl) em timeslots e é descartado por
+    `expire` quando ela termina.
+
+    Args:
+        store (FidelityStore, optional): Armazenamento de fidelidades da rede.
+        ttl (int, optional): Validade dos pares, em timeslots. None para pares sem validade.
+    """
+    def __init__(self, store: FidelityStore = None, ttl: int = 10) -> None:
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f'Validade inválida para pares EPR virtuais: {ttl}')
+        self._store = store
+        self.ttl = ttl
+        self._links = {}
+        self._expiry = []
+        self._counter = 0
+
+    def __len__(self):
+        return sum(len(pool) for pool in self._links.values())
+
+    def __iter__(self):
+        return iter(self._links)
+
+    def __repr__(self):
+        return f'VirtualLinkStore(links={len(self._links)}, eprs={len(self)})'
+
+    @staticmethod
+    def _key(u: int, v: int) -> tuple:
+        return (u, v) if u <= v else (v, u)
+
+    def get(self, u: int, v: int) -> EprPool:
+        """
+        Retorna os pares EPR virtuais entre dois nós.
+
+        Args:
+            u (int): ID de um dos nós.
+            v (int): ID do outro nó.
+
+        Returns:
+            EprPool : Pool de pares virtuais, ou None se não houver pares entre os nós.
+        """
+        return self._links.get(self._key(u, v))
+
+    def has(self, u: int, v: int) -> bool:
+        """
+        Verifica se existe ao menos um par EPR virtual entre dois nós.
+
+        Returns:
+            bool : True se houver pares virtuais.
+        """
+        return self._key(u, v) in self._links
+
+    def add(self, epr, u: int, v: int, now: int):
+        """
+        Guarda um par EPR virtual entre dois nós.
+
+        Args:
+            epr (Epr): Par EPR virtual.
+            u (int): ID de um dos nós.
+            v (int): ID do outro nó.
+            now (int): Timeslot de criação, a partir do qual a validade é contada.
+        """
+        key = self._key(u, v)
+        pool = self._links.get(key)
+        if pool is None:
+            pool = self._links[key] = EprPool(store=self._store)
+        pool.append(epr)
+        if self.ttl is not None:
+            self._counter += 1
+            heapq.heappush(self._expiry, (now + self.ttl, self._counter, key, epr))
+
+    def remove(self, epr, u: int, v: int) -> bool:
+        """
+        Remove um par EPR virtual, por exemplo quando ele é consumido.
+
+        Args:
+            epr (Epr): Par EPR virtual.
+            u (int): ID de um dos nós.
+            v (int): ID do outro nó.
+
+        Returns:
+            bool : True se o par estava guardado entre os nós, False caso contrário.
+        """
+        key = self._key(u, v)
+        pool = self._links.get(key)
+        if pool is None or epr not in pool:
+            return False
+        pool.remove(epr)
+        if not pool:
+            del self._links[key]
+        return True
+
+    def expire(self, now: int) -> int:
+        """
+        Descarta os pares EPR virtuais cuja validade terminou até o timeslot `now`.
+
+        Args:
+            now (int): Timeslot atual.
+
+        Returns:
+            int : Número de pares descartados.
+        """
+        expiry = self._expiry
+        expired = 0
+        while expiry and expiry[0][0] <= now:
+            _, _, key, epr = heapq.heappop(expiry)
+            # Pares já consumidos continuam na fila até a sua validade e são ignorados aqui
+            if self.remove(epr, *key):
+                expired += 1
+        return expired
+
+    def expiry_times(self) -> dict:
+        """
+        Retorna o timeslot em que termina a validade de cada par ainda guardado.
+
+        Returns:
+            dict : Timeslot de expiração, indexado pelo ID do par. Vazio se os pares não tiverem validade.
+        """
+        return {epr.epr_id: expiry for expiry, _, key, epr in self._expiry
+                if key in self._links and epr in self._links[key]}
+
+    def clear(self):
+        """
+        Descarta todos os pares EPR virtuais.
+        """
+        for pool in self._links.values():
+            pool.clear()
+        self._links = {}
+        self._expiry = []
@@ -0,0 +1,102 @@
+import io
+import random
+import contextlib
+import pytest
+from quantumnet.components import Network, Controller
+from quantumnet.components.parallel import fork_available
+from quantumnet.objects import Epr
+
+pytestmark = pytest.mark.skipif(not fork_available(), reason='execução paralela requer fork')
+
+SIDE = 4
+
+
+def build_network(seed: int = 7) -> Network:
+    random.seed(seed)
+    network = Network()
+    with contextlib.redirect_stdout(io.StringIO()):
+        network.set_ready_topology('grade', 4, SIDE, SIDE)
+    return network
+
+
+def fidelities(eprs) -> list:
+    return [round(epr.get_current_fidelity(), 9) for epr in eprs]
+
+
+def fingerprint(network: Network) -> tuple:
+    """
+    Estado da rede comparável entre execuções. Os pares são identificados pela fidelidade, já
+    que os IDs alocados em paralelo são intercalados entre os grupos.
+    """
+    edges = sorted(network.graph.edges())
+    return (network.get_timeslot(),
+            {edge: fidelities(network.get_channel(*edge).eprs) for edge in edges},
+            {edge: sorted(network.get_channel(*edge).busy_timeslots) for edge in edges},
+            {key: sorted(fidelities(network.virtual_links.get(*key))) for key in sorted(network.virtual_links)},
+            fidelities(network.physical._failed_eprs))
+
+
+def row_scenario():
+    """
+    Uma requisição por linha da grade, em grupos disjuntos. Cada requisição consome um par de
+    cada canal da rota, remove da rede um par guardado antes do lote (em `_failed_eprs` e nos
+    pares virtuais), guarda pares novos e ocupa timeslots dos canais vizinhos.
+    """
+    network = build_network()
+    routes = [[row * SIDE, row * SIDE + 1, row * SIDE + 2] for row in range(SIDE)]
+    failed = [Epr(network.ids.next_id(), 0.1 + row / 100) for row in range(SIDE)]
+    network.physical._failed_eprs.extend(failed)
+    virtual = [Epr(network.ids.next_id(), 0.2 + row / 100) for row in range(SIDE)]
+    for route, epr in zip(routes, virtual):
+        network.virtual_links.add(epr, route[0], route[-1], network.get_timeslot())
+
+    def execute(i):
+        route = routes[i]
+        for u, v in zip(route, route[1:]):
+            network.physical.remove_epr_from_channel(network.get_eprs_from_edge(u, v)[0], (u, v))
+        network.physical._failed_eprs.remove(failed[i])
+        network.physical._failed_eprs.append(Epr(network.ids.next_id(), 0.3 + i / 100))
+        network.virtual_links.remove(virtual[i], route[0], route[-1])
+        network.virtual_links.add(Epr(network.ids.next_id(), 0.4 + i / 100), route[0], route[-1], network.get_timeslot())
+        network.reserve_link(route[1], 5 + i)
+        return i
+
+    resources = [network.route_resources(route) for route in routes]
+    groups = [[i] for i in range(len(routes))]
+    requests = [{'alice_id': route[0], 'bob_id': route[-1]} for route in routes]
+    return network, requests, groups, execute, resources
+
+
+def test_parallel_matches_sequential_execution():
+    network, requests, groups, execute, resources = row_scenario()
+    assert [execute(i) for i in range(len(requests))] == list(range(len(requests)))
+    expected = fingerprint(network)
+
+    for workers in (1, 2, len(groups)):
+        network, requests, groups, execute, resources = row_scenario()
+        results = network.execute_concurrently(requests, groups, execute, resources, max_workers=workers)
+        assert results == list(range(len(requests)))
+        assert fingerprint(network) == expected, workers
+
+
+def run_controller(workers: int) -> tuple:
+    network = build_network(seed=5)
+    network.trace.enable()
+    controller = Controller(network)
+    pairs = [(row * SIDE, row * SIDE + 3) for row in range(SIDE)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for alice, bob in pairs:
+            controller.receive_request(network.generate_request(alice_id=alice, bob_id=bob, num_qubits=2, num_gates=5, scenario=1))
+        controller.process_requests()
+        for timeslot in sorted(controller.scheduled_requests):
+            controller.execute_scheduled_requests(timeslot, parallel=True, max_workers=workers)
+    events = network.trace.to_arrays()
+    return (fingerprint(network), len(controller.executed_requests), len(controller.failed_requests),
+            network.ids.peek(), [round(f, 9) for f in network.application_layer.route_fidelities],
+            events['kind'].tolist(), events['timeslot'].tolist())
+
+
+def test_parallel_result_does_not_depend_on_workers():
+    expected = run_controller(1)
+    assert run_controller(2) == expected
+    assert run_controller(SIDE) == expected